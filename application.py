@@ -1,46 +1,313 @@
 # Import required libraries
-import joblib  # For loading the pre-trained machine learning model
-import numpy as np  # For numerical operations and array handling
-from config.paths_config import MODEL_OUTPUT_PATH  # Path where the trained model is saved
-from flask import Flask, render_template, request  # Flask web framework components
+import io  # For reading uploaded files from memory
+import time  # For request latency
+import pandas as pd  # For building the raw reservation record passed to the transformer
+from config.paths_config import *  # Config and saved artifact paths
+from src.model_holder import ModelHolder  # Lazy, hot-reloading holder for the model artifacts
+from src.serving_metrics import ServingMetrics  # In-process request, latency and error metrics
+from src.logger import logging_stats  # Dropped/pending counts of the asynchronous log buffer
+from utils.common_functions import get_data_format, read_yaml  # File format detection and config reading
+from flask import Flask, Response, g, got_request_exception, jsonify, render_template, request, stream_with_context  # Flask web framework components
 
 # Initialize Flask application
 app = Flask(__name__)
 
-# Load the trained model from the specified file path
-loaded_model = joblib.load(MODEL_OUTPUT_PATH)
+# Serving settings from config.yaml
+serving_config = read_yaml(CONFIG_PATH).get("serving", {})
+
+# The model, fitted transformer, tree arrays and micro-batcher are loaded lazily as one bundle.
+# With hot reload enabled a background thread loads them at startup and swaps in new versions
+# whenever training rewrites the version file, so retrains need no restart.
+model_holder = ModelHolder(MODEL_OUTPUT_PATH, PREPROCESSOR_OUTPUT_PATH, TREE_ENGINE_OUTPUT_PATH,
+                           MODEL_VERSION_PATH, serving_config)
+hot_reload_enabled = serving_config.get("hot_reload", {}).get("enabled", False)
+if hot_reload_enabled:
+    model_holder.start()
+
+# Request counts, per-phase latency histograms and error counts, exposed on /metrics
+serving_metrics = ServingMetrics()
+
+# Route pattern used as the endpoint label (keeps label cardinality bounded)
+def endpoint_label():
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    serving_metrics.request_started()
+
+# Unhandled exceptions become a 500 response; remember the exception class so the request's one
+# error count names the cause instead of just "http_500"
+@got_request_exception.connect_via(app)
+def note_request_exception(sender, exception, **extra):
+    g.request_exception = type(exception).__name__
+
+# Count each request exactly once with its status, total latency and error type (if any).
+# A streamed body is produced after this hook, so its latency is recorded when the response closes.
+@app.after_request
+def record_request_metrics(response):
+    start = g.get("request_start")
+    if start is None:
+        return response
+
+    endpoint, method, status = endpoint_label(), request.method, response.status_code
+    error_type = g.pop("request_exception", None) or (f"http_{status}" if status >= 400 else None)
+
+    def record():
+        serving_metrics.record_request(endpoint, method, status, time.perf_counter() - start)
+        if error_type is not None:
+            serving_metrics.record_error(endpoint, error_type)
+
+    if response.is_streamed:
+        response.call_on_close(record)
+    else:
+        record()
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if g.get("request_start") is not None:
+        serving_metrics.request_finished()
+
+# Form fields mapped to raw dataset columns, their label and the type used to parse them.
+# The page only asks for the columns the model was trained on (transformer.selected_features).
+FORM_FIELDS = {
+    "no_of_adults": ("no_of_adults", "No_of_adults", int),
+    "no_of_children": ("no_of_children", "No_of_children", int),
+    "no_of_weekend_nights": ("no_of_weekend_nights", "No_of_weekend_nights", int),
+    "no_of_week_nights": ("no_of_week_nights", "No_of_week_nights", int),
+    "type_of_meal_plan": ("type_of_meal_plan", "Type_of_meal_plan", str),
+    "required_car_parking_space": ("required_car_parking_space", "Required_car_parking_space", int),
+    "room_type_reserved": ("room_type_reserved", "Room_type_reserved", str),
+    "lead_time": ("lead_time", "Lead Time", int),
+    "arrival_year": ("arrival_year", "Arrival Year", int),
+    "arrival_month": ("arrival_month", "Arrival Month", int),
+    "arrival_date": ("arrival_date", "Arrival Date", int),
+    "market_segment_type": ("market_segment_type", "Market_segment_type", str),
+    "repeated_guest": ("repeated_guest", "Repeated_guest", int),
+    "no_of_previous_cancellations": ("no_of_previous_cancellations", "No_of_previous_cancellations", int),
+    "no_of_previous_bookings_not_canceled": ("no_of_previous_bookings_not_canceled",
+                                             "No_of_previous_bookings_not_canceled", int),
+    "avg_price_per_room": ("avg_price_per_room", "Avg_price_per_room", float),
+    "no_of_special_request": ("no_of_special_requests", "No_of_special_request", int),
+}
+
+# Fixed choices of numeric fields shown as drop-downs, as (value, label) pairs
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+FORM_CHOICES = {
+    "arrival_month": list(zip(range(1, 13), MONTHS)),
+    "arrival_date": [(day, day) for day in range(1, 32)],
+}
+
+# Form fields of the columns the model uses, in the transformer's feature order. Categorical
+# columns become drop-downs of the labels seen in training, so only known labels can be sent.
+def form_fields(transformer):
+    by_column = {column: (field, label) for field, (column, label, _) in FORM_FIELDS.items()}
+    fields = []
+    for column in transformer.selected_features:
+        field, label = by_column.get(column, (column, column))
+        if column in transformer.categories:
+            choices = [(value, value) for value in transformer.categories[column]]
+        else:
+            choices = FORM_CHOICES.get(field)
+        fields.append({"name": field, "label": label, "choices": choices})
+    return fields
+
+# Build the raw reservation record from the submitted form; ValueError for missing or bad fields
+def parse_form(form, transformer):
+    by_column = {column: (field, cast) for field, (column, _, cast) in FORM_FIELDS.items()}
+    record, missing, invalid = {}, [], []
+    for column in transformer.selected_features:
+        field, cast = by_column.get(column, (column, float))
+        value = form.get(field, "").strip()
+        if not value:
+            missing.append(field)
+            continue
+        try:
+            record[column] = cast(value)
+        except ValueError:
+            invalid.append(field)
+    if missing:
+        raise ValueError(f"Missing fields: {missing}")
+    if invalid:
+        raise ValueError(f"Invalid values for fields: {invalid}")
+    return pd.DataFrame([record])
+
+# Labels of categorical input columns that the transformer never saw in training (encoded as -1)
+def check_known_labels(records, transformer):
+    unknown = transformer.unknown_categories(records[transformer.selected_features])
+    if unknown:
+        raise ValueError(f"Unknown values: {unknown}")
 
 # Define the main route for the web application
 @app.route('/', methods=['GET', 'POST'])
 def index():
+    # Pin one model version for the whole request, even if a new one is swapped in meanwhile
+    bundle = model_holder.get()
+    fields = form_fields(bundle.transformer)
+
     # Handle form submission (POST request)
     if request.method == 'POST':
-        # Extract features from HTML form input and convert them to appropriate data types
-        lead_time = int(request.form["lead_time"])
-        no_of_special_request = int(request.form["no_of_special_request"])
-        avg_price_per_room = float(request.form["avg_price_per_room"])
-        arrival_month = int(request.form["arrival_month"])
-        arrival_date = int(request.form["arrival_date"])
-        market_segment_type = int(request.form["market_segment_type"])
-        no_of_week_nights = int(request.form["no_of_week_nights"])
-        no_of_weekend_nights = int(request.form["no_of_weekend_nights"])
-        type_of_meal_plan = int(request.form["type_of_meal_plan"])
-        room_type_reserved = int(request.form["room_type_reserved"])
-
-        # Create a NumPy array with the input features in the correct shape
-        features = np.array([[lead_time, no_of_special_request, avg_price_per_room,
-                              arrival_month, arrival_date, market_segment_type,
-                              no_of_week_nights, no_of_weekend_nights,
-                              type_of_meal_plan, room_type_reserved]])
-
-        # Use the loaded model to make a prediction based on the input features
-        prediction = loaded_model.predict(features)
-
-        # Render the HTML template with the prediction result
-        return render_template('index.html', prediction=prediction[0])
+        with serving_metrics.time_phase("/", "parse"):
+            # Extract the raw reservation fields from the HTML form and convert them to their types
+            try:
+                record = parse_form(request.form, bundle.transformer)
+                check_known_labels(record, bundle.transformer)
+            except ValueError as e:
+                return render_template("index.html", fields=fields, prediction=None, error=str(e)), 400
+
+            # Encode, log-transform and order the features with the fitted transformer
+            features = bundle.transformer.transform(record)
+
+        with serving_metrics.time_phase("/", "predict"):
+            # Use the loaded model to make a prediction, coalesced with concurrent requests if enabled
+            prediction = bundle.predict(features)
+        serving_metrics.add_rows("/", 1)
+
+        with serving_metrics.time_phase("/", "render"):
+            # Render the HTML template with the prediction result and the version that produced it
+            response = app.make_response(render_template('index.html', fields=fields, prediction=prediction[0],
+                                                         model_version=bundle.version))
+        response.headers["X-Model-Version"] = bundle.version
+        return response
     
     # For GET requests, just render the page with no prediction initially
-    return render_template("index.html", prediction=None)
+    return render_template("index.html", fields=fields, prediction=None)
+
+# Micro-batcher throughput, added latency and batch-size distribution
+@app.route('/stats/batcher', methods=['GET'])
+def batcher_stats():
+    bundle = model_holder.get()
+    if bundle.batcher is None:
+        return jsonify({"enabled": False, "model_version": bundle.version})
+    return jsonify({"enabled": True, "model_version": bundle.version, **bundle.batcher.stats()})
+
+# Prometheus text-format metrics: requests, latency by phase, errors and the loaded model version
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    bundle = model_holder.peek()
+    body = serving_metrics.render(model_version=bundle.version if bundle else None,
+                                  model_loaded=bundle is not None, log_stats=logging_stats())
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+# Readiness probe: 200 once a model is loaded, 503 otherwise. Without the hot-reload
+# watcher nothing loads the model in the background, so the probe loads it itself.
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    if not model_holder.is_loaded() and not hot_reload_enabled:
+        try:
+            model_holder.get()
+        except Exception:
+            pass  # Reported below through last_error
+
+    bundle = model_holder.peek()
+    if bundle is not None:
+        return jsonify({"status": "ready", "model_loaded": True, "model_version": bundle.version})
+    return jsonify({"status": "loading", "model_loaded": False, "error": model_holder.last_error}), 503
+
+# Number of result rows serialized per streamed chunk
+BATCH_RESPONSE_CHUNK_ROWS = 5000
+
+# Parse a batch request body into a DataFrame of raw reservation records
+def read_batch_request():
+    # File upload (multipart/form-data): CSV, Parquet or Feather picked from the file name
+    if "file" in request.files:
+        upload = request.files["file"]
+        buffer = io.BytesIO(upload.read())
+        fmt = get_data_format(upload.filename or "")
+        if fmt == "parquet":
+            return pd.read_parquet(buffer)
+        if fmt == "feather":
+            return pd.read_feather(buffer)
+        return pd.read_csv(buffer)
+
+    # Raw CSV body
+    if request.mimetype == "text/csv":
+        return pd.read_csv(io.BytesIO(request.get_data()))
+
+    # JSON: either a list of records or {"records": [...]}
+    payload = request.get_json(force=True)
+    records = payload.get("records") if isinstance(payload, dict) else payload
+    if not isinstance(records, list):
+        raise ValueError("Expected a JSON array of reservation records")
+    return pd.DataFrame.from_records(records)
+
+# Serialize predictions in chunks so large responses are streamed instead of built in memory
+def stream_batch_results(predictions, probabilities, output_format):
+    n_rows = len(predictions)
+
+    if output_format == "csv":
+        yield "row,prediction" + (",probability" if probabilities is not None else "") + "\n"
+    else:
+        yield "["
+
+    for start in range(0, n_rows, BATCH_RESPONSE_CHUNK_ROWS):
+        stop = min(start + BATCH_RESPONSE_CHUNK_ROWS, n_rows)
+        chunk = pd.DataFrame({"row": range(start, stop), "prediction": predictions[start:stop]})
+        if probabilities is not None:
+            chunk["probability"] = probabilities[start:stop]
+
+        if output_format == "csv":
+            yield chunk.to_csv(index=False, header=False)
+        else:
+            # Strip the enclosing brackets so chunks join into one JSON array
+            yield ("," if start else "") + chunk.to_json(orient="records")[1:-1]
+
+    if output_format != "csv":
+        yield "]"
+
+# Wrap a response generator so the time spent producing it is observed as the render phase
+def timed_stream(chunks, endpoint):
+    with serving_metrics.time_phase(endpoint, "render"):
+        yield from chunks
+
+# Batch scoring of raw reservation records with a single vectorized model call
+# Query parameters: probabilities=true adds P(not canceled); format=csv returns CSV instead of JSON
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    endpoint = "/predict/batch"
+
+    # Pin one model version for the whole batch (loaded before the parse timer starts)
+    bundle = model_holder.get()
+    transformer = bundle.transformer
+    parse_start = time.perf_counter()
+
+    try:
+        records = read_batch_request()
+    except Exception as e:
+        return jsonify({"error": f"Could not parse batch request: {e}"}), 400
+
+    if records.empty:
+        return jsonify({"error": "Batch request contains no records"}), 400
+
+    missing = [col for col in transformer.selected_features if col not in records.columns]
+    if missing:
+        return jsonify({"error": f"Missing columns: {missing}"}), 400
+
+    # Encode, log-transform and order every row at once; bad input is the client's error
+    try:
+        check_known_labels(records, transformer)
+        features = transformer.transform(records)
+    except Exception as e:
+        return jsonify({"error": f"Could not transform batch records: {e}"}), 400
+    features = features.drop(columns=transformer.target_column, errors="ignore")
+    serving_metrics.observe(endpoint, "parse", time.perf_counter() - parse_start)
+
+    # One predict_proba call for the whole batch; labels are derived from it
+    with serving_metrics.time_phase(endpoint, "predict"):
+        proba = bundle.model.predict_proba(features)
+        predictions = bundle.model.classes_[proba.argmax(axis=1)]
+    serving_metrics.add_rows(endpoint, len(predictions))
+
+    with_probabilities = request.args.get("probabilities", "false").lower() in ("1", "true", "yes")
+    probabilities = proba[:, 1] if with_probabilities else None
+
+    # The body is produced while streaming, so its serialization time is the render phase
+    output_format = request.args.get("format", "json").lower()
+    mimetype = "text/csv" if output_format == "csv" else "application/json"
+    chunks = timed_stream(stream_batch_results(predictions, probabilities, output_format), endpoint)
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers={"X-Model-Version": bundle.version})
 
 # Entry point to run the Flask app on host 0.0.0.0 and port 8080
 if __name__ == "__main__":
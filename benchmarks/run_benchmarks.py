@@ -0,0 +1,257 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For the interpreter path and platform checks
+import json  # For the results file (one JSON record per line)
+import time  # For wall and CPU time
+import shutil  # For copying the config into each work directory
+import platform  # For recording the machine a result came from
+import argparse  # For the command-line interface
+import subprocess  # Each stage runs in a fresh process so peak memory is per stage
+from datetime import datetime  # For timestamping results
+
+# Repository root, put on PYTHONPATH for the stage processes
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stages in pipeline order; each one consumes the artifacts of the previous one
+STAGES = ["ingestion", "processing", "training", "serving"]
+DEFAULT_ROWS = [10_000, 100_000]
+RESULTS_PATH = os.path.join(REPO_ROOT, "benchmarks", "results.jsonl")
+WORK_DIR = os.path.join(REPO_ROOT, "benchmarks", ".work")
+
+
+# Peak resident set size of the current process in MB (None where `resource` is unavailable)
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Run fn and return its result plus wall time, CPU time and throughput
+def measure(name, fn, rows):
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = fn()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return result, {"stage": name, "rows": rows, "wall_s": round(wall, 4), "cpu_s": round(cpu, 4),
+                    "rows_per_s": round(rows / wall, 1) if wall > 0 else None}
+
+
+######################## STAGE PROCESSES ########################
+# These run inside the work directory, so the repo's relative artifact paths point there.
+
+def run_ingestion(config, rows):
+    from src.data_ingestion import DataIngestion
+    _, record = measure("ingestion", DataIngestion(config).split_data, rows)
+    return [record]
+
+
+def run_processing(config, rows):
+    from src.data_preprocessing import DataProcessor
+    from config.paths_config import TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH
+    processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+    _, record = measure("processing", processor.process, rows)
+    return [record]
+
+
+def run_training(config, rows):
+    from src.model_training import ModelTraining
+    from config.paths_config import PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, MODEL_OUTPUT_PATH
+    trainer = ModelTraining(PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, MODEL_OUTPUT_PATH)
+    X_train, y_train, X_test, y_test = trainer.load_and_split_data()
+
+    model, record = measure("training", lambda: trainer.train_lgbm(X_train, y_train), len(X_train))
+    record["accuracy"] = trainer.evaluate_model(model, X_test, y_test)["accuracy"]
+
+    # Serving artifacts for the next stage (not timed)
+    trainer.save_model(model)
+    trainer.export_tree_engine(model, X_test)
+    trainer.write_model_version({"accuracy": record["accuracy"]})
+    return [record]
+
+
+def run_serving(config, rows, batch_rows=100_000, single_requests=200):
+    import numpy as np
+    import pandas as pd
+    from config.paths_config import RAW_FILE_PATH
+    from application import app, model_holder, FORM_FIELDS
+
+    client = app.test_client()
+    raw = pd.read_csv(RAW_FILE_PATH, nrows=batch_rows)
+    bundle = model_holder.get()  # Load the bundle before timing
+
+    # Batch endpoint: one CSV upload, response consumed in full
+    body = raw.to_csv(index=False).encode("utf-8")
+
+    def post_batch():
+        response = client.post("/predict/batch", data=body, content_type="text/csv")
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.get_data()
+
+    _, batch_record = measure("serving_batch", post_batch, len(raw))
+
+    # Form endpoint: one request per reservation, per-request latency percentiles.
+    # The form asks for the model's selected features, so send exactly those fields.
+    form_rows = raw.head(single_requests)
+    selected = bundle.transformer.selected_features
+    form_columns = {column: field for field, (column, _, _) in FORM_FIELDS.items() if column in selected}
+    forms = [{form_columns.get(column, column): row[column] for column in selected}
+             for _, row in form_rows.iterrows()]
+
+    latencies = []
+
+    def post_forms():
+        for form in forms:
+            start = time.perf_counter()
+            response = client.post("/", data=form)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            latencies.append(time.perf_counter() - start)
+
+    _, single_record = measure("serving_single", post_forms, len(forms))
+    single_record["p50_ms"] = round(float(np.percentile(latencies, 50)) * 1000, 3)
+    single_record["p99_ms"] = round(float(np.percentile(latencies, 99)) * 1000, 3)
+
+    model_holder.stop()
+    return [batch_record, single_record]
+
+
+STAGE_RUNNERS = {"ingestion": run_ingestion, "processing": run_processing,
+                 "training": run_training, "serving": run_serving}
+
+
+# Entry point of a stage process: run the stage and print its records as the last stdout line
+def run_stage_process(stage, rows):
+    from utils.common_functions import read_yaml
+    from config.paths_config import CONFIG_PATH
+
+    records = STAGE_RUNNERS[stage](read_yaml(CONFIG_PATH), rows)
+    peak = peak_rss_mb()
+    for record in records:
+        record["peak_rss_mb"] = round(peak, 1) if peak is not None else None
+    print(json.dumps(records))
+
+
+######################## DRIVER ########################
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Fresh work directory holding a copy of config.yaml and the generated raw file
+def prepare_work_dir(rows, work_root, chunk_size, seed):
+    from benchmarks.synthetic_data import ReservationDataGenerator
+
+    work_dir = os.path.join(work_root, f"rows_{rows}")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(os.path.join(work_dir, "config"))
+    shutil.copy(os.path.join(REPO_ROOT, "config", "config.yaml"), os.path.join(work_dir, "config", "config.yaml"))
+
+    generator = ReservationDataGenerator.from_csv(os.path.join(REPO_ROOT, "notebook", "train.csv"), random_state=seed)
+    raw_path = os.path.join(work_dir, "artifacts", "raw", "raw.csv")
+    _, record = measure("generate", lambda: generator.write(raw_path, rows, chunk_size), rows)
+    return work_dir, record
+
+
+def run_stage(stage, rows, work_dir):
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    completed = subprocess.run([sys.executable, "-m", "benchmarks.run_benchmarks", "--stage-process", stage,
+                                "--rows", str(rows)], cwd=work_dir, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark stage '{stage}' failed for {rows} rows:\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def append_results(records, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def load_results(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# Compare records against the latest results of a baseline commit; returns the regressions
+def compare(records, baseline_commit, results, tolerance):
+    baseline = {}
+    for result in results:
+        if result["commit"].startswith(baseline_commit):
+            baseline[(result["stage"], result["rows"])] = result  # Later lines win
+
+    regressions = []
+    print(f"\n{'stage':<16}{'rows':>10}{'wall_s':>10}{'base_s':>10}{'ratio':>8}")
+    for record in records:
+        base = baseline.get((record["stage"], record["rows"]))
+        if base is None:
+            continue
+        ratio = record["wall_s"] / base["wall_s"] if base["wall_s"] else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{record['stage']:<16}{record['rows']:>10}{record['wall_s']:>10.3f}{base['wall_s']:>10.3f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append(record)
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages and serving paths on synthetic data")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                        help="Dataset sizes to benchmark (e.g. 10000 100000 1000000 10000000)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES,
+                        help="Stages to record; earlier stages still run to produce their inputs")
+    parser.add_argument("--output", default=RESULTS_PATH, help="Results file (JSON lines, appended)")
+    parser.add_argument("--work-dir", default=WORK_DIR, help="Where synthetic datasets and artifacts are written")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows generated per chunk")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="Commit to compare wall times against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed slowdown before flagging a regression")
+    parser.add_argument("--stage-process", choices=STAGES, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.stage_process:
+        return run_stage_process(args.stage_process, args.rows[0])
+
+    meta = {"commit": git_commit(), "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()}
+    last_stage = max(STAGES.index(stage) for stage in args.stages)
+
+    records = []
+    for rows in args.rows:
+        work_dir, generate_record = prepare_work_dir(rows, args.work_dir, args.chunk_size, args.seed)
+        records.append({**meta, **generate_record})
+
+        for stage in STAGES[:last_stage + 1]:
+            for record in run_stage(stage, rows, work_dir):
+                if record["stage"].split("_")[0] in args.stages:
+                    records.append({**meta, **record})
+                    print(f"{record['stage']:<16}{rows:>10} rows  {record['wall_s']:>9.3f}s  "
+                          f"{record['rows_per_s'] or 0:>12.0f} rows/s  peak {record['peak_rss_mb']} MB")
+
+    previous = load_results(args.output)
+    append_results(records, args.output)
+    print(f"\n{len(records)} results appended to {args.output}")
+
+    if args.baseline:
+        regressions = compare(records, args.baseline, previous, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Import standard libraries
+import os  # For file and directory handling
+import argparse  # For the command-line entry point
+import numpy as np  # For vectorized sampling
+import pandas as pd  # For building the generated chunks
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from utils.common_functions import ChunkedWriter  # Appends chunks to CSV, Parquet or Feather files
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# Reference sample whose column distributions the generator reproduces
+REFERENCE_PATH = "notebook/train.csv"
+
+
+# Generates Hotel Reservations rows of any size by sampling every column from its empirical
+# distribution in a reference CSV, conditioned on the booking status so the synthetic data
+# keeps the class balance and a learnable signal
+class ReservationDataGenerator:
+
+    def __init__(self, reference, target_column="booking_status", id_column="Booking_ID",
+                 drop_columns=("Unnamed: 0",), random_state=42):
+        self.target_column = target_column
+        self.id_column = id_column
+        self.columns = [col for col in reference.columns if col not in drop_columns]
+        self.rng = np.random.default_rng(random_state)
+
+        # Class priors
+        priors = reference[target_column].value_counts(normalize=True)
+        self.classes = priors.index.to_numpy()
+        self.class_probs = priors.to_numpy()
+
+        # Per class: column -> (observed values, their frequencies)
+        self.profiles = {}
+        feature_columns = [col for col in self.columns if col not in (target_column, id_column)]
+        for label, group in reference.groupby(target_column):
+            self.profiles[label] = {}
+            for col in feature_columns:
+                counts = group[col].value_counts(normalize=True)
+                self.profiles[label][col] = (counts.index.to_numpy(), counts.to_numpy())
+
+    # Build a generator from a reference CSV (notebook/train.csv by default)
+    @classmethod
+    def from_csv(cls, path=REFERENCE_PATH, **kwargs):
+        return cls(pd.read_csv(path), **kwargs)
+
+    # One DataFrame of n_rows synthetic reservations, with ids starting at start_id
+    def generate(self, n_rows, start_id=0):
+        labels = self.rng.choice(self.classes, size=n_rows, p=self.class_probs)
+
+        data = {}
+        for label, profile in self.profiles.items():
+            rows = np.flatnonzero(labels == label)
+            for col, (values, probs) in profile.items():
+                if col not in data:
+                    data[col] = np.empty(n_rows, dtype=values.dtype)
+                data[col][rows] = self.rng.choice(values, size=len(rows), p=probs)
+        data[self.target_column] = labels
+
+        ids = np.arange(start_id, start_id + n_rows).astype(str)
+        data[self.id_column] = np.char.add("BEN", np.char.zfill(ids, 8))
+
+        # Same column order as the reference file
+        return pd.DataFrame(data)[[col for col in self.columns if col in data]]
+
+    # Yield the dataset chunk by chunk, so any size can be produced in bounded memory
+    def iter_chunks(self, n_rows, chunk_size=100000):
+        for start in range(0, n_rows, chunk_size):
+            yield self.generate(min(chunk_size, n_rows - start), start_id=start)
+
+    # Stream n_rows to a CSV, Parquet or Feather file; returns the number of rows written
+    def write(self, path, n_rows, chunk_size=100000):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with ChunkedWriter(path) as writer:
+            for chunk in self.iter_chunks(n_rows, chunk_size):
+                writer.write(chunk)
+        logger.info(f"Generated {writer.rows_written} synthetic rows at {path}")
+        return writer.rows_written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Hotel Reservations dataset")
+    parser.add_argument("output", help="Output file (.csv, .parquet or .feather)")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--reference", default=REFERENCE_PATH)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generator = ReservationDataGenerator.from_csv(args.reference, random_state=args.seed)
+    generator.write(args.output, args.rows, args.chunk_size)
@@ -9,6 +9,13 @@ LIGHTGM_PARAMS={
 }
 
 
+# "random": RandomizedSearchCV with RANDOM_SEARCH_PARAMS
+# "halving": successive halving with HALVING_SEARCH_PARAMS
+# "native": the same successive halving over n_estimators, run with lgb.train on a binned
+#           LightGBM Dataset that is cached on disk and shared by every trial and CV fold
+SEARCH_STRATEGY = "native"
+
+
 RANDOM_SEARCH_PARAMS = {
     'n_iter' : 2,
     'cv' : 2,
@@ -16,4 +23,82 @@ RANDOM_SEARCH_PARAMS = {
     'verbose' :2,
     'random_state' : 42,
     'scoring' : 'accuracy'
-}
\ No newline at end of file
+}
+
+
+# Many candidates start with a small budget; each round keeps the best 1/factor of them
+# and gives the survivors factor times more budget, up to max_resources.
+# With resource='n_estimators' the tree count is the budget and is dropped from LIGHTGM_PARAMS;
+# with resource='n_samples' the budget is the number of training rows.
+HALVING_SEARCH_PARAMS = {
+    'n_candidates' : 27,
+    'factor' : 3,
+    'resource' : 'n_estimators',
+    'min_resources' : 50,
+    'max_resources' : 500,
+    'cv' : 3,
+    'n_jobs' : -1,
+    'verbose' : 1,
+    'random_state' : 42,
+    'scoring' : 'accuracy'
+}
+
+
+# Binning parameters of the cached LightGBM Dataset used by the "native" strategy
+LGB_DATASET_PARAMS = {
+    'max_bin' : 255
+}
+
+
+# LightGBM early stopping inside every CV fit (ignored for dart boosting);
+# set 'early_stopping_rounds' to None to disable
+EARLY_STOPPING_PARAMS = {
+    'early_stopping_rounds' : 20,
+    'validation_fraction' : 0.1
+}
+
+
+# Reuse trials from earlier runs (stored in artifacts/trials/trials.db): configurations already
+# evaluated on the same training data are skipped, and 'exploit_fraction' of the candidates are
+# sampled around the 'top_k' best stored trials, with 'perturbation' as a fraction of each range
+WARM_START_PARAMS = {
+    'enabled' : True,
+    'exploit_fraction' : 0.5,
+    'top_k' : 5,
+    'perturbation' : 0.1
+}
+
+
+# Out-of-core training for processed datasets larger than memory (requires SEARCH_STRATEGY = "native"):
+# the binned LightGBM Dataset is built from 'chunk_size'-row reads of the training file, the final
+# model is boosted on that Dataset, and the test set is scored in chunks of the same size
+OUT_OF_CORE_PARAMS = {
+    'enabled' : False,
+    'chunk_size' : 100000
+}
+
+
+# Incremental retraining: when a previous model exists at MODEL_OUTPUT_PATH with the same features,
+# keep boosting it on the current training data for up to 'extra_rounds' trees with its own
+# parameters instead of searching from scratch. The result replaces the previous model only if
+# its test-set 'metric' is at least as good.
+INCREMENTAL_PARAMS = {
+    'enabled' : False,
+    'extra_rounds' : 50,
+    'metric' : 'accuracy'
+}
+
+
+# Data-parallel training of the final model with LightGBM's socket-based distributed learning
+# (tree_learner='data'): the training rows are sharded round-robin across 'num_workers' local
+# processes that listen on consecutive ports from 'base_port' (0 picks free ports). 'num_threads'
+# is per worker (0 splits the cores evenly) and 'time_out' is the socket timeout in minutes.
+# The hyperparameter search itself still runs in this process.
+DISTRIBUTED_PARAMS = {
+    'enabled' : False,
+    'num_workers' : 2,
+    'host' : '127.0.0.1',
+    'base_port' : 0,
+    'num_threads' : 0,
+    'time_out' : 5
+}
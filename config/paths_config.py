@@ -1,22 +1,61 @@
 import os
+import yaml
+
+
+CONFIG_PATH="config/config.yaml"
+
+
+#############ARTIFACT FORMAT#####################
+
+# File extension for each supported artifact format
+ARTIFACT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+def _read_artifact_format(config_path=CONFIG_PATH, default="csv"):
+    # Pick the on-disk format for datasets from config.yaml, falling back to CSV
+    if not os.path.exists(config_path):
+        return default
+    with open(config_path, "r") as yaml_file:
+        config = yaml.safe_load(yaml_file) or {}
+    return config.get("artifacts", {}).get("format", default)
+
+ARTIFACT_FORMAT = _read_artifact_format()
+ARTIFACT_EXT = ARTIFACT_EXTENSIONS[ARTIFACT_FORMAT]
 
 
 #############DATA INGESTION#####################
 
 RAW_DIR="artifacts/raw"
 RAW_FILE_PATH=os.path.join(RAW_DIR, "raw.csv")
-TRAIN_FILE_PATH= os.path.join(RAW_DIR, "train.csv")
-TEST_FILE_PATH=os.path.join(RAW_DIR, "test.csv")
-
-CONFIG_PATH="config/config.yaml"
+RAW_MANIFEST_PATH=os.path.join(RAW_DIR, "raw.manifest.json")
+TRAIN_FILE_PATH= os.path.join(RAW_DIR, "train" + ARTIFACT_EXT)
+TEST_FILE_PATH=os.path.join(RAW_DIR, "test" + ARTIFACT_EXT)
 
 
 ######################## DATA PROCESSING ########################
 
 PROCESSED_DIR = "artifacts/processed"
-PROCESSED_TRAIN_DATA_PATH = os.path.join(PROCESSED_DIR,"processed_train.csv")
-PROCESSED_TEST_DATA_PATH = os.path.join(PROCESSED_DIR,"processed_test.csv")
+PROCESSED_TRAIN_DATA_PATH = os.path.join(PROCESSED_DIR,"processed_train" + ARTIFACT_EXT)
+PROCESSED_TEST_DATA_PATH = os.path.join(PROCESSED_DIR,"processed_test" + ARTIFACT_EXT)
+FEATURE_RANKING_CACHE_PATH = os.path.join(PROCESSED_DIR, "feature_ranking.json")
+
+# Intermediate results passed between the processing nodes of the pipeline DAG
+INTERIM_DIR = os.path.join(PROCESSED_DIR, "interim")
+PREPROCESSED_TRAIN_PATH = os.path.join(INTERIM_DIR, "preprocessed_train" + ARTIFACT_EXT)
+PREPROCESSED_TEST_PATH = os.path.join(INTERIM_DIR, "preprocessed_test" + ARTIFACT_EXT)
+BALANCED_TRAIN_PATH = os.path.join(INTERIM_DIR, "balanced_train" + ARTIFACT_EXT)
+BALANCED_TEST_PATH = os.path.join(INTERIM_DIR, "balanced_test" + ARTIFACT_EXT)
+FITTED_TRANSFORMER_PATH = os.path.join(INTERIM_DIR, "fitted_transformer.pkl")
 
 
 ####################### MODEL TRAINING #################
-MODEL_OUTPUT_PATH = "artifacts/models/lgbm_model.pkl"
\ No newline at end of file
+MODEL_OUTPUT_PATH = "artifacts/models/lgbm_model.pkl"
+PREPROCESSOR_OUTPUT_PATH = "artifacts/models/preprocessor.pkl"
+TREE_ENGINE_OUTPUT_PATH = "artifacts/models/lgbm_model_trees.npz"
+MODEL_VERSION_PATH = "artifacts/models/model_version.json"
+TRIAL_STORE_PATH = "artifacts/trials/trials.db"
+LGB_DATASET_CACHE_DIR = "artifacts/lgb_dataset"
+
+
+####################### STAGE CACHE #################
+STAGE_CACHE_DIR = "artifacts/.stage_cache"
+PIPELINE_REPORT_PATH = "artifacts/pipeline_report.json"
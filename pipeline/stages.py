@@ -0,0 +1,39 @@
+# Node functions of the training pipeline DAG. Each runs in its own worker process, so they are
+# module-level and import the heavy stage modules only when called (after the worker has applied
+# its CPU limits).
+from config.paths_config import *
+
+
+def run_ingestion(config):
+    from src.data_ingestion import DataIngestion
+    DataIngestion(config).run(raise_errors=True)  # A failed download must fail the DAG node
+
+
+def _processor():
+    from src.data_preprocessing import DataProcessor
+    return DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
+
+
+def preprocess_train():
+    _processor().preprocess_train_file(PREPROCESSED_TRAIN_PATH, FITTED_TRANSFORMER_PATH)
+
+
+def preprocess_test():
+    _processor().preprocess_test_file(PREPROCESSED_TEST_PATH, FITTED_TRANSFORMER_PATH)
+
+
+def balance(input_path, output_path):
+    _processor().balance_file(input_path, output_path)
+
+
+def select_features():
+    _processor().select_features_file(BALANCED_TRAIN_PATH, FITTED_TRANSFORMER_PATH)
+
+
+def align_test(input_path):
+    _processor().align_test_file(input_path)
+
+
+def run_training():
+    from src.model_training import ModelTraining
+    ModelTraining(PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH, MODEL_OUTPUT_PATH).run()
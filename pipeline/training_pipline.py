@@ -1,22 +1,114 @@
+import os
+import json
+import argparse
+
+from pipeline import stages
 from src.data_ingestion import DataIngestion
-from src.data_preprocessing import DataProcessor
-from src.model_training import ModelTraining
+from src.dag_runner import Node, DagRunner
+from src.stage_cache import StageCache
 from utils.common_functions import read_yaml
 from config.paths_config import *
 
 
-if __name__=="__main__":
-    ### 1. Data Ingestion
+STAGES = ["ingestion", "processing", "training"]
+
+# Source files whose contents define the code version of each stage
+COMMON_CODE = ["utils/common_functions.py", "config/paths_config.py"]
+STAGE_CODE = {
+    "ingestion": ["src/data_ingestion.py", "src/object_storage.py"] + COMMON_CODE,
+    "processing": ["src/data_preprocessing.py", "src/reservation_transformer.py", "src/feature_selection.py", "src/balancing.py", "pipeline/stages.py"] + COMMON_CODE,
+    "training": ["src/model_training.py", "src/lgbm_estimators.py", "src/trial_store.py", "src/dataset_cache.py", "src/tree_engine.py",
+                 "src/out_of_core.py", "src/distributed_training.py", "src/mlflow_logger.py", "src/instrumentation.py",
+                 "config/model_params.py", "pipeline/stages.py"] + COMMON_CODE,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the hotel reservation training pipeline")
+    parser.add_argument("--force", nargs="+", choices=STAGES + ["all"], default=[],
+                        help="Re-run these stages even if their cached fingerprint matches")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the stage cache and run every stage")
+    parser.add_argument("--executor", choices=["process", "serial"],
+                        help="Run independent nodes in parallel processes or one after another")
+    parser.add_argument("--cpu-budget", type=int,
+                        help="Cores shared by concurrently running nodes (default: pipeline.cpu_budget or all)")
+    return parser.parse_args()
+
+
+# The pipeline as a DAG: nodes are connected through the files they read and write, so
+# independent work (preprocessing the test split, balancing the training split) runs concurrently
+def build_nodes(config, force, remote_version):
+    processing_params = {"data_processing": config["data_processing"], "artifacts": config.get("artifacts"),
+                         "schema": config.get("schema"), "feature_selection": config.get("feature_selection"),
+                         "balancing": config.get("balancing")}
+    processing = dict(params=processing_params, code=STAGE_CODE["processing"], force="processing" in force)
 
-    data_ingestion = DataIngestion(read_yaml(CONFIG_PATH))
-    data_ingestion.run()
+    nodes = [
+        ### 1. Data Ingestion
+        Node("ingestion", stages.run_ingestion, args=(config,),
+             outputs=[TRAIN_FILE_PATH, TEST_FILE_PATH],
+             params={"data_ingestion": config["data_ingestion"], "artifacts": config.get("artifacts"),
+                     "schema": config.get("schema"), "remote": remote_version},
+             code=STAGE_CODE["ingestion"],
+             # Without the remote object version a cached run can't be trusted
+             force="ingestion" in force or remote_version is None),
 
-    ### 2. Data Processing
+        ### 2. Data Processing
+        Node("preprocess_train", stages.preprocess_train, inputs=[TRAIN_FILE_PATH],
+             outputs=[PREPROCESSED_TRAIN_PATH, FITTED_TRANSFORMER_PATH], **processing),
+        Node("preprocess_test", stages.preprocess_test, inputs=[TEST_FILE_PATH, FITTED_TRANSFORMER_PATH],
+             outputs=[PREPROCESSED_TEST_PATH], **processing),
+        Node("balance_train", stages.balance, args=(PREPROCESSED_TRAIN_PATH, BALANCED_TRAIN_PATH),
+             inputs=[PREPROCESSED_TRAIN_PATH], outputs=[BALANCED_TRAIN_PATH], cpus=None, **processing),
+        Node("select_features", stages.select_features, inputs=[BALANCED_TRAIN_PATH, FITTED_TRANSFORMER_PATH],
+             outputs=[PROCESSED_TRAIN_DATA_PATH, PREPROCESSOR_OUTPUT_PATH], cpus=None, **processing),
+    ]
+
+    test_input = PREPROCESSED_TEST_PATH
+    if config.get("balancing", {}).get("balance_test", False):
+        nodes.append(Node("balance_test", stages.balance, args=(PREPROCESSED_TEST_PATH, BALANCED_TEST_PATH),
+                          inputs=[PREPROCESSED_TEST_PATH], outputs=[BALANCED_TEST_PATH], cpus=None, **processing))
+        test_input = BALANCED_TEST_PATH
+
+    # Config sections ModelTraining reads; the search and training settings live in config/model_params.py
+    training_params = {"balancing": config.get("balancing"), "mlflow": config.get("mlflow"),
+                       "serving": {"engine": config.get("serving", {}).get("engine")}}
+
+    nodes += [
+        Node("align_test", stages.align_test, args=(test_input,), inputs=[test_input, PREPROCESSOR_OUTPUT_PATH],
+             outputs=[PROCESSED_TEST_DATA_PATH], **processing),
+
+        ### 3. Model Training
+        Node("training", stages.run_training, inputs=[PROCESSED_TRAIN_DATA_PATH, PROCESSED_TEST_DATA_PATH],
+             outputs=[MODEL_OUTPUT_PATH, TREE_ENGINE_OUTPUT_PATH, MODEL_VERSION_PATH], params=training_params,
+             code=STAGE_CODE["training"], cpus=None, force="training" in force,
+             # A run that keeps the previous model only rewrites the version file
+             rewritten=[MODEL_VERSION_PATH]),
+    ]
+    return nodes
+
+
+if __name__=="__main__":
+    args = parse_args()
+    force = set(STAGES) if args.no_cache or "all" in args.force else set(args.force)
 
-    processor = DataProcessor(TRAIN_FILE_PATH,TEST_FILE_PATH,PROCESSED_DIR,CONFIG_PATH)
-    processor.process()
+    config = read_yaml(CONFIG_PATH)
+    pipeline_config = config.get("pipeline", {})
 
-    ### 3. Model Training
+    remote_version = DataIngestion(config).get_remote_version()
 
-    trainer = ModelTraining(PROCESSED_TRAIN_DATA_PATH,PROCESSED_TEST_DATA_PATH,MODEL_OUTPUT_PATH)
-    trainer.run()
\ No newline at end of file
+    runner = DagRunner(
+        build_nodes(config, force, remote_version),
+        cpu_budget=args.cpu_budget or pipeline_config.get("cpu_budget") or None,
+        executor=args.executor or pipeline_config.get("executor", "process"),
+        cache=StageCache(),
+    )
+    try:
+        runner.run()
+    finally:
+        # Written for failed runs too, with the error of each failed node
+        if runner.last_report is not None:
+            os.makedirs(os.path.dirname(PIPELINE_REPORT_PATH), exist_ok=True)
+            with open(PIPELINE_REPORT_PATH, "w") as f:
+                json.dump(runner.last_report, f, indent=2)
@@ -0,0 +1,106 @@
+# Import standard libraries
+import sys  # For extracting exception traceback
+
+# Import data and ML libraries
+import numpy as np  # For synthetic sample generation
+import pandas as pd  # For assembling the balanced DataFrame
+from sklearn.neighbors import NearestNeighbors  # Pluggable, multi-core neighbor index
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# Balancing methods selectable from config.yaml
+METHODS = ("smote", "class_weight", "none")
+
+
+# SMOTE with a configurable neighbor index and synthetic rows generated in bounded chunks.
+# resample_to streams the chunks to a ChunkedWriter, so beyond the input rows only one minority
+# class matrix and one chunk of synthetic rows are in memory; fit_resample collects them instead.
+class ChunkedSMOTE:
+
+    # Initialize from the balancing section of config.yaml
+    def __init__(self, k_neighbors=5, neighbor_algorithm="auto", n_jobs=-1, chunk_size=50000, random_state=42):
+        self.k_neighbors = k_neighbors
+        self.neighbor_algorithm = neighbor_algorithm
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.random_state = random_state
+
+    # Build a SMOTE instance from the balancing section of config.yaml
+    @classmethod
+    def from_config(cls, config):
+        return cls(k_neighbors=config.get("k_neighbors", 5),
+                   neighbor_algorithm=config.get("neighbor_algorithm", "auto"),
+                   n_jobs=config.get("n_jobs", -1),
+                   chunk_size=config.get("chunk_size", 50000),
+                   random_state=config.get("random_state", 42))
+
+    # Yield synthetic rows for one class, chunk by chunk, interpolating towards random neighbors
+    def _generate(self, X_class, n_samples, rng):
+        n_neighbors = min(self.k_neighbors + 1, len(X_class))
+        index = NearestNeighbors(n_neighbors=n_neighbors, algorithm=self.neighbor_algorithm,
+                                 n_jobs=self.n_jobs).fit(X_class)
+
+        for start in range(0, n_samples, self.chunk_size):
+            size = min(self.chunk_size, n_samples - start)
+            base = rng.integers(len(X_class), size=size)
+
+            # Neighbors are only queried for this chunk's base rows; column 0 is the row itself
+            neighbors = index.kneighbors(X_class[base], return_distance=False)[:, 1:]
+            if neighbors.shape[1] == 0:
+                neighbors = base[:, None]
+            chosen = neighbors[np.arange(size), rng.integers(neighbors.shape[1], size=size)]
+
+            gap = rng.random((size, 1))
+            yield X_class[base] + gap * (X_class[chosen] - X_class[base])
+
+    # Yield (X, y) parts of the oversampled data: the original rows, then every chunk of synthetic
+    # rows that brings the minority classes up to the majority class count
+    def iter_resampled(self, X, y):
+        rng = np.random.default_rng(self.random_state)
+        counts = y.value_counts()
+        target = counts.max()
+
+        yield X, y
+        for label, count in counts.items():
+            if count == target:
+                continue
+            # Only this class's rows are converted for the neighbor index
+            X_class = X[(y == label).to_numpy()].to_numpy(dtype=np.float64)
+            for chunk in self._generate(X_class, target - count, rng):
+                synthetic = pd.DataFrame(chunk, columns=X.columns)
+
+                # Integer columns (including encoded categoricals) stay integers
+                for col, dtype in X.dtypes.items():
+                    if pd.api.types.is_integer_dtype(dtype):
+                        synthetic[col] = synthetic[col].round()
+                yield (synthetic.astype(X.dtypes.to_dict()),
+                       pd.Series(label, index=range(len(chunk)), dtype=y.dtype, name=y.name))
+
+            logger.info(f"Generated {target - count} synthetic rows for class {label}")
+
+    # Oversample every minority class up to the majority class count, in memory
+    def fit_resample(self, X, y):
+        try:
+            X_parts, y_parts = zip(*self.iter_resampled(X, y))
+            return (pd.concat(X_parts, ignore_index=True),
+                    pd.concat(y_parts, ignore_index=True))
+
+        except Exception as e:
+            logger.error(f"Error during SMOTE resampling: {e}")
+            raise CustomException("Failed to oversample data", sys)
+
+    # Oversample like fit_resample, but append each part with its target column to a ChunkedWriter
+    def resample_to(self, X, y, writer):
+        try:
+            for X_part, y_part in self.iter_resampled(X, y):
+                writer.write(X_part.assign(**{y.name: y_part.to_numpy()}))
+            return writer.rows_written
+
+        except Exception as e:
+            logger.error(f"Error during SMOTE resampling: {e}")
+            raise CustomException("Failed to oversample data", sys)
@@ -0,0 +1,267 @@
+# Import standard libraries
+import os  # For CPU counts and thread-limit environment variables
+import sys  # For extracting exception traceback
+import json  # For the run report
+import time  # For node timing
+import traceback  # For sending worker tracebacks back to the parent
+import multiprocessing  # For the spawn start method
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait  # For running nodes in parallel
+
+# Import custom utilities (kept light: worker processes import this module before any node runs)
+from src.logger import get_logger, init_worker_logging, worker_log_queue  # Logging, forwarded from workers
+from src.custom_exception import CustomException  # Custom exception handling
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# One pipeline step: a picklable module-level function plus the files it reads and writes.
+# Dependencies are derived from the files: a node depends on every node that outputs one of its inputs.
+class Node:
+
+    def __init__(self, name, fn, args=(), kwargs=None, inputs=(), outputs=(), params=None, code=(),
+                 cpus=1, force=False, rewritten=None):
+        self.name = name
+        self.fn = fn
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        # Outputs every run writes (default: all); the others must exist but may be kept from an earlier run
+        self.rewritten = self.outputs if rewritten is None else list(rewritten)
+        self.params = params  # Config the outputs depend on, for the stage cache fingerprint
+        self.code = list(code)  # Source files the outputs depend on, for the stage cache fingerprint
+        self.cpus = cpus  # Cores the node uses; None takes a share of whatever is free when it starts
+        self.force = force
+
+
+# Runs in the worker process: cap the node's thread pools at its CPU grant, then run it
+def _run_node(fn, args, kwargs, cpus):
+    # Honoured by joblib (n_jobs=-1) and by OpenMP/BLAS runtimes initialized after this point
+    os.environ["LOKY_MAX_CPU_COUNT"] = str(cpus)
+    os.environ["OMP_NUM_THREADS"] = str(cpus)
+    try:
+        from threadpoolctl import threadpool_limits  # Ships with scikit-learn
+        with threadpool_limits(limits=cpus):
+            fn(*args, **kwargs)
+    except Exception as e:
+        # CustomException cannot be rebuilt in the parent from its pickle, which breaks the pool;
+        # send back a plain exception carrying the original message and traceback
+        raise RuntimeError(f"{type(e).__name__}: {e}\n{traceback.format_exc()}") from None
+
+
+# Executes a DAG of nodes, running independent nodes at the same time in separate processes
+# within a CPU budget, skipping nodes whose stage-cache fingerprint is unchanged, and reporting
+# the critical path of the run
+class DagRunner:
+
+    def __init__(self, nodes, cpu_budget=None, executor="process", cache=None):
+        self.nodes = {node.name: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Node names must be unique")
+
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        if executor not in ("process", "serial"):
+            raise ValueError(f"Unknown executor '{executor}', expected 'process' or 'serial'")
+        self.executor = executor
+        self.cache = cache
+        self.last_report = None  # Report of the latest run, also kept when it failed
+
+        self.deps = self._resolve_dependencies()
+        self.order = self._topological_order()
+
+    # Map every node to the nodes producing its inputs
+    def _resolve_dependencies(self):
+        producers = {}
+        for node in self.nodes.values():
+            for path in node.outputs:
+                if path in producers:
+                    raise ValueError(f"Output {path} is produced by both '{producers[path]}' and '{node.name}'")
+                producers[path] = node.name
+        return {node.name: sorted({producers[path] for path in node.inputs if path in producers})
+                for node in self.nodes.values()}
+
+    # Kahn's algorithm; raises on cycles
+    def _topological_order(self):
+        remaining = {name: set(deps) for name, deps in self.deps.items()}
+        order = []
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle among {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    # CPUs granted to each ready node that fits in the free budget; fixed-size nodes first,
+    # then nodes with cpus=None split what is left
+    def _grants(self, ready, free):
+        grants = {}
+        for name in sorted((n for n in ready if self.nodes[n].cpus is not None),
+                           key=lambda n: -self.nodes[n].cpus):
+            cpus = min(self.nodes[name].cpus, self.cpu_budget)
+            if cpus <= free:
+                grants[name] = cpus
+                free -= cpus
+
+        elastic = [n for n in ready if self.nodes[n].cpus is None]
+        if elastic and free > 0:
+            share = max(1, free // len(elastic))
+            for name in elastic[:free]:
+                grants[name] = share
+        return grants
+
+    # Fingerprint a ready node; returns (needs_run, fingerprint)
+    def _check_cache(self, node):
+        if self.cache is None:
+            return True, None
+        return self.cache.check(node.name, node.inputs, node.params, node.code, node.force)
+
+    def run(self):
+        try:
+            run_start = time.time()
+            timings = {}  # name -> {"start", "end", "cpus", "status"}
+            fingerprints = {}
+            pending = list(self.order)
+            running = {}  # future -> node name
+            failure = None
+
+            context = multiprocessing.get_context("spawn")
+            # Workers send their log records to this process, which alone writes the log file
+            pool = (ProcessPoolExecutor(max_workers=self.cpu_budget, mp_context=context, max_tasks_per_child=1,
+                                        initializer=init_worker_logging, initargs=(worker_log_queue(),))
+                    if self.executor == "process" else None)
+
+            try:
+                while pending or running:
+                    ready = [name for name in pending
+                             if all(timings.get(dep, {}).get("status") in ("ran", "cached") for dep in self.deps[name])]
+
+                    # Nodes whose fingerprint is unchanged finish immediately, which may make
+                    # their dependents ready
+                    if failure is None:
+                        skipped = False
+                        for name in ready:
+                            if name in fingerprints:
+                                continue  # Checked on an earlier pass, waiting for CPUs
+                            needs_run, fingerprints[name] = self._check_cache(self.nodes[name])
+                            if not needs_run:
+                                now = time.time() - run_start
+                                timings[name] = {"start": now, "end": now, "cpus": 0, "status": "cached"}
+                                pending.remove(name)
+                                skipped = True
+                        if skipped:
+                            continue
+
+                    free = self.cpu_budget - sum(timings[name]["cpus"] for name in running.values())
+                    grants = self._grants(ready, free) if failure is None else {}
+
+                    for name, cpus in grants.items():
+                        if failure is not None:
+                            break
+                        node = self.nodes[name]
+                        pending.remove(name)
+                        timings[name] = {"start": time.time() - run_start, "cpus": cpus, "status": "running"}
+                        logger.info(f"Starting node '{name}' with {cpus} CPU(s)")
+
+                        if pool is None:
+                            self._finish(name, timings, fingerprints, run_start,
+                                         error=self._run_inline(node, cpus))
+                            if timings[name]["status"] == "failed":
+                                failure = failure or name
+                        else:
+                            running[pool.submit(_run_node, node.fn, node.args, node.kwargs, cpus)] = name
+
+                    if not running:
+                        if failure is not None or not pending:
+                            break
+                        if not grants:
+                            # Nothing running and nothing fits: cannot happen with cpus capped at the budget
+                            raise RuntimeError(f"No runnable node among {pending}")
+                        continue
+
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        self._finish(name, timings, fingerprints, run_start, error=future.exception())
+                        if timings[name]["status"] == "failed":
+                            failure = failure or name
+            finally:
+                if pool is not None:
+                    pool.shutdown(wait=True, cancel_futures=True)
+
+            report = self.last_report = self.report(timings, time.time() - run_start)
+            if failure is not None:
+                raise RuntimeError(f"Node '{failure}' failed: {timings[failure].get('error')}")
+            return report
+
+        except Exception as e:
+            logger.error(f"Error while running the pipeline DAG: {e}")
+            raise CustomException("Failed to run the pipeline DAG", sys)
+
+    # Serial executor: run the node in this process with the same thread limits
+    def _run_inline(self, node, cpus):
+        try:
+            from threadpoolctl import threadpool_limits
+            with threadpool_limits(limits=cpus):
+                node.fn(*node.args, **node.kwargs)
+            return None
+        except Exception as e:
+            return e
+
+    # Record a node's end time and result, and cache it if it succeeded
+    def _finish(self, name, timings, fingerprints, run_start, error=None):
+        timing = timings[name]
+        timing["end"] = time.time() - run_start
+        if error is not None:
+            timing["status"] = "failed"
+            timing["error"] = str(error)
+            logger.error(f"Node '{name}' failed after {timing['end'] - timing['start']:.2f}s: {error}")
+            return
+
+        timing["status"] = "ran"
+        logger.info(f"Node '{name}' finished in {timing['end'] - timing['start']:.2f}s")
+        if self.cache is not None:
+            node = self.nodes[name]
+            self.cache.complete(name, fingerprints.get(name), node.outputs, run_start + timing["start"],
+                                node.rewritten)
+
+    # Timeline, parallelism and critical path (the chain of dependent nodes that determined the wall time)
+    def report(self, timings, wall_s):
+        durations = {name: t["end"] - t["start"] for name, t in timings.items() if "end" in t}
+
+        # Longest path ending at each node, by measured durations
+        longest, previous = {}, {}
+        for name in self.order:
+            if name not in durations:
+                continue
+            best_dep = max((dep for dep in self.deps[name] if dep in longest), key=longest.get, default=None)
+            longest[name] = durations[name] + (longest[best_dep] if best_dep else 0.0)
+            previous[name] = best_dep
+
+        path = []
+        name = max(longest, key=longest.get, default=None)
+        while name is not None:
+            path.append(name)
+            name = previous[name]
+        path.reverse()
+
+        busy = sum(durations.values())
+        report = {
+            "wall_s": round(wall_s, 3),
+            "node_time_s": round(busy, 3),
+            "parallelism": round(busy / wall_s, 2) if wall_s > 0 else None,
+            "cpu_budget": self.cpu_budget,
+            "executor": self.executor,
+            "critical_path": path,
+            "critical_path_s": round(longest[path[-1]], 3) if path else 0.0,
+            "nodes": {name: {key: (round(value, 3) if isinstance(value, float) else value)
+                             for key, value in t.items()} for name, t in timings.items()},
+        }
+        logger.info(f"Pipeline finished in {report['wall_s']}s; critical path "
+                    f"{' -> '.join(path)} ({report['critical_path_s']}s)")
+        logger.info(json.dumps({"event": "pipeline_report", **report}))
+        return report
@@ -1,12 +1,15 @@
 # Import required libraries
 import os  # For file and directory operations
+import numpy as np  # For vectorized hash-to-ratio conversion
 import pandas as pd  # For reading and manipulating CSV files
-from google.cloud import storage  # To interact with Google Cloud Storage
 from sklearn.model_selection import train_test_split  # For splitting dataset into train and test sets
 from src.logger import get_logger  # Custom logger for structured logging
 from src.custom_exception import CustomException  # Custom exception handling
+from src.instrumentation import instrument, current_stage  # Per-stage wall/CPU time, peak memory and row counts
 from config.paths_config import *  # File path constants (e.g., RAW_FILE_PATH, TRAIN_FILE_PATH, etc.)
-from utils.common_functions import read_yaml  # Utility function to read YAML configuration files
+from utils.common_functions import read_yaml, load_data, save_data, ChunkedWriter  # Config reading and dataset I/O
+from utils.common_functions import schema_read_options, downcast_to_schema  # Schema-driven CSV reads
+from src.object_storage import make_backend, ChunkedDownloader  # Bucket backends and resumable downloads
 import sys  # For extracting exception traceback
 
 # Initialize logger instance
@@ -21,55 +24,81 @@ class DataIngestion:
         Ensures raw data directory exists.
         """
         self.config = config["data_ingestion"]
+        self.schema = config.get("schema")  # Column dtypes, categoricals and skipped columns
         self.bucket_name = self.config["bucket_name"]
         self.file_name = self.config["bucket_file_name"]
         self.train_test_ratio = self.config["train_ratio"]
 
+        # Streaming split settings (fall back to the in-memory split when absent)
+        self.split_mode = self.config.get("split_mode", "memory")
+        self.split_key = self.config.get("split_key", "Booking_ID")
+        self.chunk_size = self.config.get("chunk_size", 100000)
+
+        # Storage backend (GCS or a local fake bucket) and the parallel range downloader
+        self.backend = make_backend(self.config)
+        self.downloader = ChunkedDownloader(
+            self.backend,
+            chunk_size=int(self.config.get("download_chunk_mb", 8) * 1024 * 1024),
+            max_workers=self.config.get("download_workers", 8),
+        )
+
         # Create the raw data directory if it does not exist
         os.makedirs(RAW_DIR, exist_ok=True)
 
         logger.info(f"Data Ingestion started with {self.bucket_name} and file is {self.file_name}")
 
+    @instrument()
     def download_csv_from_gcp(self):
         """
-        Downloads a CSV file from a Google Cloud Storage bucket and saves it locally.
-        Requires Application Default Credentials or a service account key to be set.
+        Downloads the CSV file from the bucket and saves it locally.
+        Skips the download when the manifest shows the object is unchanged; otherwise
+        fetches it as parallel byte-range chunks, resuming an interrupted download.
         """
         try:
-            # Create a Google Cloud Storage client (requires proper credentials)
-            client = storage.Client()
-
-            # Access the specified bucket
-            bucket = client.bucket(self.bucket_name)
-
-            # Reference the file (blob) inside the bucket
-            blob = bucket.blob(self.file_name)
-
-            # Download the file to the specified RAW_FILE_PATH
-            blob.download_to_filename(RAW_FILE_PATH)
-
-            logger.info(f"CSV file successfully downloaded to {RAW_FILE_PATH}")
+            self.downloader.download(self.file_name, RAW_FILE_PATH, RAW_MANIFEST_PATH)
+            logger.info(f"CSV file available at {RAW_FILE_PATH}")
 
         except Exception as e:
             logger.error("Error while downloading the CSV file from GCP")
             raise CustomException("Failed to download CSV file", sys)
 
+    def get_remote_version(self):
+        """
+        Returns the generation and MD5 hash of the source object in the bucket.
+        Used to fingerprint the ingestion stage without downloading the file.
+        """
+        try:
+            remote = self.backend.stat(self.file_name)
+            if remote is None:
+                return None
+            return {"generation": remote["generation"], "md5_hash": remote["md5_hash"]}
+
+        except Exception as e:
+            logger.warning(f"Could not read remote version of {self.file_name}: {e}")
+            return None
+
+    @instrument()
     def split_data(self):
         """
         Splits the raw dataset into training and testing datasets and saves them.
+        Dispatches to the streaming or in-memory split based on `split_mode`.
         """
+        if self.split_mode == "streaming":
+            return self.split_data_streaming()
+
         try:
             logger.info("Starting the data splitting process")
 
-            # Read the downloaded CSV file into a pandas DataFrame
-            data = pd.read_csv(RAW_FILE_PATH)
+            # Read the downloaded CSV file with the configured schema
+            data = load_data(RAW_FILE_PATH, schema=self.schema)
 
             # Split the data using the configured ratio
             train_data, test_data = train_test_split(data, test_size=1 - self.train_test_ratio, random_state=42)
 
             # Save the train and test data to specified file paths
-            train_data.to_csv(TRAIN_FILE_PATH, index=False)
-            test_data.to_csv(TEST_FILE_PATH, index=False)
+            save_data(train_data, TRAIN_FILE_PATH)
+            save_data(test_data, TEST_FILE_PATH)
+            self.report_rows(len(data), len(train_data) + len(test_data))
 
             logger.info(f"Train data saved to {TRAIN_FILE_PATH}")
             logger.info(f"Test data saved to {TEST_FILE_PATH}")
@@ -78,9 +107,67 @@ class DataIngestion:
             logger.error("Error while splitting data")
             raise CustomException("Failed to split data into training and test sets", sys)
 
-    def run(self):
+    def report_rows(self, rows_in, rows_out):
+        """
+        Records the split's row counts on the running instrumentation stage.
+        """
+        stage = current_stage()
+        if stage is not None:
+            stage.rows_in, stage.rows_out = rows_in, rows_out
+
+    def assign_to_train(self, keys):
+        """
+        Deterministically assigns rows to the training set by hashing the split key.
+        The 64-bit hash is mapped to [0, 1) and compared with the train ratio, so a
+        given Booking_ID always lands in the same split regardless of chunking or run.
+        """
+        hashes = pd.util.hash_pandas_object(keys.astype(str), index=False).to_numpy()
+        return (hashes / np.float64(2 ** 64)) < self.train_test_ratio
+
+    def split_data_streaming(self):
+        """
+        Splits the raw dataset chunk by chunk and appends each chunk to the train and
+        test files, so peak memory is bounded by `chunk_size` rather than file size.
+        """
+        try:
+            logger.info(f"Starting the streaming data split with chunk size {self.chunk_size}")
+
+            # Read the raw file lazily; only one chunk is held in memory at a time. The schema
+            # still applies, but the split key is read even if the schema skips it
+            options, drop_columns = {}, []
+            if self.schema:
+                options = schema_read_options(RAW_FILE_PATH, self.schema, keep_columns=[self.split_key])
+                drop_columns = [col for col in self.schema.get("skip_columns") or [] if col == self.split_key]
+            reader = pd.read_csv(RAW_FILE_PATH, chunksize=self.chunk_size, **options)
+
+            # Writers append each chunk to the train/test files in the configured format
+            with ChunkedWriter(TRAIN_FILE_PATH) as train_writer, ChunkedWriter(TEST_FILE_PATH) as test_writer:
+                for chunk in reader:
+                    if self.split_key not in chunk.columns:
+                        raise KeyError(f"Split key '{self.split_key}' not found in {RAW_FILE_PATH}")
+
+                    mask = self.assign_to_train(chunk[self.split_key])
+                    chunk = chunk.drop(columns=drop_columns)
+                    if self.schema:
+                        chunk = downcast_to_schema(chunk, self.schema)
+                    train_writer.write(chunk[mask])
+                    test_writer.write(chunk[~mask])
+
+            rows_written = train_writer.rows_written + test_writer.rows_written
+            self.report_rows(rows_written, rows_written)
+
+            logger.info(f"Train data saved to {TRAIN_FILE_PATH} ({train_writer.rows_written} rows)")
+            logger.info(f"Test data saved to {TEST_FILE_PATH} ({test_writer.rows_written} rows)")
+
+        except Exception as e:
+            logger.error(f"Error while splitting data in streaming mode: {e}")
+            raise CustomException("Failed to split data into training and test sets", sys)
+
+    def run(self, raise_errors=False):
         """
         Orchestrates the full data ingestion process: download and split.
+        With raise_errors, a failed download or split is re-raised instead of only logged,
+        so a pipeline stage running it fails rather than leaving stale outputs behind.
         """
         try:
             logger.info("Starting data ingestion process")
@@ -95,6 +182,8 @@ class DataIngestion:
 
         except CustomException as ce:
             logger.error(f"CustomException occurred during data ingestion: {str(ce)}")
+            if raise_errors:
+                raise
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
             raise CustomException("Unexpected error during data ingestion", sys)
@@ -7,13 +7,12 @@ import sys
 # Import custom utilities and configuration
 from src.logger import get_logger  # Custom logger to log info, warnings, and errors
 from src.custom_exception import CustomException  # Custom exception class for clean error handling
+from src.instrumentation import instrument, current_stage  # Per-stage wall/CPU time, peak memory and row counts
 from config.paths_config import *  # Load file paths used in the pipeline (train/test/config)
-from utils.common_functions import read_yaml, load_data  # Helper functions for reading config and loading data
-
-# Import machine learning and preprocessing libraries
-from sklearn.ensemble import RandomForestClassifier  # For feature importance-based selection
-from sklearn.preprocessing import LabelEncoder  # For encoding categorical variables
-from imblearn.over_sampling import SMOTE  # For balancing imbalanced datasets
+from utils.common_functions import read_yaml, load_data, save_data, ChunkedWriter  # Config reading and dataset I/O
+from src.reservation_transformer import ReservationTransformer  # Persisted preprocessing state
+from src.feature_selection import FeatureRanker  # Configurable feature ranking methods
+from src.balancing import ChunkedSMOTE, METHODS as BALANCING_METHODS  # Scalable class balancing
 
 # Initialize the logger for this module
 logger = get_logger(__name__)
@@ -30,12 +29,23 @@ class DataProcessor:
         # Load YAML config for preprocessing parameters
         self.config = read_yaml(config_path)
 
+        # Class balancing settings: "smote", "class_weight" or "none"
+        self.balancing_config = self.config.get("balancing", {})
+        self.balancing_method = self.balancing_config.get("method", "smote")
+        if self.balancing_method not in BALANCING_METHODS:
+            raise ValueError(f"Unknown balancing method '{self.balancing_method}', expected one of {BALANCING_METHODS}")
+
+        # Fit-once transformer shared by training, test and serving
+        self.transformer = ReservationTransformer.from_config(self.config)
+
         # Create processed directory if it does not exist
         if not os.path.exists(self.processed_dir):
             os.makedirs(self.processed_dir)
 
     # Method for preprocessing: drop columns, encode, fix skewness
-    def preprocess_data(self, df):
+    # The transformer is fitted on the training split only and reused as-is for the test split
+    @instrument()
+    def preprocess_data(self, df, fit=False):
         try:
             logger.info("Starting our Data Processing step")
 
@@ -45,61 +55,50 @@ class DataProcessor:
 
             df.drop_duplicates(inplace=True)  # Remove duplicate rows
 
-            # Get categorical and numerical column names from config
-            cat_cols = self.config["data_processing"]["categorical_columns"]
-            num_cols = self.config["data_processing"]["numerical_columns"]
-
-            # Log the start of label encoding
-            logger.info("Applying Label Encoding")
-            label_encoder = LabelEncoder()  # Initialize label encoder
-            mappings = {}  # To store category-to-code mappings
-
-            # Apply label encoding to each categorical column
-            for col in cat_cols:
-                df[col] = label_encoder.fit_transform(df[col])  # Replace categories with numbers
-                mappings[col] = {
-                    label: code for label, code in zip(
-                        label_encoder.classes_,
-                        label_encoder.transform(label_encoder.classes_)
-                    )
-                }
-
-            # Log encoded label mappings for traceability
-            logger.info("Label Mappings are:")
-            for col, mapping in mappings.items():
-                logger.info(f"{col} : {mapping}")
-
-            # Handle skewed numerical features by applying log1p
-            logger.info("Doing Skewness Handling")
-            skew_threshold = self.config["data_processing"]["skewness_threshold"]  # Skew threshold from config
-            skewness = df[num_cols].apply(lambda x: x.skew())  # Calculate skewness for numeric columns
-
-            # Log transform skewed columns
-            for column in skewness[skewness > skew_threshold].index:
-                df[column] = np.log1p(df[column])  # log1p handles zero values safely
-
-            return df  # Return the cleaned DataFrame
+            if fit:
+                # Learn label encodings and skewed columns once, from the training data
+                logger.info("Fitting Label Encoding and Skewness Handling")
+                self.transformer.fit(df)
+
+                # Log encoded label mappings for traceability, as one record
+                logger.info(f"Label Mappings are: {self.transformer.get_mappings()}")
+
+            # Apply the fitted encodings, log1p and dtype downcasting in one vectorized pass
+            logger.info("Applying Label Encoding and Skewness Handling")
+            bytes_before = df.memory_usage(deep=True).sum()
+            df = self.transformer.transform(df, select_features=False)
+            bytes_after = df.memory_usage(deep=True).sum()
+
+            rows = max(len(df), 1)
+            logger.info(f"Memory per row: {bytes_before / rows:.1f} B raw -> {bytes_after / rows:.1f} B processed")
+            return df
 
         except Exception as e:
             logger.error(f"Error during preprocess step: {e}")
             raise CustomException("Error while preprocessing data", sys)
 
 
-    # Method to balance classes using SMOTE
+    # Method to balance classes with chunked SMOTE, or to leave the data as-is when the
+    # imbalance is handled with class weights at training time
+    @instrument()
     def balance_data(self, df):
         try:
             logger.info("Handling Imbalanced Data")
 
+            if self.balancing_method != "smote":
+                logger.info(f"Balancing method is '{self.balancing_method}'; no synthetic rows generated")
+                return df
+
             # Separate features and target variable
             X = df.drop(columns='booking_status')
             y = df["booking_status"]
 
-            # Apply SMOTE to oversample minority class
-            smote = SMOTE(random_state=42)
+            # Oversample minority classes with a multi-core neighbor index, in bounded chunks
+            smote = ChunkedSMOTE.from_config(self.balancing_config)
             X_resampled, y_resampled = smote.fit_resample(X, y)
 
             # Combine resampled features and target into a new DataFrame
-            balanced_df = pd.DataFrame(X_resampled, columns=X.columns)
+            balanced_df = X_resampled
             balanced_df["booking_status"] = y_resampled
 
             logger.info("Data balanced successfully")
@@ -109,7 +108,8 @@ class DataProcessor:
             logger.error(f"Error during balancing data step: {e}")
             raise CustomException("Error while balancing data", sys)
 
-    # Method to select top N important features using Random Forest
+    # Method to select top N important features with the configured ranking method
+    @instrument()
     def select_features(self, df):
         try:
             logger.info("Starting our Feature selection step")
@@ -118,26 +118,17 @@ class DataProcessor:
             X = df.drop(columns='booking_status')
             y = df["booking_status"]
 
-            # Train Random Forest to determine feature importance
-            model = RandomForestClassifier(random_state=42)
-            model.fit(X, y)
-
-            feature_importance = model.feature_importances_  # Get importance scores
-
-            # Create a DataFrame of features and their importance
-            feature_importance_df = pd.DataFrame({
-                'feature': X.columns,
-                'importance': feature_importance
-            })
-
-            # Sort features by importance (highest first)
-            top_features_importance_df = feature_importance_df.sort_values(by="importance", ascending=False)
-
             # Get number of top features to select from config
             num_features_to_select = self.config["data_processing"]["no_of_features"]
-            top_10_features = top_features_importance_df["feature"].head(num_features_to_select).values
+
+            # Rank features (random forest, subsampled forest or LightGBM gain; cached by data fingerprint)
+            ranker = FeatureRanker(self.config.get("feature_selection", {}), FEATURE_RANKING_CACHE_PATH)
+            ranking = ranker.rank(X, y, top_k=num_features_to_select)
+
+            top_10_features = ranking.index[:num_features_to_select].values
 
             logger.info(f"Features selected: {top_10_features}")
+            self.transformer.set_selected_features(top_10_features.tolist())
 
             # Keep only top features and target in the final DataFrame
             top_10_df = df[top_10_features.tolist() + ["booking_status"]]
@@ -149,32 +140,40 @@ class DataProcessor:
             logger.error(f"Error during feature selection step: {e}")
             raise CustomException("Error while feature selection", e)
 
-    # Save processed data to CSV file
+    # Save processed data in the configured artifact format (CSV, Parquet or Feather)
+    @instrument()
     def save_data(self, df, file_path):
         try:
             logger.info("Saving our data in processed folder")
-            df.to_csv(file_path, index=False)  # Save DataFrame to CSV without index
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+            save_data(df, file_path)  # Format is picked from the file extension
             logger.info(f"Data saved successfully to {file_path}")
         except Exception as e:
             logger.error(f"Error during saving data step: {e}")
             raise CustomException("Error while saving data", sys)
 
     # Main processing pipeline: load → preprocess → balance → select → save
+    @instrument()
     def process(self):
         try:
             logger.info("Loading data from RAW directory")
 
-            # Load training and test data
-            train_df = load_data(self.train_path)
-            test_df = load_data(self.test_path)
+            # Load training and test data with the configured schema
+            schema = self.config.get("schema")
+            train_df = load_data(self.train_path, schema=schema)
+            test_df = load_data(self.test_path, schema=schema)
+            # Row counts for this stage's instrumentation record
+            stage = current_stage()
+            stage.rows_in = len(train_df) + len(test_df)
 
-            # Preprocess both datasets
-            train_df = self.preprocess_data(train_df)
+            # Preprocess both datasets, fitting the transformer on the training set only
+            train_df = self.preprocess_data(train_df, fit=True)
             test_df = self.preprocess_data(test_df)
 
-            # Balance both datasets (if needed)
+            # Balance the training set; the test set only if configured
             train_df = self.balance_data(train_df)
-            test_df = self.balance_data(test_df)
+            if self.balancing_config.get("balance_test", False):
+                test_df = self.balance_data(test_df)
 
             # Select important features from training set
             train_df = self.select_features(train_df)
@@ -185,6 +184,10 @@ class DataProcessor:
             # Save processed train and test datasets to disk
             self.save_data(train_df, PROCESSED_TRAIN_DATA_PATH)
             self.save_data(test_df, PROCESSED_TEST_DATA_PATH)
+            stage.rows_out = len(train_df) + len(test_df)
+
+            # Persist the fitted transformer next to the model for serving and batch scoring
+            self.transformer.save(PREPROCESSOR_OUTPUT_PATH)
 
             logger.info("Data processing completed successfully")
 
@@ -192,6 +195,76 @@ class DataProcessor:
             logger.error(f"Error during preprocessing pipeline: {e}")
             raise CustomException("Error while running data preprocessing pipeline", sys)
 
+    # File-based steps of process(), run as separate nodes by the pipeline's DAG runner so
+    # independent work (test preprocessing, balancing) can overlap
+
+    # Fit the transformer on the raw training split and save the preprocessed rows
+    @instrument()
+    def preprocess_train_file(self, output_path, transformer_path):
+        try:
+            train_df = load_data(self.train_path, schema=self.config.get("schema"))
+            self.save_data(self.preprocess_data(train_df, fit=True), output_path)
+            self.transformer.save(transformer_path)
+        except Exception as e:
+            logger.error(f"Error while preprocessing the training split: {e}")
+            raise CustomException("Error while preprocessing the training split", sys)
+
+    # Preprocess the raw test split with the transformer fitted on the training split
+    @instrument()
+    def preprocess_test_file(self, output_path, transformer_path):
+        try:
+            self.transformer = ReservationTransformer.load(transformer_path)
+            test_df = load_data(self.test_path, schema=self.config.get("schema"))
+            self.save_data(self.preprocess_data(test_df), output_path)
+        except Exception as e:
+            logger.error(f"Error while preprocessing the test split: {e}")
+            raise CustomException("Error while preprocessing the test split", sys)
+
+    # Balance one preprocessed split; with SMOTE the synthetic rows are streamed to the output
+    # file chunk by chunk instead of being concatenated in memory
+    @instrument()
+    def balance_file(self, input_path, output_path):
+        df = load_data(input_path)
+        if self.balancing_method != "smote":
+            self.save_data(self.balance_data(df), output_path)
+            return
+        try:
+            logger.info("Handling Imbalanced Data")
+            X, y = df.drop(columns="booking_status"), df["booking_status"]
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            with ChunkedWriter(output_path) as writer:
+                rows = ChunkedSMOTE.from_config(self.balancing_config).resample_to(X, y, writer)
+            current_stage().rows_out = rows
+            logger.info(f"Data balanced successfully; {rows} rows written to {output_path}")
+        except Exception as e:
+            logger.error(f"Error during balancing data step: {e}")
+            raise CustomException("Error while balancing data", sys)
+
+    # Select features on the balanced training rows; saves the processed training set and the
+    # final transformer (with its selected features) for training and serving
+    @instrument()
+    def select_features_file(self, input_path, transformer_path):
+        try:
+            self.transformer = ReservationTransformer.load(transformer_path)
+            train_df = self.select_features(load_data(input_path))
+            self.save_data(train_df, PROCESSED_TRAIN_DATA_PATH)
+            self.transformer.save(PREPROCESSOR_OUTPUT_PATH)
+        except Exception as e:
+            logger.error(f"Error while selecting features: {e}")
+            raise CustomException("Error while selecting features", sys)
+
+    # Align the test split to the selected features of the final transformer
+    @instrument()
+    def align_test_file(self, input_path):
+        try:
+            transformer = ReservationTransformer.load(PREPROCESSOR_OUTPUT_PATH)
+            test_df = load_data(input_path)
+            self.save_data(test_df[transformer.selected_features + [transformer.target_column]],
+                           PROCESSED_TEST_DATA_PATH)
+        except Exception as e:
+            logger.error(f"Error while aligning the test split: {e}")
+            raise CustomException("Error while aligning the test split", sys)
+
 # Run the data processing pipeline when this file is executed
 if __name__ == "__main__":
     processor = DataProcessor(TRAIN_FILE_PATH, TEST_FILE_PATH, PROCESSED_DIR, CONFIG_PATH)
@@ -0,0 +1,67 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+import glob  # For cleaning up binaries of older datasets
+
+# Import LightGBM
+import lightgbm as lgb  # For binned Dataset construction and binary serialization
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from utils.common_functions import dict_fingerprint  # Stable hash of the binning parameters
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Caches LightGBM's binned training Dataset in its binary format, keyed by the data fingerprint,
+# the binning parameters and the feature names
+class BinnedDatasetCache:
+
+    # Initialize with the cache directory and the parameters that control binning
+    def __init__(self, cache_dir, dataset_params=None):
+        self.cache_dir = cache_dir
+        self.dataset_params = dict(dataset_params or {})
+        self.dataset_params.setdefault("verbose", -1)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # Binary path for a given data fingerprint; a change of binning parameters or of the feature
+    # set (e.g. a different feature selection) gives a different file instead of a stale binary
+    def path_for(self, data_fp, feature_names=None):
+        key = dict_fingerprint({"params": self.dataset_params, "features": feature_names})
+        return os.path.join(self.cache_dir, f"train_{data_fp[:16]}_{key[:16]}.bin")
+
+    # Return a constructed Dataset, loading the cached binary or binning X once and saving it.
+    # X can also be a lightgbm Sequence, which is binned from batched reads instead of in memory.
+    def get(self, X, y, data_fp, feature_name="auto"):
+        try:
+            feature_names = list(X.columns) if hasattr(X, "columns") else (
+                list(feature_name) if feature_name != "auto" else None)
+            path = self.path_for(data_fp, feature_names)
+
+            if os.path.exists(path):
+                logger.info(f"Loading binned LightGBM dataset from {path}")
+                dataset = lgb.Dataset(path, params=self.dataset_params, free_raw_data=False)
+                return dataset.construct()
+
+            logger.info("Binning the training data into a LightGBM dataset")
+            dataset = lgb.Dataset(X, label=y, feature_name=feature_name, params=self.dataset_params,
+                                  free_raw_data=False).construct()
+
+            # Older binaries belong to previous versions of the processed data
+            for stale in glob.glob(os.path.join(self.cache_dir, "train_*.bin")):
+                os.remove(stale)
+            dataset.save_binary(path)
+            logger.info(f"Binned LightGBM dataset saved to {path}")
+            return dataset
+
+        except Exception as e:
+            logger.error(f"Error while building the binned dataset: {e}")
+            raise CustomException("Failed to build binned LightGBM dataset", sys)
+
+    # Fold subsets share the parent's bin mappers, so they are built without re-binning
+    @staticmethod
+    def fold_subsets(dataset, folds):
+        return [(dataset.subset(train_idx).construct(), dataset.subset(valid_idx).construct())
+                for train_idx, valid_idx in folds]
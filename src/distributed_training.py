@@ -0,0 +1,177 @@
+# Import standard libraries
+import os  # For CPU counts and shard paths
+import sys  # For extracting exception traceback
+import queue  # For the Empty exception of the result queue
+import socket  # For finding free listen ports
+import tempfile  # For the shard directory
+import traceback  # For sending worker errors back to the parent
+import multiprocessing  # For spawned, terminable worker processes
+
+# Import data libraries
+import numpy as np  # For shard files
+import lightgbm as lgb  # For socket-based distributed training
+
+# Import custom utilities
+from src.logger import get_logger, init_worker_logging, worker_log_queue  # Logging, forwarded from workers
+from src.custom_exception import CustomException  # Custom exception handling
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# Rows converted and routed to shards at a time
+SHARD_BATCH_ROWS = 100_000
+
+# Attempts with freshly picked ports when another process took a port before a worker bound it
+PORT_ATTEMPTS = 3
+
+
+# Ask the OS for n currently free TCP ports on the host
+def free_ports(n, host="127.0.0.1"):
+    sockets = []
+    try:
+        for _ in range(n):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind((host, 0))
+            sockets.append(sock)
+        return [sock.getsockname()[1] for sock in sockets]
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+# Runs in a worker process: load this worker's shard and join the socket ring; every worker ends
+# with the same model, so only rank 0 sends it back. Puts (rank, model string, error) on results.
+def _train_worker(rank, shard_dir, feature_names, params, num_boost_round, results, log_queue):
+    init_worker_logging(log_queue)
+    try:
+        X = np.fromfile(os.path.join(shard_dir, f"X_{rank}.bin"), dtype=np.float64).reshape(-1, len(feature_names))
+        y = np.load(os.path.join(shard_dir, f"y_{rank}.npy"))
+        dataset = lgb.Dataset(X, label=y, feature_name=feature_names, params={"verbose": -1})
+        booster = lgb.train(params, dataset, num_boost_round=num_boost_round)
+        results.put((rank, booster.model_to_string() if rank == 0 else None, None))
+    except Exception as e:
+        results.put((rank, None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"))
+
+
+# Data-parallel LightGBM (tree_learner="data") across worker processes that talk over sockets.
+# The training rows are split round-robin into one shard per worker; each worker bins and
+# histograms only its shard and the histograms are reduced over the network, so the fitted
+# trees match a single-node fit up to the distributed bin boundaries.
+class DistributedTrainer:
+
+    def __init__(self, num_workers=2, host="127.0.0.1", base_port=0, num_threads=0, time_out=5):
+        if num_workers < 2:
+            raise ValueError(f"Distributed training needs at least 2 workers, got {num_workers}")
+        self.num_workers = num_workers
+        self.host = host
+        self.base_port = base_port
+        # Split the cores between the workers unless a per-worker thread count is configured
+        self.num_threads = num_threads or max(1, (os.cpu_count() or 1) // num_workers)
+        self.time_out = time_out
+
+    # LightGBM network parameters of one worker
+    def network_params(self, rank, ports):
+        return {
+            "tree_learner": "data",
+            "num_machines": self.num_workers,
+            "machines": ",".join(f"{self.host}:{port}" for port in ports),
+            "local_listen_port": ports[rank],
+            "pre_partition": True,  # Each worker trains on its own shard
+            "num_threads": self.num_threads,
+            "time_out": self.time_out,
+        }
+
+    # Write rows i, i + n, i + 2n, ... to shard i, a batch at a time. X is a DataFrame, an array
+    # or a lightgbm Sequence, so out-of-core training data is sharded without loading it whole.
+    def write_shards(self, X, y, shard_dir):
+        y = np.asarray(y)
+        files = [open(os.path.join(shard_dir, f"X_{rank}.bin"), "wb") for rank in range(self.num_workers)]
+        try:
+            for start in range(0, len(y), SHARD_BATCH_ROWS):
+                stop = min(start + SHARD_BATCH_ROWS, len(y))
+                batch = X.iloc[start:stop] if hasattr(X, "iloc") else X[start:stop]
+                batch = np.asarray(batch, dtype=np.float64)
+                for rank, f in enumerate(files):
+                    # Row positions in this batch that belong to the shard, continuing the global round-robin
+                    batch[(rank - start) % self.num_workers::self.num_workers].tofile(f)
+        finally:
+            for f in files:
+                f.close()
+
+        for rank in range(self.num_workers):
+            np.save(os.path.join(shard_dir, f"y_{rank}.npy"), y[rank::self.num_workers])
+
+    # Start one process per rank and wait for all of them; returns rank 0's model string. A worker
+    # that fails, or dies without reporting (e.g. killed), leaves the others blocked on their
+    # sockets, so all workers are stopped on the first one.
+    def run_workers(self, params, shard_dir, feature_names, num_boost_round, ports):
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [context.Process(target=_train_worker, daemon=True,
+                                   args=(rank, shard_dir, list(feature_names),
+                                         {**params, **self.network_params(rank, ports)},
+                                         num_boost_round, results, worker_log_queue()))
+                   for rank in range(self.num_workers)]
+        try:
+            for worker in workers:
+                worker.start()
+
+            model_str, pending = None, set(range(self.num_workers))
+            while pending:
+                try:
+                    rank, payload, error = results.get(timeout=1.0)
+                except queue.Empty:
+                    # Only a worker that exited without a result is reported; its result may
+                    # still be in flight when the exit code is seen, so wait once more
+                    exited = [rank for rank in pending if workers[rank].exitcode is not None]
+                    if not exited:
+                        continue
+                    try:
+                        rank, payload, error = results.get(timeout=5.0)
+                    except queue.Empty:
+                        rank = exited[0]
+                        raise RuntimeError(f"Worker {rank} exited with code {workers[rank].exitcode} "
+                                           f"without a result") from None
+
+                if error is not None:
+                    raise RuntimeError(f"Worker {rank} failed: {error}")
+                pending.discard(rank)
+                if rank == 0:
+                    model_str = payload
+            return model_str
+
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            results.close()
+
+    # Train on all workers and return the resulting Booster
+    def train(self, params, X, y, num_boost_round, feature_names):
+        try:
+            with tempfile.TemporaryDirectory(prefix="lgbm_shards_") as shard_dir:
+                self.write_shards(X, y, shard_dir)
+
+                for attempt in range(1, PORT_ATTEMPTS + 1):
+                    ports = (list(range(self.base_port, self.base_port + self.num_workers)) if self.base_port
+                             else free_ports(self.num_workers, self.host))
+                    logger.info(f"Distributed training on {self.num_workers} workers "
+                                f"({self.num_threads} threads each) at {self.host} ports {ports}")
+                    try:
+                        model_str = self.run_workers(params, shard_dir, feature_names, num_boost_round, ports)
+                        break
+                    except RuntimeError as e:
+                        # Picked ports are only free until a worker binds them; pick new ones and retry
+                        if self.base_port or attempt == PORT_ATTEMPTS or "bind" not in str(e).lower():
+                            raise
+                        logger.warning(f"A worker could not bind its port (attempt {attempt}); retrying with new ports")
+
+            booster = lgb.Booster(model_str=model_str)
+            logger.info(f"Distributed training finished with {booster.current_iteration()} trees")
+            return booster
+
+        except Exception as e:
+            logger.error(f"Error during distributed training: {e}")
+            raise CustomException("Failed to train the model on distributed workers", sys)
@@ -0,0 +1,153 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+import json  # For the cached ranking file
+import time  # For timing each ranking method
+import hashlib  # For fingerprinting the training data
+
+# Import data and ML libraries
+import numpy as np  # For row subsampling
+import pandas as pd  # For data hashing and importance tables
+from scipy.stats import spearmanr  # For ranking stability against the reference method
+from sklearn.ensemble import RandomForestClassifier  # For forest-based importances
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from utils.common_functions import dict_fingerprint  # Stable hashing of the method settings
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# Ranking methods selectable from config.yaml
+METHODS = ("random_forest", "subsampled_forest", "lightgbm_gain")
+
+
+# Fingerprint of a feature matrix and target, independent of where it was loaded from
+def frame_fingerprint(X, y):
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, X.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# Ranks features by importance with a configurable method, optionally cached by data fingerprint
+class FeatureRanker:
+
+    # Initialize from the feature_selection section of config.yaml
+    def __init__(self, config, cache_path=None):
+        self.method = config.get("method", "random_forest")
+        if self.method not in METHODS:
+            raise ValueError(f"Unknown feature selection method '{self.method}', expected one of {METHODS}")
+
+        self.sample_rows = config.get("sample_rows", 20000)
+        self.n_estimators = config.get("n_estimators", 100)
+        self.n_jobs = config.get("n_jobs", -1)
+        self.use_cache = config.get("cache_ranking", True)
+        self.compare_with_reference = config.get("compare_with_reference", False)
+        self.random_state = config.get("random_state", 42)
+        self.cache_path = cache_path
+
+    # Original method: default RandomForestClassifier on every row
+    def _rank_random_forest(self, X, y):
+        model = RandomForestClassifier(random_state=self.random_state)
+        model.fit(X, y)
+        return model.feature_importances_
+
+    # Multi-core forest on a stratified row sample
+    def _rank_subsampled_forest(self, X, y):
+        if len(X) > self.sample_rows:
+            rng = np.random.default_rng(self.random_state)
+            fraction = self.sample_rows / len(X)
+            # Sample the same fraction of every class so the balance is preserved
+            idx = np.concatenate([
+                rng.choice(np.flatnonzero(y.to_numpy() == label),
+                           size=max(1, int(round(fraction * count))), replace=False)
+                for label, count in y.value_counts().items()
+            ])
+            X, y = X.iloc[idx], y.iloc[idx]
+
+        model = RandomForestClassifier(n_estimators=self.n_estimators, n_jobs=self.n_jobs,
+                                       random_state=self.random_state)
+        model.fit(X, y)
+        return model.feature_importances_
+
+    # Total split gain of a LightGBM model
+    def _rank_lightgbm_gain(self, X, y):
+        import lightgbm as lgb
+
+        model = lgb.LGBMClassifier(n_estimators=self.n_estimators, importance_type="gain",
+                                   n_jobs=self.n_jobs, random_state=self.random_state, verbose=-1)
+        model.fit(X, y)
+        return model.feature_importances_
+
+    # Importance of every feature with the given method, sorted highest first
+    def _rank_with(self, method, X, y):
+        start = time.perf_counter()
+        importance = getattr(self, f"_rank_{method}")(X, y)
+        elapsed = time.perf_counter() - start
+
+        ranking = pd.Series(importance, index=X.columns, dtype=float)
+        ranking = ranking / ranking.sum() if ranking.sum() > 0 else ranking
+        logger.info(f"Feature ranking with '{method}' took {elapsed:.2f}s")
+        return ranking.sort_values(ascending=False), elapsed
+
+    # Cache key: the data plus every setting that changes the ranking
+    def _cache_key(self, X, y):
+        return dict_fingerprint({
+            "data": frame_fingerprint(X, y),
+            "method": self.method,
+            "sample_rows": self.sample_rows,
+            "n_estimators": self.n_estimators,
+            "random_state": self.random_state,
+        })
+
+    def _read_cache(self, key):
+        if not (self.use_cache and self.cache_path and os.path.exists(self.cache_path)):
+            return None
+        with open(self.cache_path, "r") as f:
+            cached = json.load(f)
+        if cached.get("key") != key:
+            return None
+        return pd.Series(cached["ranking"], dtype=float)
+
+    def _write_cache(self, key, ranking):
+        if not (self.use_cache and self.cache_path):
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            json.dump({"key": key, "method": self.method, "ranking": ranking.to_dict()}, f, indent=2)
+
+    # Compare a ranking with the reference random forest: top-k overlap and Spearman correlation
+    def stability_report(self, ranking, X, y, top_k):
+        reference, reference_time = self._rank_with("random_forest", X, y)
+        top_overlap = len(set(ranking.index[:top_k]) & set(reference.index[:top_k])) / top_k
+        correlation = spearmanr(ranking.rank(ascending=False),
+                                reference.reindex(ranking.index).rank(ascending=False)).correlation
+        report = {"top_k_overlap": top_overlap, "spearman": float(correlation),
+                  "reference_seconds": reference_time}
+        logger.info(f"Ranking stability vs random_forest: top-{top_k} overlap {top_overlap:.2f}, "
+                    f"Spearman {correlation:.3f}")
+        return report
+
+    # Rank features, reusing the cached ranking while the data and settings are unchanged
+    def rank(self, X, y, top_k=None):
+        try:
+            key = self._cache_key(X, y)
+            cached = self._read_cache(key)
+            if cached is not None:
+                logger.info(f"Reusing cached '{self.method}' feature ranking from {self.cache_path}")
+                return cached
+
+            ranking, _ = self._rank_with(self.method, X, y)
+            self._write_cache(key, ranking)
+
+            if self.compare_with_reference and self.method != "random_forest":
+                self.stability_report(ranking, X, y, top_k or len(ranking))
+
+            return ranking
+
+        except Exception as e:
+            logger.error(f"Error while ranking features: {e}")
+            raise CustomException("Failed to rank features", sys)
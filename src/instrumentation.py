@@ -0,0 +1,140 @@
+# Import standard libraries
+import sys  # For platform checks
+import json  # For structured log lines
+import time  # For wall and CPU time
+import functools  # For wrapping instrumented methods
+import threading  # For guarding the shared record list
+from contextlib import contextmanager  # For the stage context manager
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# Every stage finished in this process, in completion order
+_records = []
+_records_lock = threading.Lock()
+
+# Stages currently running on each thread, innermost last
+_active = threading.local()
+
+
+# High-water mark of the process's resident memory in MB (None where `resource` is unavailable)
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Number of rows in a DataFrame, Series or array (first element for tuples), else None
+def count_rows(value):
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if hasattr(value, "shape") and len(getattr(value, "shape", ())) > 0:
+        return int(value.shape[0])
+    return None
+
+
+# Measurements of one stage execution
+class StageMetrics:
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_s = None
+        self.cpu_s = None
+        self.peak_rss_mb = None
+        self.peak_rss_delta_mb = None  # How much this stage raised the process memory high-water mark
+        self.status = "ok"
+
+    def to_dict(self):
+        return {"stage": self.name, "status": self.status, "wall_s": self.wall_s, "cpu_s": self.cpu_s,
+                "peak_rss_mb": self.peak_rss_mb, "peak_rss_delta_mb": self.peak_rss_delta_mb,
+                "rows_in": self.rows_in, "rows_out": self.rows_out}
+
+
+# Context manager that measures a block and emits one JSON log line when it ends.
+# Set `rows_out` (and `rows_in` if not passed) on the yielded StageMetrics inside the block.
+@contextmanager
+def track_stage(name, rows_in=None):
+    metrics = StageMetrics(name, rows_in)
+    stack = _active.__dict__.setdefault("stack", [])
+    stack.append(metrics)
+    peak_before = peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield metrics
+    except BaseException:
+        metrics.status = "error"
+        raise
+    finally:
+        stack.pop()
+
+        # CPU time covers every thread of the process (e.g. LightGBM and neighbor-search threads)
+        metrics.wall_s = round(time.perf_counter() - wall_start, 4)
+        metrics.cpu_s = round(time.process_time() - cpu_start, 4)
+        peak_after = peak_rss_mb()
+        if peak_after is not None:
+            metrics.peak_rss_mb = round(peak_after, 1)
+            metrics.peak_rss_delta_mb = round(peak_after - peak_before, 1)
+
+        with _records_lock:
+            _records.append(metrics)
+        logger.info(json.dumps({"event": "stage_metrics", **metrics.to_dict()}))
+
+
+# Decorator form of track_stage for stage methods. Rows in are taken from the first
+# DataFrame/array argument and rows out from the return value (first item of a tuple).
+def instrument(name=None):
+    def decorator(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows_in = next((rows for rows in map(count_rows, list(args) + list(kwargs.values()))
+                            if rows is not None), None)
+            with track_stage(stage_name, rows_in) as metrics:
+                result = func(*args, **kwargs)
+                rows_out = count_rows(result)
+                if rows_out is not None:
+                    metrics.rows_out = rows_out
+            return result
+        return wrapper
+    return decorator
+
+
+# Innermost stage running on this thread, so code without DataFrame arguments or results
+# (e.g. chunked readers) can report its own row counts; None outside any stage
+def current_stage():
+    stack = getattr(_active, "stack", None)
+    return stack[-1] if stack else None
+
+
+# Stage records collected so far in this process (optionally from a given position on)
+def recorded_stages(since=0):
+    with _records_lock:
+        return list(_records[since:])
+
+
+# Flatten stage records into MLflow metrics: "<stage>.wall_s" etc. Stages that ran more than
+# once are aggregated (times and rows summed, memory maximized).
+def stage_metrics_for_mlflow(records):
+    totals = {}
+    for record in records:
+        entry = totals.setdefault(record.name, {})
+        for key in ("wall_s", "cpu_s", "rows_in", "rows_out"):
+            value = getattr(record, key)
+            if value is not None:
+                entry[key] = entry.get(key, 0) + value
+        for key in ("peak_rss_mb", "peak_rss_delta_mb"):
+            value = getattr(record, key)
+            if value is not None:
+                entry[key] = max(entry.get(key, value), value)
+
+    return {f"{stage}.{key}": value for stage, entry in totals.items() for key, value in entry.items()}
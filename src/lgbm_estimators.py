@@ -0,0 +1,81 @@
+# Import LightGBM and scikit-learn helpers
+import numpy as np  # For class labels and probability columns
+import lightgbm as lgb  # LightGBM model and early stopping callback
+from sklearn.model_selection import train_test_split  # For carving a validation split out of each fit
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# LGBMClassifier that early-stops on a validation split taken from whatever data it is fitted on,
+# so every CV fold of a hyperparameter search stops on its own held-out rows
+class EarlyStoppingLGBMClassifier(lgb.LGBMClassifier):
+
+    def __init__(self, early_stopping_rounds=None, validation_fraction=0.1, **kwargs):
+        self.early_stopping_rounds = early_stopping_rounds
+        self.validation_fraction = validation_fraction
+        super().__init__(**kwargs)
+
+    # Keep the wrapper's own settings out of the booster parameters; LightGBM would otherwise
+    # read early_stopping_rounds as its own alias and demand an eval set on every fit
+    def _process_params(self, stage):
+        params = super()._process_params(stage)
+        params.pop("early_stopping_rounds", None)
+        params.pop("validation_fraction", None)
+        return params
+
+    def fit(self, X, y, **fit_params):
+        # dart re-weights earlier trees, so LightGBM does not support early stopping with it
+        if not self.early_stopping_rounds or self.boosting_type == "dart" or "eval_set" in fit_params:
+            return super().fit(X, y, **fit_params)
+
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X, y, test_size=self.validation_fraction, stratify=y, random_state=self.random_state
+        )
+        callbacks = list(fit_params.pop("callbacks", None) or [])
+        callbacks.append(lgb.early_stopping(self.early_stopping_rounds, verbose=False))
+
+        return super().fit(X_fit, y_fit, eval_set=[(X_val, y_val)], callbacks=callbacks, **fit_params)
+
+    # Tree count picked by early stopping on the validation split, or n_estimators when
+    # early stopping does not apply
+    def early_stopped_rounds(self, X, y):
+        if not self.early_stopping_rounds or self.boosting_type == "dart":
+            return self.n_estimators
+        probe = self.__class__(**self.get_params()).fit(X, y)
+        return probe.best_iteration_ or self.n_estimators
+
+    # Final fit on every row without holding out a validation split: n_estimators trees are
+    # grown, by default the count early stopping picked on the split
+    def fit_full(self, X, y, n_estimators=None, **fit_params):
+        if n_estimators is None:
+            n_estimators = self.early_stopped_rounds(X, y)
+        self.set_params(n_estimators=int(n_estimators))
+        return lgb.LGBMClassifier.fit(self, X, y, **fit_params)
+
+
+# Fitted binary classifier around a Booster trained with lgb.train (out-of-core training).
+# It exposes the parts of the LGBMClassifier interface used for evaluation, serving, MLflow
+# logging and the tree-engine export, and pickles like one.
+class BoosterClassifier:
+
+    def __init__(self, booster, classes=(0, 1), params=None):
+        self.booster_ = booster
+        self.classes_ = np.asarray(classes)
+        self.params = dict(params or {})
+        self.feature_name_ = booster.feature_name()
+        self.n_features_in_ = booster.num_feature()
+
+    def get_params(self, deep=True):
+        return dict(self.params)
+
+    def predict_proba(self, X):
+        positive = self.booster_.predict(X)
+        return np.column_stack([1.0 - positive, positive])
+
+    # Same tie-breaking as LGBMClassifier: the first class wins at exactly 0.5
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
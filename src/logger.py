@@ -1,12 +1,23 @@
 # Import the logging module to log messages for debugging or monitoring
 import logging
+import logging.handlers  # QueueHandler/QueueListener and the rotating file handler
 
 # Import os to work with directories and paths
 import os
 
+# Import time, queue and atexit for rotation schedules, the log buffer and flushing on exit
+import time
+import queue
+import atexit
+import threading
+import multiprocessing  # For the queue that carries records from spawned worker processes
+
 # Import datetime to generate timestamped log filenames
 from datetime import datetime
 
+# Import yaml to read the logging section of config.yaml
+import yaml
+
 
 # Define the directory where all log files will be saved
 LOGS_DIR = "logs"
@@ -14,15 +25,234 @@ LOGS_DIR = "logs"
 # Create the 'logs' directory if it doesn't already exist
 os.makedirs(LOGS_DIR, exist_ok=True)  # `exist_ok=True` prevents error if directory already exists
 
-# Generate a log file name with the current date, e.g., log_2025-05-29.log
-LOG_FILE = os.path.join(LOGS_DIR, f"log_{datetime.now().strftime('%Y-%m-%d')}.log")
+# Log line format: timestamp, log level, and message
+LOG_FORMAT = '%(asctime)s-%(levelname)s-%(message)s'
+
+# Same path as config.paths_config.CONFIG_PATH (not imported here, every module imports the logger first)
+CONFIG_PATH = "config/config.yaml"
+
+# Longest wait for room in a full queue when stopping a listener
+SENTINEL_TIMEOUT_SECONDS = 5.0
+
+
+# Read the logging section of config.yaml; None when absent (plain synchronous file logging)
+def _read_logging_config(config_path=CONFIG_PATH):
+    if not os.path.exists(config_path):
+        return None
+    with open(config_path, "r") as yaml_file:
+        config = yaml.safe_load(yaml_file) or {}
+    return config.get("logging")
+
+
+# File handler that rolls over when the file reaches max_bytes OR when the time interval
+# has elapsed, whichever comes first; backups are numbered .1 (newest) to .backup_count
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+
+    def __init__(self, filename, max_bytes=0, backup_count=7, interval_seconds=0, encoding="utf-8"):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval_seconds = interval_seconds
+        # Like TimedRotatingFileHandler, the interval runs from the existing file's last write,
+        # so a process restarted more often than the interval still rotates on schedule
+        started = os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        self.rollover_at = started + interval_seconds if interval_seconds else None
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.rollover_at is not None:
+            self.rollover_at = time.time() + self.interval_seconds
+
+
+# Queue handler that never blocks the caller: when the buffer is full the record is dropped and counted
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+# QueueListener whose stop waits for room in a full queue instead of failing with queue.Full
+# (the stock listener enqueues its stop sentinel with put_nowait)
+class BlockingStopQueueListener(logging.handlers.QueueListener):
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=SENTINEL_TIMEOUT_SECONDS)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        try:
+            self.enqueue_sentinel()
+        except queue.Full:
+            # The writer made no progress for the whole timeout; leave its daemon thread behind
+            self._thread = None
+            return
+        self._thread.join()
+        self._thread = None
+
+
+# Keeps 1 of every N records below WARNING from loggers matching a name prefix, for
+# high-volume messages; warnings and errors always pass
+class SamplingFilter(logging.Filter):
+
+    def __init__(self, sample_every):
+        super().__init__()
+        # Longest prefix first so the most specific rule wins
+        self.rules = sorted(((prefix, int(every)) for prefix, every in (sample_every or {}).items()),
+                            key=lambda rule: len(rule[0]), reverse=True)
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rules:
+            return True
+        for prefix, every in self.rules:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                with self._lock:
+                    count = self.counters.get(prefix, 0)
+                    self.counters[prefix] = count + 1
+                return count % every == 0
+        return True
+
+
+# Handlers installed on the root logger, kept for stats and shutdown
+_queue_handler = None
+_listener = None
+_file_handler = None
+_settings = None
+
+# Records of spawned worker processes reach the parent's file handler through this queue, so only
+# the parent process ever opens (and rotates) the log file
+_worker_queue = None
+_worker_listener = None
+
+
+# Configure the logging system from config.yaml: a size/time-rotating file, optionally written by a
+# background QueueListener so callers only pay for an in-memory enqueue
+def _configure_logging():
+    global _queue_handler, _listener, _file_handler, _settings
+
+    settings = _settings = _read_logging_config()
+    if settings is None:
+        # No logging section: one date-stamped file per day, e.g. log_2025-05-29.log
+        log_file = os.path.join(LOGS_DIR, f"log_{datetime.now().strftime('%Y-%m-%d')}.log")
+        logging.basicConfig(filename=log_file, format=LOG_FORMAT, level=logging.INFO)
+        return log_file
+
+    log_file = settings.get("file", os.path.join(LOGS_DIR, "app.log"))
+    os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+
+    file_handler = SizeAndTimeRotatingFileHandler(
+        log_file,
+        max_bytes=settings.get("max_bytes", 10 * 1024 * 1024),
+        backup_count=settings.get("backup_count", 7),
+        interval_seconds=settings.get("rotate_interval_hours", 24) * 3600,
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _file_handler = file_handler
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)  # Minimum severity level (DEBUG < INFO < WARNING < ERROR < CRITICAL)
+    sampling = SamplingFilter(settings.get("sample_every"))
+
+    if settings.get("async", True):
+        # Bounded buffer: a slow disk drops records instead of stalling request threads
+        log_queue = queue.Queue(maxsize=settings.get("queue_size", 10000))
+        _queue_handler = DroppingQueueHandler(log_queue)
+        _queue_handler.addFilter(sampling)
+        root.addHandler(_queue_handler)
+
+        _listener = BlockingStopQueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    else:
+        file_handler.addFilter(sampling)
+        root.addHandler(file_handler)
+
+    return log_file
+
+
+# Queue to pass to spawned worker processes (see init_worker_logging); the first call starts the
+# parent's listener that writes their records. None without a logging section in config.yaml.
+def worker_log_queue():
+    global _worker_queue, _worker_listener
+    if _file_handler is None:
+        return None
+    if _worker_queue is None:
+        _worker_queue = multiprocessing.get_context("spawn").Queue(maxsize=_settings.get("queue_size", 10000))
+        _worker_listener = BlockingStopQueueListener(_worker_queue, _file_handler, respect_handler_level=True)
+        _worker_listener.start()
+        atexit.register(shutdown_logging)
+    return _worker_queue
+
+
+# Runs first in a spawned worker process: send every record to the parent over log_queue instead
+# of writing the log file from this process as well
+def init_worker_logging(log_queue):
+    global _listener, _queue_handler, _file_handler
+    if log_queue is None:
+        return
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    root = logging.getLogger()
+    handler = _queue_handler or _file_handler
+    filters = list(handler.filters) if handler is not None else []
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if _file_handler is not None:
+        _file_handler.close()
+        _file_handler = None
+
+    _queue_handler = DroppingQueueHandler(log_queue)
+    for log_filter in filters:
+        _queue_handler.addFilter(log_filter)
+    root.addHandler(_queue_handler)
+
+
+# Flush queued records and stop the background writer (also runs at interpreter exit);
+# later records are written synchronously
+def shutdown_logging():
+    global _listener, _worker_listener
+    if _worker_listener is not None:
+        # Workers have finished by now; write whatever they still sent
+        _worker_listener.stop()
+        _worker_listener = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+        root = logging.getLogger()
+        root.removeHandler(_queue_handler)
+        for log_filter in _queue_handler.filters:
+            _file_handler.addFilter(log_filter)
+        root.addHandler(_file_handler)
+        if _queue_handler.dropped:
+            logging.getLogger(__name__).warning(f"{_queue_handler.dropped} log records were dropped on overflow")
+
+
+# Dropped and pending record counts of the asynchronous log buffer
+def logging_stats():
+    if _queue_handler is None:
+        return {"async": False, "dropped": 0, "queued": 0}
+    return {"async": True, "dropped": _queue_handler.dropped, "queued": _queue_handler.queue.qsize()}
+
 
-# Configure the logging system
-logging.basicConfig(
-    filename=LOG_FILE,  # Save logs to the specified file
-    format='%(asctime)s-%(levelname)s-%(message)s',  # Format includes timestamp, log level, and message
-    level=logging.INFO  # Set the minimum severity level to INFO (DEBUG < INFO < WARNING < ERROR < CRITICAL)
-)
+# Path of the active log file
+LOG_FILE = _configure_logging()
 
 
 # Define a helper function to create/get a named logger instance
@@ -0,0 +1,153 @@
+# Import standard libraries
+import time  # For batching windows and latency measurement
+import queue  # For handing requests to the batching thread
+import threading  # For the background batching worker
+from collections import Counter, deque  # For batch-size distribution and recent latencies
+from concurrent.futures import Future  # For returning each caller its own result
+
+# Import data libraries
+import numpy as np  # For latency percentiles
+import pandas as pd  # For building the batched feature frame
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Coalesces concurrent single-row predict calls into one batched model call
+class MicroBatcher:
+
+    # Initialize with the batched predict function and the batching window settings
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5, latency_window=10000):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._submit_lock = threading.Lock()  # Orders submit() against stop() so no request is stranded
+
+        # Metrics guarded by a lock since they are read from request threads
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+        self._batch_sizes = Counter()
+        self._wait_times = deque(maxlen=latency_window)  # Seconds spent waiting for a batch to form
+        self._predict_times = deque(maxlen=latency_window)  # Seconds per batched predict call
+
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+        logger.info(f"Micro-batcher started (max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})")
+
+    # Queue a single-row feature frame and return a Future for its prediction
+    def submit(self, features):
+        future = Future()
+        with self._submit_lock:
+            if not self._stop.is_set():
+                self._queue.put((features, future, time.monotonic()))
+                return future
+
+        # Batcher already stopped (e.g. its model was swapped out): predict inline
+        try:
+            future.set_result(self.predict_fn(features))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    # Submit a row and block until its prediction is ready
+    def predict(self, features, timeout=None):
+        return self.submit(features).result(timeout=timeout)
+
+    # Collect requests until the batch is full or the window since the first request closes
+    def _collect_batch(self):
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    # Worker loop: one predict call per collected batch, results scattered back to callers
+    # After stop() the queue is drained before the thread exits
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            frames = [features for features, _, _ in batch]
+            sizes = [len(features) for features in frames]
+            dispatched_at = time.monotonic()
+
+            try:
+                # Concatenate the rows into a single frame; unlike stacking the raw arrays this keeps
+                # each column's dtype (categoricals, downcast numerics) as the model was trained on
+                stacked = pd.concat(frames, ignore_index=True)
+                results = self.predict_fn(stacked)
+
+                offset = 0
+                for (_, future, _), size in zip(batch, sizes):
+                    future.set_result(results[offset:offset + size])
+                    offset += size
+
+            except Exception as e:
+                logger.error(f"Micro-batch predict failed: {e}")
+                with self._lock:
+                    self._errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+
+            finished_at = time.monotonic()
+            with self._lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._batch_sizes[len(batch)] += 1
+                self._wait_times.extend(dispatched_at - enqueued_at for _, _, enqueued_at in batch)
+                self._predict_times.append(finished_at - dispatched_at)
+
+    # Throughput, added latency and batch-size distribution for tuning the window
+    def stats(self):
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started_at, 1e-9)
+            waits = np.array(self._wait_times) * 1000.0
+            predicts = np.array(self._predict_times) * 1000.0
+
+            def percentiles(values):
+                if len(values) == 0:
+                    return {"p50": None, "p95": None, "p99": None}
+                p50, p95, p99 = np.percentile(values, [50, 95, 99])
+                return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "requests": self._requests,
+                "batches": self._batches,
+                "errors": self._errors,
+                "queue_depth": self._queue.qsize(),
+                "throughput_rps": self._requests / elapsed,
+                "mean_batch_size": self._requests / self._batches if self._batches else None,
+                "batch_size_distribution": dict(sorted(self._batch_sizes.items())),
+                "added_latency_ms": percentiles(waits),
+                "predict_latency_ms": percentiles(predicts),
+            }
+
+    # Stop the worker thread once queued requests are served
+    def stop(self, timeout=1):
+        with self._submit_lock:
+            self._stop.set()
+        self._worker.join(timeout=timeout)
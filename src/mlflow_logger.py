@@ -0,0 +1,168 @@
+# Import standard libraries
+import os  # For file names and the tracking URI environment variable
+import sys  # For extracting exception traceback
+import time  # For metric timestamps
+import threading  # For guarding the buffers shared with the background worker
+from concurrent.futures import ThreadPoolExecutor  # For background uploads
+
+# Import MLflow
+import mlflow  # For the tracking URI
+from mlflow.tracking import MlflowClient  # For logging to an explicit run from a worker thread
+from mlflow.entities import Metric, Param, RunTag  # For batched logging
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from utils.common_functions import file_fingerprint  # Content hashing of dataset files
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# Per-call limits of MLflow's log_batch
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+
+
+# Point MLflow at the tracking URI from the mlflow section of config.yaml,
+# unless MLFLOW_TRACKING_URI is set in the environment
+def configure_tracking(mlflow_config):
+    tracking_uri = (mlflow_config or {}).get("tracking_uri")
+    if tracking_uri and not os.environ.get("MLFLOW_TRACKING_URI"):
+        if tracking_uri.startswith("file:"):
+            # Recent MLflow versions refuse the file store unless it is explicitly allowed
+            os.environ.setdefault("MLFLOW_ALLOW_FILE_STORE", "true")
+        mlflow.set_tracking_uri(tracking_uri)
+    logger.info(f"MLflow tracking URI: {mlflow.get_tracking_uri()}")
+
+
+# Logs to one MLflow run without blocking the caller: artifact uploads run on a background
+# thread, params/metrics/tags are buffered and sent in one log_batch call on close, and dataset
+# files already uploaded by an earlier run (same content fingerprint) are referenced instead of
+# uploaded again. Use as a context manager; leaving it waits for every pending upload.
+class MlflowRunLogger:
+
+    def __init__(self, run_id, background=True, dedupe_datasets=True, client=None):
+        self.client = client or MlflowClient()
+        self.run_id = run_id
+        self.run_info = self.client.get_run(run_id).info
+        self.dedupe_datasets = dedupe_datasets
+
+        # One worker keeps uploads in submission order and off the training thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlflow-logger") if background else None
+        self._futures = []
+        self._lock = threading.Lock()
+        self._params, self._metrics, self._tags = {}, {}, {}
+
+    def _submit(self, fn, *args):
+        if self._executor is None:
+            fn(*args)
+        else:
+            self._futures.append(self._executor.submit(fn, *args))
+
+    def log_params(self, params):
+        with self._lock:
+            self._params.update({key: str(value) for key, value in params.items()})
+
+    def log_metrics(self, metrics):
+        timestamp = int(time.time() * 1000)
+        with self._lock:
+            self._metrics.update({key: (float(value), timestamp) for key, value in metrics.items()})
+
+    def set_tags(self, tags):
+        with self._lock:
+            self._tags.update({key: str(value) for key, value in tags.items()})
+
+    def log_artifact(self, path, artifact_path=None):
+        self._submit(self.client.log_artifact, self.run_id, path, artifact_path)
+
+    # Log a dataset file by its content fingerprint; the file itself is only uploaded when no earlier
+    # run of the experiment already holds the same content. Tags: dataset_<name>_sha256 and
+    # dataset_<name>_uri (where the file is stored, possibly in an earlier run).
+    def log_dataset(self, path, name, artifact_path="datasets"):
+        sha256 = file_fingerprint(path)
+        self.set_tags({f"dataset_{name}_sha256": sha256})
+
+        stored_uri = self.find_uploaded_dataset(name, sha256) if self.dedupe_datasets else None
+        if stored_uri is not None:
+            logger.info(f"Dataset '{name}' unchanged (sha256 {sha256[:12]}); referencing {stored_uri}")
+            self.set_tags({f"dataset_{name}_uri": stored_uri})
+            return
+
+        uri = f"{self.run_info.artifact_uri}/{artifact_path}/{os.path.basename(path)}"
+
+        def upload():
+            self.client.log_artifact(self.run_id, path, artifact_path)
+            # Only a completed upload is advertised for reuse by later runs
+            self.set_tags({f"dataset_{name}_uri": uri})
+
+        logger.info(f"Uploading dataset '{name}' from {path} in the background")
+        self._submit(upload)
+
+    # Artifact URI of an earlier upload of the same dataset content, or None
+    def find_uploaded_dataset(self, name, sha256):
+        runs = self.client.search_runs([self.run_info.experiment_id],
+                                       filter_string=f"tags.dataset_{name}_sha256 = '{sha256}'",
+                                       max_results=20)
+        for run in runs:
+            uri = run.data.tags.get(f"dataset_{name}_uri")
+            if run.info.run_id != self.run_id and uri:
+                return uri
+        return None
+
+    # Send the buffered params, metrics and tags, split only where log_batch limits require
+    def _log_batch(self, params, metrics, tags):
+        params = [Param(key, value) for key, value in params.items()]
+        metrics = [Metric(key, value, timestamp, 0) for key, (value, timestamp) in metrics.items()]
+        tags = [RunTag(key, value) for key, value in tags.items()]
+
+        while params or metrics or tags:
+            self.client.log_batch(self.run_id, metrics=metrics[:MAX_METRICS_PER_BATCH],
+                                  params=params[:MAX_PARAMS_PER_BATCH], tags=tags[:MAX_TAGS_PER_BATCH])
+            params = params[MAX_PARAMS_PER_BATCH:]
+            metrics = metrics[MAX_METRICS_PER_BATCH:]
+            tags = tags[MAX_TAGS_PER_BATCH:]
+
+    # Wait for pending uploads, then log everything buffered so far in one batch
+    def flush(self):
+        errors = self._wait()
+        with self._lock:
+            params, metrics, tags = self._params, self._metrics, self._tags
+            self._params, self._metrics, self._tags = {}, {}, {}
+        if params or metrics or tags:
+            self._submit(self._log_batch, params, metrics, tags)
+        return errors + self._wait()
+
+    def _wait(self):
+        errors = []
+        futures, self._futures = self._futures, []
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                logger.error(f"MLflow background logging failed: {error}")
+                errors.append(error)
+        return errors
+
+    def close(self):
+        errors = self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if errors:
+            try:
+                raise errors[0]
+            except Exception:
+                raise CustomException(f"{len(errors)} MLflow logging call(s) failed", sys)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Already failing: finish pending uploads but keep the original error
+            try:
+                self.close()
+            except CustomException:
+                pass
+        return False
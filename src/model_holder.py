@@ -0,0 +1,157 @@
+# Import standard libraries
+import os  # For checking artifact paths and modification times
+import sys  # For extracting exception traceback
+import json  # For reading the model version file
+import time  # For the watcher's polling interval
+import hashlib  # For deriving a version id when no version file exists
+import threading  # For background loading and the artifact watcher
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from src.micro_batcher import MicroBatcher  # Optional per-model request coalescing
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Immutable set of artifacts that together serve predictions for one model version
+class ModelBundle:
+
+    def __init__(self, model, transformer, fast_model, version, batcher=None):
+        self.model = model  # LGBMClassifier, used for large batches
+        self.transformer = transformer  # Fitted ReservationTransformer
+        self.fast_model = fast_model  # Tree arrays or the model itself, used for single rows
+        self.version = version
+        self.batcher = batcher
+
+    # Single-row prediction through the micro-batcher when enabled
+    def predict(self, features):
+        return self.batcher.predict(features) if self.batcher else self.fast_model.predict(features)
+
+
+# Loads the model lazily and swaps in new versions in the background without restarts
+class ModelHolder:
+
+    # Initialize with artifact paths and the serving section of config.yaml
+    def __init__(self, model_path, preprocessor_path, tree_engine_path, version_path,
+                 serving_config=None, poll_interval=None):
+        self.model_path = model_path
+        self.preprocessor_path = preprocessor_path
+        self.tree_engine_path = tree_engine_path
+        self.version_path = version_path
+        self.serving_config = serving_config or {}
+
+        reload_config = self.serving_config.get("hot_reload", {})
+        self.poll_interval = poll_interval or reload_config.get("poll_interval_seconds", 10)
+
+        self._bundle = None  # Swapped by reference; readers never see a partially loaded bundle
+        self._signature = None  # Artifact signature the current bundle was loaded from
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self.last_error = None
+
+    # Signature used to detect new artifacts: the version file's mtime, or the model's
+    def _current_signature(self):
+        path = self.version_path if os.path.exists(self.version_path) else self.model_path
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    # Version id from the version file written by training, or a hash of the model file
+    def _read_version(self):
+        if os.path.exists(self.version_path):
+            with open(self.version_path, "r") as f:
+                return json.load(f)["version"]
+        with open(self.model_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()[:12]
+
+    # Load every artifact of one model version into a new bundle
+    def _load_bundle(self):
+        # Heavy imports stay here so importing the app does not pull in LightGBM
+        import joblib
+        from src.reservation_transformer import ReservationTransformer
+        from src.tree_engine import TreeEnsemble
+
+        signature = self._current_signature()
+        version = self._read_version()
+
+        model = joblib.load(self.model_path)
+        transformer = ReservationTransformer.load(self.preprocessor_path)
+
+        fast_model = model
+        if self.serving_config.get("engine", "lightgbm") == "numpy" and os.path.exists(self.tree_engine_path):
+            fast_model = TreeEnsemble.load(self.tree_engine_path)
+
+        batcher = None
+        batching_config = self.serving_config.get("micro_batching", {})
+        if batching_config.get("enabled", False):
+            batcher = MicroBatcher(fast_model.predict,
+                                   max_batch_size=batching_config.get("max_batch_size", 64),
+                                   max_wait_ms=batching_config.get("max_wait_ms", 5))
+
+        logger.info(f"Loaded model version {version} from {self.model_path}")
+        return ModelBundle(model, transformer, fast_model, version, batcher), signature
+
+    # Load a new bundle and swap it in atomically; requests holding the old one finish on it
+    def reload(self):
+        with self._load_lock:
+            return self._reload_locked()
+
+    # Body of reload(); the caller holds the load lock so only one load runs at a time
+    def _reload_locked(self):
+        try:
+            bundle, signature = self._load_bundle()
+            previous, self._bundle, self._signature = self._bundle, bundle, signature
+            self.last_error = None
+
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"Error while loading model: {e}")
+            raise CustomException("Failed to load model artifacts", sys)
+
+        if previous is not None:
+            logger.info(f"Swapped model version {previous.version} -> {bundle.version}")
+            if previous.batcher is not None:
+                previous.batcher.stop()
+        return bundle
+
+    # Current bundle, loading it on first use (or waiting for the background load)
+    def get(self):
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+        with self._load_lock:
+            return self._bundle if self._bundle is not None else self._reload_locked()
+
+    # Current bundle without triggering a load; None until a model has been loaded
+    def peek(self):
+        return self._bundle
+
+    # True once a model has been loaded
+    def is_loaded(self):
+        return self._bundle is not None
+
+    # Watcher loop: initial background load, then reload whenever the artifacts change
+    def _watch(self):
+        while not self._stop.is_set():
+            try:
+                if self._bundle is None or self._current_signature() != self._signature:
+                    self.reload()
+            except Exception as e:
+                # Keep serving the current version; retry on the next poll
+                logger.error(f"Model watcher could not reload: {e}")
+            self._stop.wait(self.poll_interval)
+
+    # Start the background loader/watcher thread
+    def start(self):
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            self._watcher.start()
+        return self
+
+    # Stop the watcher thread
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=1)
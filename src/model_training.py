@@ -1,26 +1,42 @@
 # Standard library imports
 import os  # For file and directory handling
+import json  # For writing the model version file
+import time  # For timing the hyperparameter search
+from datetime import datetime  # For timestamping model versions
 
 # Data and model-related imports
+import numpy as np  # For fold index generation
 import pandas as pd  # For data manipulation
 import joblib  # For saving/loading trained model objects
 
 # Model selection and evaluation
-from sklearn.model_selection import RandomizedSearchCV  # For hyperparameter tuning
+from sklearn.model_selection import RandomizedSearchCV, GridSearchCV  # For hyperparameter tuning
+from sklearn.model_selection import ParameterSampler, StratifiedKFold  # For the native LightGBM search
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 - enables the halving searches
+from sklearn.model_selection import HalvingRandomSearchCV, HalvingGridSearchCV  # For successive-halving tuning
 import lightgbm as lgb  # LightGBM model for classification
+from sklearn.base import clone  # For refitting a stored best configuration
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score  # For model evaluation
 
 # Project-specific modules
 from src.logger import get_logger  # Custom logger utility
 from src.custom_exception import CustomException  # Custom exception handling
+from src.instrumentation import instrument, current_stage, recorded_stages, stage_metrics_for_mlflow  # Per-stage wall/CPU time, peak memory and row counts
 from config.paths_config import *  # File paths for training/test data and output
 from config.model_params import *  # LightGBM and RandomSearch parameter configs
-from utils.common_functions import read_yaml, load_data  # Utility functions to read YAML config and load data
+from utils.common_functions import read_yaml, load_data, iter_chunks, file_fingerprint  # Config, data loading and content hashing
 from scipy.stats import randint  # For defining hyperparameter ranges (used in model_params)
+from src.tree_engine import TreeEnsemble, check_parity  # Array-backed inference engine
+from src.lgbm_estimators import EarlyStoppingLGBMClassifier, BoosterClassifier  # LightGBM with per-fold early stopping
+from src.out_of_core import ChunkedFileSequence  # Chunked reads of datasets larger than memory
+from src.distributed_training import DistributedTrainer  # Data-parallel LightGBM over sockets
+from src.dataset_cache import BinnedDatasetCache  # Binned LightGBM Dataset reused across trials
+from src.trial_store import TrialStore, WarmStartSampler, search_space_fingerprint  # Persistent trial history
 
 # MLflow for tracking experiments
 import mlflow
 import mlflow.sklearn
+from src.mlflow_logger import MlflowRunLogger, configure_tracking  # Background, batched and deduplicated logging
 
 # Initialize the logger for this module
 logger = get_logger(__name__)
@@ -29,16 +45,46 @@ logger = get_logger(__name__)
 class ModelTraining:
 
     # Initialize with training/test file paths and output model save path
-    def __init__(self, train_path, test_path, model_output_path):
+    def __init__(self, train_path, test_path, model_output_path, config_path=CONFIG_PATH):
         self.train_path = train_path
         self.test_path = test_path
         self.model_output_path = model_output_path
 
+        config = read_yaml(config_path)
+
+        # With "class_weight" balancing the imbalance is handled here instead of with synthetic rows
+        self.balancing_method = config.get("balancing", {}).get("method", "smote")
+
+        # MLflow tracking store and logging behaviour
+        self.mlflow_config = config.get("mlflow", {})
+        self.tracker = None  # MlflowRunLogger of the active run
+        self.previous_metrics = None  # Metrics of the previous model, set by promote() in incremental mode
+
         # Load parameter grids from config
         self.params_dist = LIGHTGM_PARAMS
         self.random_search_params = RANDOM_SEARCH_PARAMS
+        self.search_strategy = SEARCH_STRATEGY
+        self.halving_search_params = HALVING_SEARCH_PARAMS
+        self.early_stopping_params = EARLY_STOPPING_PARAMS
+        self.warm_start_params = WARM_START_PARAMS
+        self.out_of_core_params = OUT_OF_CORE_PARAMS
+        self.incremental_params = INCREMENTAL_PARAMS
+        self.distributed_params = DISTRIBUTED_PARAMS
+        self.distributed = self.distributed_params["enabled"]
+
+        # Out of core, only the native search works on the binned Dataset instead of in-memory arrays
+        self.out_of_core = self.out_of_core_params["enabled"]
+        if self.out_of_core and self.search_strategy != "native":
+            raise ValueError(f"Out-of-core training requires the 'native' search strategy, "
+                             f"got '{self.search_strategy}'")
+
+        # Continued boosting computes the previous model's scores on the training data in memory
+        self.incremental = self.incremental_params["enabled"]
+        if self.incremental and self.out_of_core:
+            raise ValueError("Incremental retraining is not supported together with out-of-core training")
 
     # Load data and split it into features (X) and labels (y)
+    @instrument()
     def load_and_split_data(self):
         try:
             logger.info(f"Loading data from {self.train_path}")
@@ -60,36 +106,310 @@ class ModelTraining:
             logger.error(f"Error while loading data {e}")
             raise CustomException("Failed to load data", e)
 
+    # Out-of-core counterpart of load_and_split_data: the training file is only opened for
+    # chunked reads (its labels are read in full), the test file is scored later in chunks
+    @instrument()
+    def load_chunked_train_data(self):
+        try:
+            logger.info(f"Opening {self.train_path} for out-of-core training")
+            X_train = ChunkedFileSequence(self.train_path, "booking_status", self.out_of_core_params["chunk_size"])
+            return X_train, X_train.labels
+        except Exception as e:
+            logger.error(f"Error while opening training data {e}")
+            raise CustomException("Failed to load data", e)
+
+    # Halving budget resource; the native search always budgets by n_estimators
+    def budget_resource(self):
+        if self.search_strategy == "native":
+            return "n_estimators"
+        return self.halving_search_params["resource"]
+
+    # Parameter space actually searched; the halving budget resource is not a hyperparameter
+    def search_space(self):
+        params_dist = dict(self.params_dist)
+        if self.search_strategy != "random":
+            params_dist.pop(self.budget_resource(), None)
+        return params_dist
+
+    # Build the randomized search over the full parameter space,
+    # or a grid over explicit candidates when warm-starting from the trial store
+    def build_random_search(self, lgbm_model, candidates=None):
+        common = dict(
+            estimator=lgbm_model,
+            cv=self.random_search_params["cv"],
+            n_jobs=self.random_search_params["n_jobs"],
+            verbose=self.random_search_params["verbose"],
+            scoring=self.random_search_params["scoring"],
+            # The winner is refitted by fit_best on all rows, not on the search's early-stopping split
+            refit=False
+        )
+        if candidates is not None:
+            return GridSearchCV(param_grid=[{k: [v] for k, v in c.items()} for c in candidates], **common)
+
+        return RandomizedSearchCV(
+            param_distributions=self.params_dist,
+            n_iter=self.random_search_params["n_iter"],
+            random_state=self.random_search_params["random_state"],
+            **common
+        )
+
+    # Build a successive-halving search: many cheap candidates, only the best get the full budget
+    def build_halving_search(self, lgbm_model, candidates=None):
+        params = self.halving_search_params
+        common = dict(
+            estimator=lgbm_model,
+            factor=params["factor"],
+            resource=params["resource"],
+            min_resources=params["min_resources"],
+            max_resources=params["max_resources"],
+            cv=params["cv"],
+            n_jobs=params["n_jobs"],
+            verbose=params["verbose"],
+            random_state=params["random_state"],
+            scoring=params["scoring"],
+            refit=False
+        )
+        if candidates is not None:
+            return HalvingGridSearchCV(param_grid=[{k: [v] for k, v in c.items()} for c in candidates], **common)
+
+        return HalvingRandomSearchCV(
+            param_distributions=self.search_space(),
+            n_candidates=params["n_candidates"],
+            **common
+        )
+
+    # Convert a fitted search's cv_results_ into trial records;
+    # only last-round halving trials count as full budget
+    def collect_trials(self, search):
+        results = search.cv_results_
+        last_round = max(results["iter"]) if "iter" in results else None
+        trials = []
+        for i, params in enumerate(results["params"]):
+            trials.append({
+                "params": params,
+                "round": int(results["iter"][i]) if "iter" in results else 0,
+                "budget": int(results["n_resources"][i]) if "n_resources" in results else None,
+                "final": last_round is None or results["iter"][i] == last_round,
+                "score": float(results["mean_test_score"][i]),
+                # Wall-clock of the trial summed over its CV folds
+                "trial_time": float((results["mean_fit_time"][i] + results["mean_score_time"][i]) * search.n_splits_),
+            })
+        return trials
+
+    # Log score, budget and wall-clock time of every trial (candidate x halving round)
+    def log_trials(self, trials):
+        for i, trial in enumerate(trials):
+            budget = f"round {trial['round']}, budget {trial['budget']}, " if trial["budget"] is not None else ""
+            logger.info(f"Trial {i}: {budget}score {trial['score']:.4f}, "
+                        f"{trial['trial_time']:.2f}s, params {trial['params']}")
+
+    # Map sklearn-style LightGBM params to native lgb.train params
+    def native_params(self, params):
+        native = {
+            "objective": "binary",
+            "metric": "binary_error",
+            "verbose": -1,
+            "seed": self.random_search_params["random_state"],
+        }
+        if self.balancing_method == "class_weight":
+            native["is_unbalance"] = True
+        for key, value in params.items():
+            if key == "boosting_type":
+                native["boosting"] = value
+            elif key != "n_estimators":
+                native[key] = value
+        return native
+
+    # Mean CV accuracy of one configuration over the cached fold subsets, and the mean number
+    # of trees the folds kept after early stopping
+    def evaluate_native(self, params, num_boost_round, fold_sets):
+        native = self.native_params(params)
+        stopping_rounds = self.early_stopping_params["early_stopping_rounds"]
+
+        scores, rounds = [], []
+        for train_set, valid_set in fold_sets:
+            callbacks = []
+            if stopping_rounds and native.get("boosting") != "dart":
+                callbacks.append(lgb.early_stopping(stopping_rounds, verbose=False))
+            booster = lgb.train(native, train_set, num_boost_round=num_boost_round,
+                                valid_sets=[valid_set], valid_names=["valid"], callbacks=callbacks)
+            if booster.best_score:
+                error = booster.best_score["valid"]["binary_error"]
+            else:
+                error = booster.eval_valid()[0][2]
+            scores.append(1.0 - error)
+            rounds.append(booster.best_iteration or num_boost_round)
+        return float(sum(scores) / len(scores)), int(round(sum(rounds) / len(rounds)))
+
+    # Binned LightGBM Dataset of the training data, built once and cached on disk
+    def binned_dataset(self, X_train, y_train):
+        cache = BinnedDatasetCache(LGB_DATASET_CACHE_DIR, LGB_DATASET_PARAMS)
+        feature_name = X_train.feature_names if isinstance(X_train, ChunkedFileSequence) else "auto"
+        return cache.get(X_train, y_train, file_fingerprint(self.train_path), feature_name=feature_name)
+
+    # Successive halving over n_estimators using lgb.train on one cached binned Dataset:
+    # the data is binned once and the fold subsets are shared by every trial
+    def native_search(self, dataset, y_train, candidates=None):
+        params = self.halving_search_params
+
+        folds = StratifiedKFold(n_splits=params["cv"], shuffle=True,
+                                random_state=params["random_state"]).split(np.zeros(len(y_train)), y_train)
+        fold_sets = BinnedDatasetCache.fold_subsets(dataset, folds)
+
+        if candidates is None:
+            candidates = list(ParameterSampler(self.search_space(), n_iter=params["n_candidates"],
+                                               random_state=params["random_state"]))
+
+        trials, budget, round_index = [], params["min_resources"], 0
+        while candidates:
+            is_final = len(candidates) == 1 or budget * params["factor"] > params["max_resources"]
+
+            round_results = []
+            for candidate in candidates:
+                start = time.perf_counter()
+                score, best_iteration = self.evaluate_native(candidate, budget, fold_sets)
+                trial = {"params": {**candidate, "n_estimators": budget}, "round": round_index,
+                         "budget": budget, "final": is_final, "score": score, "best_iteration": best_iteration,
+                         "trial_time": time.perf_counter() - start}
+                trials.append(trial)
+                round_results.append(trial)
+
+            if is_final:
+                break
+
+            # Promote the best 1/factor of the candidates with factor times more trees
+            round_results.sort(key=lambda t: t["score"], reverse=True)
+            n_keep = max(1, len(candidates) // params["factor"])
+            candidates = [{k: v for k, v in t["params"].items() if k != "n_estimators"}
+                          for t in round_results[:n_keep]]
+            budget *= params["factor"]
+            round_index += 1
+
+        return trials
+
+    # Fit the winning configuration on every training row, without an early-stopping split, for
+    # num_boost_round trees: the count the native search's folds kept, or else the count early
+    # stopping picks on a held-out split before the full refit. Out of core there are no in-memory
+    # arrays to fit on, so the model is boosted on the binned Dataset for the searched tree count.
+    def fit_best(self, lgbm_model, params, X_train, y_train, dataset=None, num_boost_round=None):
+        model = clone(lgbm_model).set_params(**params)
+        if num_boost_round is None and not self.out_of_core:
+            num_boost_round = model.early_stopped_rounds(X_train, y_train)
+        if num_boost_round is None:
+            num_boost_round = model.n_estimators
+        logger.info(f"Refitting the best configuration on all {len(y_train)} rows for {num_boost_round} trees")
+
+        if self.distributed:
+            return self.fit_distributed(params, X_train, y_train, num_boost_round)
+        if not self.out_of_core:
+            return model.fit_full(X_train, y_train, n_estimators=num_boost_round)
+
+        if dataset is None:
+            dataset = self.binned_dataset(X_train, y_train)
+        booster = lgb.train(self.native_params(params), dataset, num_boost_round=num_boost_round)
+        return BoosterClassifier(booster, classes=np.unique(y_train), params=params)
+
+    # Fit the winning configuration with data-parallel LightGBM on local worker processes,
+    # for the searched tree count
+    @instrument()
+    def fit_distributed(self, params, X_train, y_train, num_boost_round):
+        trainer = DistributedTrainer(
+            num_workers=self.distributed_params["num_workers"],
+            host=self.distributed_params["host"],
+            base_port=self.distributed_params["base_port"],
+            num_threads=self.distributed_params["num_threads"],
+            time_out=self.distributed_params["time_out"],
+        )
+        feature_names = X_train.feature_names if isinstance(X_train, ChunkedFileSequence) else list(X_train.columns)
+        booster = trainer.train(self.native_params(params), X_train, y_train,
+                                num_boost_round=num_boost_round, feature_names=feature_names)
+        return BoosterClassifier(booster, classes=np.unique(y_train), params=params)
+
     # Train LightGBM model with hyperparameter tuning
+    @instrument()
     def train_lgbm(self, X_train, y_train):
         try:
             logger.info("Initializing our model")
 
-            # Define base LightGBM model
-            lgbm_model = lgb.LGBMClassifier(random_state=self.random_search_params["random_state"])
-
-            logger.info("Starting our Hyperparameter tuning")
-
-            # Define randomized search with specified parameters
-            random_search = RandomizedSearchCV(
-                estimator=lgbm_model,
-                param_distributions=self.params_dist,
-                n_iter=self.random_search_params["n_iter"],
-                cv=self.random_search_params["cv"],
-                n_jobs=self.random_search_params["n_jobs"],
-                verbose=self.random_search_params["verbose"],
-                random_state=self.random_search_params["random_state"],
-                scoring=self.random_search_params["scoring"]
-            )
-
-            # Fit randomized search to training data
-            random_search.fit(X_train, y_train)
-
-            logger.info("Hyperparameter tuning completed")
-
-            # Extract best model and params
-            best_params = random_search.best_params_
-            best_lgbm_model = random_search.best_estimator_
+            # Define base LightGBM model; it early-stops inside each CV fold when configured
+            class_weight = "balanced" if self.balancing_method == "class_weight" else None
+            lgbm_model = EarlyStoppingLGBMClassifier(random_state=self.random_search_params["random_state"],
+                                                     class_weight=class_weight,
+                                                     **self.early_stopping_params)
+
+            # Warm start: propose candidates from the trial history of earlier runs
+            candidates, store = None, None
+            if self.warm_start_params["enabled"]:
+                store = TrialStore(TRIAL_STORE_PATH)
+                dataset_fp = file_fingerprint(self.train_path)
+                space_fp = search_space_fingerprint(self.search_space())
+                n_candidates = (self.random_search_params["n_iter"] if self.search_strategy == "random"
+                                else self.halving_search_params["n_candidates"])
+                sampler = WarmStartSampler(
+                    store, dataset_fp, space_fp, self.search_space(),
+                    exploit_fraction=self.warm_start_params["exploit_fraction"],
+                    top_k=self.warm_start_params["top_k"],
+                    perturbation=self.warm_start_params["perturbation"],
+                    random_state=self.random_search_params["random_state"],
+                    exclude_keys=[] if self.search_strategy == "random" else [self.budget_resource()]
+                )
+                candidates = sampler.propose(n_candidates)
+
+                # Nothing new to try and nothing stored to fall back on: search the space from scratch
+                if not candidates and store.best_trial(space_fp, dataset_fp) is None:
+                    logger.info("Warm start has no new candidates and no stored best trial; running a fresh search")
+                    candidates = None
+
+            logger.info(f"Starting our Hyperparameter tuning with the '{self.search_strategy}' strategy")
+
+            best_params, best_score, best_lgbm_model, dataset = None, None, None, None
+            if candidates is None or candidates:
+                start = time.perf_counter()
+
+                if self.search_strategy == "native":
+                    dataset = self.binned_dataset(X_train, y_train)
+                    trials = self.native_search(dataset, y_train, candidates)
+                    # Failed fits score NaN and never win
+                    scored = [t for t in trials if t["final"] and np.isfinite(t["score"])]
+                    if scored:
+                        best = max(scored, key=lambda t: t["score"])
+                        best_params, best_score = best["params"], best["score"]
+
+                        # One final fit of the winning configuration on the full training set
+                        best_lgbm_model = self.fit_best(lgbm_model, best_params, X_train, y_train, dataset,
+                                                        num_boost_round=best["best_iteration"])
+                else:
+                    if self.search_strategy == "halving":
+                        search = self.build_halving_search(lgbm_model, candidates)
+                    else:
+                        search = self.build_random_search(lgbm_model, candidates)
+
+                    # Fit the search to training data
+                    search.fit(X_train, y_train)
+                    trials = self.collect_trials(search)
+
+                    # Extract best model and params (a NaN best score means every candidate failed)
+                    if np.isfinite(search.best_score_):
+                        best_params, best_score = search.best_params_, search.best_score_
+                        best_lgbm_model = self.fit_best(lgbm_model, best_params, X_train, y_train)
+
+                search_time = time.perf_counter() - start
+                self.log_trials(trials)
+                logger.info(f"Hyperparameter tuning completed: {len(trials)} trials in {search_time:.2f}s")
+
+                if store is not None:
+                    store.record(dataset_fp, space_fp, trials)
+
+            # A configuration evaluated in an earlier run on the same data may still be the best
+            if store is not None:
+                stored_best = store.best_trial(space_fp, dataset_fp)
+                if stored_best is not None and (best_score is None or stored_best["score"] > best_score):
+                    logger.info(f"Stored trial (score {stored_best['score']:.4f}) beats this run's best; refitting it")
+                    best_params, best_score = stored_best["params"], stored_best["score"]
+                    best_lgbm_model = self.fit_best(lgbm_model, best_params, X_train, y_train, dataset)
+
+            if best_lgbm_model is None:
+                raise ValueError("No hyperparameter trial produced a finite score and no stored trial is available")
 
             logger.info(f"Best parameters are: {best_params}")
 
@@ -99,7 +419,62 @@ class ModelTraining:
             logger.error(f"Error while training model {e}")
             raise CustomException("Failed to train model", e)
 
+    # Previous model to continue boosting from, or None when there is none or it no longer matches
+    # the training features (e.g. feature selection picked a different set), which needs a full run
+    def load_previous_model(self, X_train):
+        if not os.path.exists(self.model_output_path):
+            logger.info("No previous model found; running a full search and train")
+            return None
+        try:
+            previous = joblib.load(self.model_output_path)
+        except Exception as e:
+            logger.warning(f"Previous model could not be loaded ({e}); running a full search and train")
+            return None
+
+        if list(previous.feature_name_) != list(X_train.columns):
+            logger.warning(f"Previous model features {list(previous.feature_name_)} differ from the training "
+                           f"features {list(X_train.columns)}; running a full search and train")
+            return None
+        return previous
+
+    # Keep boosting the previous model on the current training data with its own parameters;
+    # only 'extra_rounds' trees are added instead of running the hyperparameter search.
+    # The returned model reports its total tree count as n_estimators.
+    @instrument()
+    def continue_training(self, previous, X_train, y_train):
+        try:
+            extra_rounds = self.incremental_params["extra_rounds"]
+            previous_trees = previous.booster_.current_iteration()
+            logger.info(f"Continuing the previous model ({previous_trees} trees) "
+                        f"for up to {extra_rounds} more boosting rounds")
+
+            if isinstance(previous, BoosterClassifier):
+                # Model from an out-of-core run: boost with the native API
+                params = previous.get_params()
+                booster = lgb.train(self.native_params(params), lgb.Dataset(X_train, label=y_train),
+                                    num_boost_round=extra_rounds, init_model=previous.booster_)
+                model = BoosterClassifier(booster, classes=previous.classes_,
+                                          params={**params, "n_estimators": booster.current_iteration()})
+            else:
+                # The clone keeps the previous parameters (and early stopping); it is fitted for the new trees only
+                model = clone(previous).set_params(n_estimators=extra_rounds)
+                model.fit(X_train, y_train, init_model=previous.booster_)
+                model.set_params(n_estimators=model.booster_.current_iteration())
+
+            added_trees = model.booster_.current_iteration() - previous_trees
+            logger.info(f"Continued model has {previous_trees} + {added_trees} trees")
+            if self.tracker is not None:
+                self.tracker.log_params({"incremental_previous_trees": previous_trees,
+                                         "incremental_extra_rounds": extra_rounds,
+                                         "incremental_added_trees": added_trees})
+            return model
+
+        except Exception as e:
+            logger.error(f"Error while continuing training {e}")
+            raise CustomException("Failed to continue training the previous model", e)
+
     # Evaluate trained model on test data
+    @instrument()
     def evaluate_model(self, model, X_test, y_test):
         try:
             logger.info("Evaluating our model")
@@ -131,44 +506,189 @@ class ModelTraining:
             logger.error(f"Error while evaluating model {e}")
             raise CustomException("Failed to evaluate model", e)
 
+    # Out-of-core counterpart of evaluate_model: the test file is scored chunk by chunk and the
+    # metrics are computed from accumulated confusion counts. Also returns the first chunk's
+    # features, a bounded sample for the tree-engine parity check.
+    @instrument()
+    def evaluate_model_chunked(self, model):
+        try:
+            logger.info(f"Evaluating our model on {self.test_path} in chunks")
+
+            tp = fp = fn = tn = 0
+            sample = None
+            for chunk in iter_chunks(self.test_path, self.out_of_core_params["chunk_size"]):
+                X_chunk = chunk.drop(columns=["booking_status"])
+                y_true = chunk["booking_status"].to_numpy() == 1
+                y_pred = model.predict(X_chunk) == 1
+
+                tp += int(np.sum(y_true & y_pred))
+                fp += int(np.sum(~y_true & y_pred))
+                fn += int(np.sum(y_true & ~y_pred))
+                tn += int(np.sum(~y_true & ~y_pred))
+                if sample is None:
+                    sample = X_chunk
+
+            # Same definitions as the sklearn metrics, with 0 where they are undefined
+            total = tp + fp + fn + tn
+            accuracy = (tp + tn) / total if total else 0.0
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            current_stage().rows_in = total
+
+            logger.info(f"Accuracy Score: {accuracy}")
+            logger.info(f"Precision Score: {precision}")
+            logger.info(f"Recall Score: {recall}")
+            logger.info(f"F1 Score: {f1}")
+
+            metrics = {"accuracy": accuracy, "precison": precision, "recall": recall, "f1": f1}
+            return metrics, sample
+
+        except Exception as e:
+            logger.error(f"Error while evaluating model {e}")
+            raise CustomException("Failed to evaluate model", e)
+
     # Save the trained model to disk using joblib
+    @instrument()
     def save_model(self, model):
         try:
             # Create the directory if it doesn't exist
             os.makedirs(os.path.dirname(self.model_output_path), exist_ok=True)
 
             logger.info("Saving the model")
-            joblib.dump(model, self.model_output_path)  # Save model
+            # Write to a temporary file first and swap it in atomically, so a serving process
+            # never loads a partially written model
+            tmp_path = f"{self.model_output_path}.tmp"
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, self.model_output_path)
             logger.info(f"Model saved to {self.model_output_path}")
         except Exception as e:
             logger.error(f"Error while saving model {e}")
             raise CustomException("Failed to save model", e)
 
+    # Flatten the trained booster into arrays for the low-latency serving path
+    # The export is only kept if it reproduces the model's predictions on the test set
+    @instrument()
+    def export_tree_engine(self, model, X_test):
+        try:
+            logger.info("Exporting the model to the array-backed tree engine")
+            engine = TreeEnsemble.from_lgbm(model)
+            check_parity(model, engine, X_test)
+            engine.save(TREE_ENGINE_OUTPUT_PATH)
+
+        except Exception as e:
+            logger.error(f"Tree engine export skipped: {e}")
+            # Never leave arrays from a previous model next to the new one
+            if os.path.exists(TREE_ENGINE_OUTPUT_PATH):
+                os.remove(TREE_ENGINE_OUTPUT_PATH)
+
+    # Write the version file last, so a serving process watching it only reloads once the
+    # model, transformer and tree arrays are all in place. A kept model keeps its creation time.
+    def write_model_version(self, metrics, outcome="trained"):
+        try:
+            version = {
+                "version": file_fingerprint(self.model_output_path)[:12],
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "model_path": self.model_output_path,
+                "training_outcome": outcome,  # trained, continued or kept
+                "metrics": metrics,
+            }
+            if outcome == "kept" and os.path.exists(MODEL_VERSION_PATH):
+                with open(MODEL_VERSION_PATH, "r") as f:
+                    current = json.load(f)
+                if current.get("version") == version["version"] and "created_at" in current:
+                    version["created_at"] = current["created_at"]
+            tmp_path = f"{MODEL_VERSION_PATH}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(version, f, indent=2)
+            os.replace(tmp_path, MODEL_VERSION_PATH)  # Atomic, so readers never see a partial file
+            logger.info(f"Model version {version['version']} written to {MODEL_VERSION_PATH}")
+        except Exception as e:
+            logger.error(f"Error while writing model version {e}")
+            raise CustomException("Failed to write model version", e)
+
+    # Compare a continued model's metrics with the previous model's on the same test set
+    def promote(self, previous, metrics, X_test, y_test):
+        metric = self.incremental_params["metric"]
+        previous_metrics = self.evaluate_model(previous, X_test, y_test)
+        promoted = metrics[metric] >= previous_metrics[metric]
+        self.previous_metrics = previous_metrics  # Recorded in the version file when the previous model is kept
+
+        self.tracker.log_metrics({f"previous_{key}": value for key, value in previous_metrics.items()})
+        self.tracker.set_tags({"incremental_promoted": promoted})
+
+        if promoted:
+            logger.info(f"Continued model promoted: {metric} {metrics[metric]:.4f} "
+                        f">= previous {previous_metrics[metric]:.4f}")
+        else:
+            logger.warning(f"Continued model not promoted: {metric} {metrics[metric]:.4f} "
+                           f"< previous {previous_metrics[metric]:.4f}; keeping {self.model_output_path}")
+        return promoted
+
     # Main function that executes the full pipeline
     def run(self):
         try:
-            # Start MLflow experiment run
-            with mlflow.start_run():
+            configure_tracking(self.mlflow_config)
+
+            # Start MLflow experiment run; uploads run in the background while the model trains
+            # and everything else is logged in one batch when the block exits
+            with mlflow.start_run() as run, MlflowRunLogger(
+                    run.info.run_id,
+                    background=self.mlflow_config.get("background", True),
+                    dedupe_datasets=self.mlflow_config.get("dedupe_datasets", True)) as tracker:
+                self.tracker = tracker
                 logger.info("Starting our Model Training pipeline")
 
-                # Log data files used in this experiment
+                # Log data files used in this experiment (only uploaded when their content is new)
                 logger.info("Logging the training and testing dataset to MLflow")
-                mlflow.log_artifact(self.train_path, artifact_path="datasets")
-                mlflow.log_artifact(self.test_path, artifact_path="datasets")
+                tracker.log_dataset(self.train_path, "train")
+                tracker.log_dataset(self.test_path, "test")
 
                 # Load, train, evaluate, and save
-                X_train, y_train, X_test, y_test = self.load_and_split_data()
-                best_lgbm_model = self.train_lgbm(X_train, y_train)
-                metrics = self.evaluate_model(best_lgbm_model, X_test, y_test)
+                previous = None  # Model continued from, in incremental mode
+                if self.out_of_core:
+                    # Files larger than memory: bin from chunked reads, score the test set in chunks
+                    X_train, y_train = self.load_chunked_train_data()
+                    best_lgbm_model = self.train_lgbm(X_train, y_train)
+                    metrics, X_test = self.evaluate_model_chunked(best_lgbm_model)
+                else:
+                    X_train, y_train, X_test, y_test = self.load_and_split_data()
+                    previous = self.load_previous_model(X_train) if self.incremental else None
+                    if previous is not None:
+                        best_lgbm_model = self.continue_training(previous, X_train, y_train)
+                    else:
+                        best_lgbm_model = self.train_lgbm(X_train, y_train)
+                    metrics = self.evaluate_model(best_lgbm_model, X_test, y_test)
+
+                    # The continued model replaces the previous one only if it scores at least
+                    # as well on the held-out set (the hash-based split keeps test rows in test)
+                    if previous is not None and not self.promote(previous, metrics, X_test, y_test):
+                        # Keeping the previous model is this run's outcome: the model file is left
+                        # untouched and the version file records the outcome, so the stage cache
+                        # records the run instead of retraining every time
+                        tracker.set_tags({"training_outcome": "kept"})
+                        self.write_model_version(self.previous_metrics, outcome="kept")
+                        tracker.log_metrics(metrics)
+                        tracker.log_metrics(stage_metrics_for_mlflow(recorded_stages()))
+                        return
+
+                outcome = "continued" if previous is not None else "trained"
+                tracker.set_tags({"training_outcome": outcome})
                 self.save_model(best_lgbm_model)
+                self.export_tree_engine(best_lgbm_model, X_test)
+                self.write_model_version(metrics, outcome)
 
                 # Log model and metrics to MLflow
                 logger.info("Logging the model into MLflow")
-                mlflow.log_artifact(self.model_output_path)
+                tracker.log_artifact(self.model_output_path)
 
                 logger.info("Logging Params and metrics to MLflow")
-                mlflow.log_params(best_lgbm_model.get_params())
-                mlflow.log_metrics(metrics)
+                tracker.log_params(best_lgbm_model.get_params())
+                tracker.log_metrics(metrics)
+
+                # Wall/CPU time, peak memory and rows of every stage run in this process
+                # (ingestion and processing too when run from the pipeline)
+                tracker.log_metrics(stage_metrics_for_mlflow(recorded_stages()))
 
                 logger.info("Model Training successfully completed")
 
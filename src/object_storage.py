@@ -0,0 +1,190 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+import json  # For the download manifest and resume state
+import base64  # MD5 hashes are exchanged base64-encoded, as GCS reports them
+import hashlib  # For MD5 verification of downloaded files
+import threading  # To serialize resume-state updates from worker threads
+from concurrent.futures import ThreadPoolExecutor  # For parallel byte-range downloads
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Base64-encoded MD5 of a local file, in the same form GCS reports `blob.md5_hash`
+def file_md5_base64(path, block_size=1 << 20):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return base64.b64encode(digest.digest()).decode("ascii")
+
+
+# Google Cloud Storage backend; one client is created lazily and shared by all requests
+class GCSBackend:
+
+    def __init__(self, bucket_name):
+        self.bucket_name = bucket_name
+        self._bucket = None
+
+    @property
+    def bucket(self):
+        if self._bucket is None:
+            from google.cloud import storage  # Only needed when GCS is actually used
+            self._bucket = storage.Client().bucket(self.bucket_name)
+        return self._bucket
+
+    # Generation, MD5 and size of an object, or None if it doesn't exist
+    def stat(self, name):
+        blob = self.bucket.get_blob(name)
+        if blob is None:
+            return None
+        return {"generation": blob.generation, "md5_hash": blob.md5_hash, "size": blob.size}
+
+    # Bytes [start, end) of a specific object generation
+    def read_range(self, name, start, end, generation=None):
+        blob = self.bucket.blob(name, generation=generation)
+        # GCS ranges are inclusive of the end byte
+        return blob.download_as_bytes(start=start, end=end - 1, checksum=None)
+
+
+# Fake bucket backed by a local directory, for offline runs and tests; the file's mtime
+# stands in for the object generation
+class LocalBucketBackend:
+
+    def __init__(self, root):
+        self.root = root
+
+    def path_for(self, name):
+        return os.path.join(self.root, name)
+
+    def stat(self, name):
+        path = self.path_for(name)
+        if not os.path.exists(path):
+            return None
+        info = os.stat(path)
+        return {"generation": info.st_mtime_ns, "md5_hash": file_md5_base64(path), "size": info.st_size}
+
+    def read_range(self, name, start, end, generation=None):
+        with open(self.path_for(name), "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+
+# Build the storage backend named in the data_ingestion section of config.yaml
+def make_backend(ingestion_config):
+    backend = ingestion_config.get("backend", "gcs")
+    if backend == "gcs":
+        return GCSBackend(ingestion_config["bucket_name"])
+    if backend == "local":
+        return LocalBucketBackend(ingestion_config["local_bucket_dir"])
+    raise ValueError(f"Unknown storage backend '{backend}', expected 'gcs' or 'local'")
+
+
+# Downloads an object as parallel byte-range chunks into a ".part" file. Finished chunks
+# are recorded in a ".part.json" file so an interrupted download resumes where it stopped,
+# and a manifest of the object's generation/MD5 lets unchanged objects be skipped entirely.
+class ChunkedDownloader:
+
+    def __init__(self, backend, chunk_size=8 * 1024 * 1024, max_workers=8):
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _read_json(path):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path, payload):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+
+    # True when the local file matches the remote object recorded in the manifest
+    def is_current(self, remote, dest, manifest_path):
+        manifest = self._read_json(manifest_path)
+        return (manifest is not None and os.path.exists(dest)
+                and manifest.get("generation") == remote["generation"]
+                and manifest.get("md5_hash") == remote["md5_hash"]
+                and os.path.getsize(dest) == remote["size"])
+
+    # Download `name` to `dest` unless it is unchanged; returns True if bytes were fetched
+    def download(self, name, dest, manifest_path, force=False):
+        try:
+            remote = self.backend.stat(name)
+            if remote is None:
+                raise FileNotFoundError(f"Object '{name}' not found")
+
+            if not force and self.is_current(remote, dest, manifest_path):
+                logger.info(f"{name} unchanged (generation {remote['generation']}); skipping download")
+                return False
+
+            part_path = dest + ".part"
+            state_path = part_path + ".json"
+            size = remote["size"]
+            ranges = [(start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+
+            # Resume only if the partial download belongs to the same object generation and chunking
+            state = self._read_json(state_path)
+            resumable = (state is not None and os.path.exists(part_path)
+                         and state.get("generation") == remote["generation"]
+                         and state.get("chunk_size") == self.chunk_size
+                         and os.path.getsize(part_path) == size)
+            done = set(state["done"]) if resumable else set()
+            if not resumable:
+                # Preallocate the file so every worker can write its range in place
+                with open(part_path, "wb") as f:
+                    f.truncate(size)
+                state = {"generation": remote["generation"], "chunk_size": self.chunk_size, "done": []}
+                self._write_json(state_path, state)
+            elif done:
+                logger.info(f"Resuming download of {name}: {len(done)}/{len(ranges)} chunks already fetched")
+
+            lock = threading.Lock()
+
+            def fetch(index):
+                start, end = ranges[index]
+                data = self.backend.read_range(name, start, end, generation=remote["generation"])
+                if len(data) != end - start:
+                    raise IOError(f"Short read for bytes {start}-{end} of {name}")
+                with open(part_path, "r+b") as f:
+                    f.seek(start)
+                    f.write(data)
+                with lock:
+                    done.add(index)
+                    state["done"] = sorted(done)
+                    self._write_json(state_path, state)
+
+            pending = [index for index in range(len(ranges)) if index not in done]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                # list() re-raises the first failed chunk; finished chunks stay recorded for resume
+                list(pool.map(fetch, pending))
+
+            # Verify the assembled file before it replaces the previous download
+            if remote["md5_hash"] and file_md5_base64(part_path) != remote["md5_hash"]:
+                os.remove(part_path)
+                os.remove(state_path)
+                raise IOError(f"MD5 mismatch for {name}; partial download discarded")
+
+            os.replace(part_path, dest)
+            os.remove(state_path)
+            self._write_json(manifest_path, {"name": name, **remote})
+
+            logger.info(f"Downloaded {name} ({size} bytes, {len(pending)} of {len(ranges)} chunks fetched) to {dest}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error while downloading {name}: {e}")
+            raise CustomException(f"Failed to download {name}", sys)
@@ -0,0 +1,91 @@
+# Import standard libraries
+import sys  # For extracting exception traceback
+
+# Import data libraries
+import numpy as np  # For the feature matrices handed to LightGBM
+import lightgbm as lgb  # For the Sequence data interface
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from utils.common_functions import iter_chunks, data_columns  # Chunked CSV/Parquet/Feather reads
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# LightGBM Sequence over a dataset file that is read in chunks and never loaded whole.
+# LightGBM samples rows in increasing index order to build the bins and then reads the data
+# in consecutive batches, so keeping only the current chunk decoded serves both with
+# sequential reads; peak memory is one chunk plus the label column.
+class ChunkedFileSequence(lgb.Sequence):
+
+    def __init__(self, path, label_column, chunk_size=100_000):
+        try:
+            self.path = path
+            self.chunk_size = chunk_size
+            self.batch_size = chunk_size  # Batches read by LightGBM line up with the chunks
+            self.feature_names = [col for col in data_columns(path) if col != label_column]
+
+            # First pass reads the label column only: it gives the row count and the labels
+            labels = [chunk[label_column].to_numpy() for chunk in iter_chunks(path, chunk_size, [label_column])]
+            self.labels = np.concatenate(labels) if labels else np.empty(0)
+
+            self._reader = None
+            self._chunk = None  # Current chunk as a float matrix
+            self._chunk_start = 0  # Row index of the first row of the current chunk
+            logger.info(f"Opened {path} for out-of-core reads: {len(self.labels)} rows, "
+                        f"{len(self.feature_names)} features, {chunk_size} rows per chunk")
+
+        except Exception as e:
+            logger.error(f"Error while opening {path} for chunked reads: {e}")
+            raise CustomException("Failed to open dataset for out-of-core training", sys)
+
+    def __len__(self):
+        return len(self.labels)
+
+    # (rows, features), so stage instrumentation can count rows like for a DataFrame
+    @property
+    def shape(self):
+        return (len(self.labels), len(self.feature_names))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return self._rows(int(idx), int(idx) + 1)[0]
+        if isinstance(idx, slice):
+            start, stop, _ = idx.indices(len(self))
+            return self._rows(start, stop)
+        if isinstance(idx, list):
+            return np.stack([self[i] for i in idx]) if idx else np.empty((0, len(self.feature_names)))
+        raise TypeError(f"Sequence index must be integer, slice or list, got {type(idx).__name__}")
+
+    # Rows [start, stop) as one matrix, which may span consecutive chunks
+    def _rows(self, start, stop):
+        parts = []
+        while start < stop:
+            chunk = self._chunk_at(start)
+            offset = start - self._chunk_start
+            take = min(stop - start, len(chunk) - offset)
+            parts.append(chunk[offset:offset + take])
+            start += take
+        if not parts:
+            return np.empty((0, len(self.feature_names)))
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    # Advance to the chunk holding `row`; reading backwards restarts from the top of the file
+    def _chunk_at(self, row):
+        if self._chunk is None or row < self._chunk_start:
+            self._reader = iter_chunks(self.path, self.chunk_size, self.feature_names)
+            self._chunk_start = 0
+            self._chunk = self._next_chunk()
+        while row >= self._chunk_start + len(self._chunk):
+            self._chunk_start += len(self._chunk)
+            self._chunk = self._next_chunk()
+        return self._chunk
+
+    def _next_chunk(self):
+        chunk = next(self._reader, None)
+        if chunk is None:
+            raise IndexError(f"Row index out of range for {self.path}")
+        # Same float64 values the in-memory path bins, so both produce identical datasets
+        return chunk[self.feature_names].to_numpy(dtype=np.float64)
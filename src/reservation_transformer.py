@@ -0,0 +1,175 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+import joblib  # For persisting the fitted transformer next to the model
+import numpy as np  # For the log1p transformation
+import pandas as pd  # For categorical encoding and DataFrame handling
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Fit-once preprocessing state: label encodings, log1p columns and selected features
+class ReservationTransformer:
+
+    # Initialize with the column lists and skewness threshold from config.yaml
+    def __init__(self, categorical_columns, numerical_columns, skewness_threshold,
+                 target_column="booking_status", drop_columns=("Unnamed: 0", "Booking_ID"),
+                 downcast=True):
+        self.categorical_columns = list(categorical_columns)
+        self.numerical_columns = list(numerical_columns)
+        self.skewness_threshold = skewness_threshold
+        self.target_column = target_column
+        self.drop_columns = list(drop_columns)
+        self.downcast = downcast  # Shrink output columns to int8/int16/float32 where values fit
+
+        # Fitted state
+        self.categories = {}  # Column -> sorted category labels; a label's position is its code
+        self.log1p_columns = []  # Numerical columns whose skewness exceeded the threshold
+        self.selected_features = None  # Ordered model input columns, set after feature selection
+        self.column_dtypes = {}  # Column -> compact dtype learned from the transformed training data
+
+    # Build a transformer from the data_processing section of config.yaml
+    @classmethod
+    def from_config(cls, config):
+        processing = config["data_processing"]
+        return cls(processing["categorical_columns"], processing["numerical_columns"],
+                   processing["skewness_threshold"], downcast=processing.get("downcast", True))
+
+    # Learn label encodings and skewed columns from the training data
+    def fit(self, df):
+        try:
+            # Same ordering LabelEncoder uses: sorted unique labels
+            self.categories = {
+                col: np.sort(np.asarray(df[col].dropna().unique())).tolist() for col in self.categorical_columns
+            }
+
+            # Skewness of every numerical column in a single call
+            skewness = df[self.numerical_columns].skew()
+            self.log1p_columns = skewness[skewness > self.skewness_threshold].index.tolist()
+
+            # Learn the smallest dtypes that hold the transformed training values, so train,
+            # test and serving rows all share the same compact layout
+            self.column_dtypes = {}
+            if self.downcast:
+                self.column_dtypes = self.learn_dtypes(self.transform(df, select_features=False))
+
+            logger.info(f"Transformer fitted; log1p columns: {self.log1p_columns}")
+            return self
+
+        except Exception as e:
+            logger.error(f"Error while fitting transformer: {e}")
+            raise CustomException("Failed to fit preprocessing transformer", sys)
+
+    # Smallest dtype per numeric column: integers to int8/int16/int32, floats to float32
+    @staticmethod
+    def learn_dtypes(df):
+        dtypes = {}
+        for col in df.columns:
+            values = df[col]
+            if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+                continue
+            if pd.api.types.is_integer_dtype(values):
+                dtypes[col] = pd.to_numeric(values, downcast="integer").dtype
+            elif pd.api.types.is_float_dtype(values):
+                dtypes[col] = np.dtype("float32")
+        return dtypes
+
+    # Cast columns to their learned dtypes; an integer column whose values no longer fit
+    # (e.g. an out-of-range serving value) keeps its original dtype
+    def apply_dtypes(self, df):
+        casts = {}
+        for col, dtype in getattr(self, "column_dtypes", {}).items():
+            if col not in df.columns or df[col].dtype == dtype:
+                continue
+            if np.issubdtype(dtype, np.integer):
+                values = df[col]
+                if not pd.api.types.is_integer_dtype(values) or values.empty:
+                    continue
+                info = np.iinfo(dtype)
+                if values.min() < info.min or values.max() > info.max:
+                    continue
+            casts[col] = dtype
+        return df.astype(casts) if casts else df
+
+    # Record the feature subset (and order) the model is trained on
+    def set_selected_features(self, features):
+        self.selected_features = list(features)
+        return self
+
+    # Category-to-code mappings, for logging and for clients that send encoded values
+    def get_mappings(self):
+        return {col: {label: code for code, label in enumerate(labels)}
+                for col, labels in self.categories.items()}
+
+    # Column -> labels present in df that were not seen in training (they would encode as -1)
+    def unknown_categories(self, df):
+        unknown = {}
+        for col, labels in self.categories.items():
+            if col not in df.columns or col == self.target_column:
+                continue
+            values = df[col].dropna()
+            extra = values[~values.isin(labels)].unique().tolist()
+            if extra:
+                unknown[col] = extra
+        return unknown
+
+    # Apply the fitted encodings, log1p and feature selection to raw rows in one pass
+    def transform(self, df, select_features=True):
+        try:
+            df = df.drop(columns=self.drop_columns, errors="ignore")
+
+            # Encode every categorical column present (the target is absent at serving time);
+            # unseen labels map to -1
+            codes = {
+                col: pd.Categorical(df[col], categories=labels).codes
+                for col, labels in self.categories.items() if col in df.columns
+            }
+            df = df.assign(**codes)
+
+            # log1p over the whole block of skewed columns at once (serving rows may
+            # only carry the selected features)
+            log_columns = [col for col in self.log1p_columns if col in df.columns]
+            if log_columns:
+                df[log_columns] = np.log1p(df[log_columns])
+
+            df = self.apply_dtypes(df)
+
+            if select_features and self.selected_features is not None:
+                columns = list(self.selected_features)
+                if self.target_column in df.columns:
+                    columns.append(self.target_column)
+                df = df[columns]
+
+            return df
+
+        except Exception as e:
+            logger.error(f"Error while transforming data: {e}")
+            raise CustomException("Failed to transform data", sys)
+
+    # Fit on a DataFrame and return it transformed
+    def fit_transform(self, df, select_features=True):
+        return self.fit(df).transform(df, select_features=select_features)
+
+    # Save the fitted transformer with joblib
+    def save(self, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            joblib.dump(self, path)
+            logger.info(f"Transformer saved to {path}")
+        except Exception as e:
+            logger.error(f"Error while saving transformer: {e}")
+            raise CustomException("Failed to save preprocessing transformer", sys)
+
+    # Load a fitted transformer saved with save()
+    @staticmethod
+    def load(path):
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            logger.error(f"Error while loading transformer: {e}")
+            raise CustomException("Failed to load preprocessing transformer", sys)
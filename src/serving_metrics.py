@@ -0,0 +1,162 @@
+# Import standard libraries
+import time  # For phase timing
+import bisect  # For locating histogram buckets
+import threading  # For updating metrics from concurrent request threads
+from contextlib import contextmanager  # For the phase timer
+
+# Latency bucket upper bounds in seconds (Prometheus "le" labels)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# Escape a label value for the Prometheus text format
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Render a {label: value} dict as {label="value",...}
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+# Fixed-bucket latency histogram; counts are per bucket and made cumulative when rendered
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is the +Inf bucket
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+# In-process request, latency and error metrics for the Flask app. Updates take one lock
+# and a few dict operations, so recording stays cheap on the request path.
+class ServingMetrics:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix="hotel_serving"):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self.requests = {}  # (endpoint, method, status) -> count
+        self.errors = {}  # (endpoint, error type) -> count
+        self.latency = {}  # (endpoint, phase) -> Histogram; phases: total, parse, predict, render
+        self.rows = {}  # endpoint -> reservations scored
+        self.in_flight = 0
+
+    # Record the duration of one phase of a request
+    def observe(self, endpoint, phase, seconds):
+        with self._lock:
+            histogram = self.latency.get((endpoint, phase))
+            if histogram is None:
+                histogram = self.latency[(endpoint, phase)] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    # Time a block as one phase of a request
+    @contextmanager
+    def time_phase(self, endpoint, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(endpoint, phase, time.perf_counter() - start)
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    # Count a completed request and observe its total latency
+    def record_request(self, endpoint, method, status, seconds):
+        with self._lock:
+            key = (endpoint, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+        self.observe(endpoint, "total", seconds)
+
+    # Count an error (exception class or "http_<status>")
+    def record_error(self, endpoint, error_type):
+        with self._lock:
+            key = (endpoint, error_type)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    # Count scored reservations, for throughput in rows rather than requests
+    def add_rows(self, endpoint, count):
+        with self._lock:
+            self.rows[endpoint] = self.rows.get(endpoint, 0) + count
+
+    # All metrics in the Prometheus text exposition format; log_stats is logging_stats() from src.logger
+    def render(self, model_version=None, model_loaded=False, log_stats=None):
+        name = self.prefix
+        with self._lock:
+            requests = dict(self.requests)
+            errors = dict(self.errors)
+            rows = dict(self.rows)
+            in_flight = self.in_flight
+            latency = {key: (list(h.counts), h.total, h.count) for key, h in self.latency.items()}
+
+        lines = [
+            f"# HELP {name}_requests_total Completed HTTP requests.",
+            f"# TYPE {name}_requests_total counter",
+        ]
+        for (endpoint, method, status), count in sorted(requests.items()):
+            lines.append(f"{name}_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+        lines += [f"# HELP {name}_errors_total Failed requests by error type.",
+                  f"# TYPE {name}_errors_total counter"]
+        for (endpoint, error_type), count in sorted(errors.items()):
+            lines.append(f"{name}_errors_total{_labels(endpoint=endpoint, type=error_type)} {count}")
+
+        lines += [f"# HELP {name}_rows_total Reservations scored.",
+                  f"# TYPE {name}_rows_total counter"]
+        for endpoint, count in sorted(rows.items()):
+            lines.append(f"{name}_rows_total{_labels(endpoint=endpoint)} {count}")
+
+        lines += [f"# HELP {name}_latency_seconds Request latency by phase (total, parse, predict, render).",
+                  f"# TYPE {name}_latency_seconds histogram"]
+        for (endpoint, phase), (counts, total, count) in sorted(latency.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(list(self.buckets) + ["+Inf"], counts):
+                cumulative += bucket_count
+                labels = _labels(endpoint=endpoint, phase=phase, le=bound)
+                lines.append(f"{name}_latency_seconds_bucket{labels} {cumulative}")
+            labels = _labels(endpoint=endpoint, phase=phase)
+            lines.append(f"{name}_latency_seconds_sum{labels} {total}")
+            lines.append(f"{name}_latency_seconds_count{labels} {count}")
+
+        lines += [
+            f"# HELP {name}_in_flight_requests Requests currently being handled.",
+            f"# TYPE {name}_in_flight_requests gauge",
+            f"{name}_in_flight_requests {in_flight}",
+            f"# HELP {name}_model_loaded Whether a model is loaded (1) or not (0).",
+            f"# TYPE {name}_model_loaded gauge",
+            f"{name}_model_loaded {int(bool(model_loaded))}",
+            f"# HELP {name}_model_info Loaded model version.",
+            f"# TYPE {name}_model_info gauge",
+        ]
+        if model_version is not None:
+            lines.append(f"{name}_model_info{_labels(version=model_version)} 1")
+        if log_stats is not None:
+            lines += [
+                f"# HELP {name}_log_records_dropped_total Log records dropped because the log buffer was full.",
+                f"# TYPE {name}_log_records_dropped_total counter",
+                f"{name}_log_records_dropped_total {log_stats['dropped']}",
+                f"# HELP {name}_log_queue_size Log records waiting to be written.",
+                f"# TYPE {name}_log_queue_size gauge",
+                f"{name}_log_queue_size {log_stats['queued']}",
+            ]
+        lines += [
+            f"# HELP {name}_uptime_seconds Seconds since the app started.",
+            f"# TYPE {name}_uptime_seconds gauge",
+            f"{name}_uptime_seconds {time.time() - self.started_at:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
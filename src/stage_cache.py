@@ -0,0 +1,155 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+import json  # For reading and writing stage manifests
+import time  # For stage timing and output freshness checks
+
+# Import custom utilities and configuration
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from config.paths_config import STAGE_CACHE_DIR  # Directory holding stage manifests
+from utils.common_functions import file_fingerprint, dict_fingerprint  # Content hashing helpers
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Content-addressed cache that lets pipeline stages be skipped when nothing they depend on changed
+class StageCache:
+
+    # Initialize with the directory where one manifest per stage is kept
+    def __init__(self, cache_dir=STAGE_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Memo of file hashes keyed by (path, size, mtime) so unchanged files are not rehashed
+        self._hash_memo_path = os.path.join(self.cache_dir, "file_hashes.json")
+        self._hash_memo = self._read_json(self._hash_memo_path) or {}
+
+    # Read a JSON file, returning None when it is missing or corrupt
+    @staticmethod
+    def _read_json(path):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # Write a JSON file atomically so an interrupted run never leaves a half-written manifest
+    @staticmethod
+    def _write_json(path, payload):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    # Hash a file's contents, reusing the memoized hash if its size and mtime are unchanged
+    def hash_file(self, path):
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        if key not in self._hash_memo:
+            self._hash_memo[key] = file_fingerprint(path)
+        return self._hash_memo[key]
+
+    # Drop memoized hashes of files that no longer exist or have changed since they were hashed,
+    # so the memo only holds one entry per current file
+    def prune_hash_memo(self):
+        current = {}
+        for key, digest in self._hash_memo.items():
+            path, size, mtime_ns = key.rsplit(":", 2)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if str(stat.st_size) == size and str(stat.st_mtime_ns) == mtime_ns:
+                current[key] = digest
+        self._hash_memo = current
+
+    # Build the stage fingerprint from input file contents, config/params and code version
+    def fingerprint(self, inputs=(), params=None, code=()):
+        missing = [path for path in list(inputs) + list(code) if not os.path.exists(path)]
+        if missing:
+            # A missing input can never match a cached run
+            return None
+
+        return dict_fingerprint({
+            "inputs": {path: self.hash_file(path) for path in inputs},
+            "params": params or {},
+            "code": {path: self.hash_file(path) for path in code},
+        })
+
+    # Path of the manifest file for a given stage
+    def manifest_path(self, stage):
+        return os.path.join(self.cache_dir, f"{stage}.json")
+
+    # Check whether a stage's recorded fingerprint matches and its outputs are still intact
+    def is_fresh(self, stage, fingerprint):
+        manifest = self._read_json(self.manifest_path(stage))
+        if fingerprint is None or manifest is None or manifest.get("fingerprint") != fingerprint:
+            return False
+
+        for path, digest in manifest.get("outputs", {}).items():
+            if not os.path.exists(path) or self.hash_file(path) != digest:
+                logger.info(f"Cached output {path} of stage '{stage}' is missing or modified")
+                return False
+        return True
+
+    # Record a successful stage run: its fingerprint and the content hash of each output
+    def record(self, stage, fingerprint, outputs):
+        self._write_json(self.manifest_path(stage), {
+            "stage": stage,
+            "fingerprint": fingerprint,
+            "outputs": {path: self.hash_file(path) for path in outputs},
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        self.prune_hash_memo()
+        self._write_json(self._hash_memo_path, self._hash_memo)
+
+    # Drop the manifest of a stage so it re-runs next time
+    def invalidate(self, stage):
+        path = self.manifest_path(stage)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Fingerprint a stage and decide whether it must run; returns (needs_run, fingerprint)
+    def check(self, stage, inputs=(), params=None, code=(), force=False):
+        fingerprint = self.fingerprint(inputs, params, code)
+
+        if not force and self.is_fresh(stage, fingerprint):
+            logger.info(f"Stage '{stage}' is up to date (fingerprint {fingerprint[:12]}), skipping")
+            return False, fingerprint
+
+        reason = "forced" if force else "inputs, config or code changed"
+        logger.info(f"Running stage '{stage}' ({reason})")
+        return True, fingerprint
+
+    # Record a finished run, but only if every output exists and the rewritten ones (default: all)
+    # were written by this run; the others may be kept from an earlier run
+    def complete(self, stage, fingerprint, outputs, started_at, rewritten=None):
+        rewritten = outputs if rewritten is None else rewritten
+        stale = [path for path in outputs if not os.path.exists(path)
+                 or (path in rewritten and os.path.getmtime(path) < started_at - 1)]
+        if fingerprint is None or stale:
+            logger.warning(f"Stage '{stage}' not cached; missing or stale outputs: {stale}")
+            self.invalidate(stage)
+        else:
+            self.record(stage, fingerprint, outputs)
+            logger.info(f"Stage '{stage}' cached with fingerprint {fingerprint[:12]}")
+
+    # Run a stage unless its fingerprint matches a cached run; returns True if it actually ran
+    def run(self, stage, fn, inputs=(), params=None, code=(), outputs=(), force=False):
+        try:
+            needs_run, fingerprint = self.check(stage, inputs, params, code, force)
+            if not needs_run:
+                return False
+
+            started_at = time.time()
+            fn()
+            self.complete(stage, fingerprint, outputs, started_at)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error while running cached stage '{stage}': {e}")
+            raise CustomException(f"Failed to run stage '{stage}'", sys)
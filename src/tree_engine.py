@@ -0,0 +1,201 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+
+# Import data libraries
+import numpy as np  # For the flattened tree arrays and vectorized traversal
+import pandas as pd  # For aligning DataFrame columns to the model's feature order
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+# LightGBM treats |x| <= kZeroThreshold as zero when missing_type is "Zero"
+ZERO_THRESHOLD = 1e-35
+
+# Encoding of LightGBM's missing_type in the flattened arrays
+MISSING_TYPES = {"None": 0, "Zero": 1, "NaN": 2}
+
+
+# Array-backed evaluator for a binary LightGBM tree ensemble
+class TreeEnsemble:
+
+    # Initialize from flattened node arrays; leaves have split_feature == -1
+    def __init__(self, split_feature, threshold, left_child, right_child, default_left,
+                 missing_type, leaf_value, tree_roots, feature_names, classes,
+                 sigmoid=1.0, average_output=False):
+        self.split_feature = np.asarray(split_feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left_child = np.asarray(left_child, dtype=np.int32)
+        self.right_child = np.asarray(right_child, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.missing_type = np.asarray(missing_type, dtype=np.int8)
+        self.leaf_value = np.asarray(leaf_value, dtype=np.float64)
+        self.tree_roots = np.asarray(tree_roots, dtype=np.int32)
+        self.feature_names = list(feature_names)
+        self.classes_ = np.asarray(classes)
+        self.sigmoid = float(sigmoid)
+        self.average_output = bool(average_output)
+        self.is_leaf = self.split_feature < 0
+
+    # Flatten the booster of a fitted LGBMClassifier into node arrays
+    @classmethod
+    def from_lgbm(cls, model):
+        try:
+            dump = model.booster_.dump_model()
+
+            if dump.get("num_class", 1) != 1 or not dump["objective"].startswith("binary"):
+                raise ValueError(f"Only binary objectives are supported, got '{dump['objective']}'")
+
+            sigmoid = 1.0
+            for token in dump["objective"].split()[1:]:
+                if token.startswith("sigmoid:"):
+                    sigmoid = float(token.split(":", 1)[1])
+
+            nodes = {name: [] for name in ("split_feature", "threshold", "left_child", "right_child",
+                                           "default_left", "missing_type", "leaf_value")}
+            tree_roots = []
+
+            # Depth-first flattening; child pointers are global node indices
+            def add_node(node):
+                index = len(nodes["split_feature"])
+                for values in nodes.values():
+                    values.append(0)
+
+                if "leaf_value" in node:
+                    nodes["split_feature"][index] = -1
+                    nodes["leaf_value"][index] = node["leaf_value"]
+                    return index
+
+                if node["decision_type"] != "<=":
+                    raise ValueError(f"Unsupported decision type '{node['decision_type']}'")
+
+                nodes["split_feature"][index] = node["split_feature"]
+                nodes["threshold"][index] = node["threshold"]
+                nodes["default_left"][index] = node["default_left"]
+                nodes["missing_type"][index] = MISSING_TYPES[node["missing_type"]]
+                nodes["left_child"][index] = add_node(node["left_child"])
+                nodes["right_child"][index] = add_node(node["right_child"])
+                return index
+
+            for tree in dump["tree_info"]:
+                tree_roots.append(add_node(tree["tree_structure"]))
+
+            logger.info(f"Exported {len(tree_roots)} trees with {len(nodes['split_feature'])} nodes")
+
+            return cls(tree_roots=tree_roots, feature_names=dump["feature_names"], classes=model.classes_,
+                       sigmoid=sigmoid, average_output=dump.get("average_output", False), **nodes)
+
+        except Exception as e:
+            logger.error(f"Error while exporting LightGBM model: {e}")
+            raise CustomException("Failed to export LightGBM model to arrays", sys)
+
+    # Save the arrays as a single .npz file
+    def save(self, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.savez(path, split_feature=self.split_feature, threshold=self.threshold,
+                     left_child=self.left_child, right_child=self.right_child,
+                     default_left=self.default_left, missing_type=self.missing_type,
+                     leaf_value=self.leaf_value, tree_roots=self.tree_roots,
+                     feature_names=np.asarray(self.feature_names), classes=self.classes_,
+                     sigmoid=self.sigmoid, average_output=self.average_output)
+            logger.info(f"Tree arrays saved to {path}")
+        except Exception as e:
+            logger.error(f"Error while saving tree arrays: {e}")
+            raise CustomException("Failed to save tree arrays", sys)
+
+    # Load arrays saved with save()
+    @classmethod
+    def load(cls, path):
+        try:
+            with np.load(path) as data:
+                arrays = {key: data[key] for key in data.files}
+            return cls(sigmoid=arrays.pop("sigmoid").item(),
+                       average_output=arrays.pop("average_output").item(),
+                       feature_names=arrays.pop("feature_names").tolist(),
+                       **arrays)
+        except Exception as e:
+            logger.error(f"Error while loading tree arrays: {e}")
+            raise CustomException("Failed to load tree arrays", sys)
+
+    # Convert input to a float64 matrix in the model's feature order
+    def _to_matrix(self, X):
+        if isinstance(X, pd.DataFrame) and list(X.columns) != self.feature_names:
+            X = X[self.feature_names]
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    # Route (row, node) pairs one level down, following LightGBM's NumericalDecision rules
+    def _step(self, fval, node, check_missing):
+        go_left = fval <= self.threshold[node]
+
+        if check_missing:
+            missing = self.missing_type[node]
+            is_nan = np.isnan(fval)
+            # NaN is treated as 0.0 unless the split has a NaN default direction
+            fval = np.where(is_nan & (missing != MISSING_TYPES["NaN"]), 0.0, fval)
+            go_left = fval <= self.threshold[node]
+            use_default = (((missing == MISSING_TYPES["Zero"]) & (np.abs(fval) <= ZERO_THRESHOLD))
+                           | ((missing == MISSING_TYPES["NaN"]) & is_nan))
+            go_left = np.where(use_default, self.default_left[node], go_left)
+
+        return np.where(go_left, self.left_child[node], self.right_child[node])
+
+    # Raw scores: every (row, tree) path is advanced one level per iteration, and only
+    # paths that have not reached a leaf yet are touched
+    def predict_raw(self, X, block_rows=4096):
+        X = self._to_matrix(X)
+        n_trees = len(self.tree_roots)
+        scores = np.empty(len(X), dtype=np.float64)
+
+        # Zero-as-missing splits need the slow path even without NaNs in the input
+        has_zero_missing = bool((self.missing_type == MISSING_TYPES["Zero"]).any())
+
+        # Row blocks bound the (rows x trees) node-index array
+        for start in range(0, len(X), block_rows):
+            block = X[start:start + block_rows]
+            check_missing = has_zero_missing or bool(np.isnan(block).any())
+
+            node = np.tile(self.tree_roots, len(block))
+            row_of = np.repeat(np.arange(len(block)), n_trees)
+            active = np.flatnonzero(~self.is_leaf[node])
+
+            while active.size:
+                current = node[active]
+                fval = block[row_of[active], self.split_feature[current]]
+                next_node = self._step(fval, current, check_missing)
+                node[active] = next_node
+                active = active[~self.is_leaf[next_node]]
+
+            scores[start:start + len(block)] = self.leaf_value[node].reshape(len(block), n_trees).sum(axis=1)
+
+        if self.average_output:
+            scores /= n_trees
+        return scores
+
+    # Class probabilities in the same layout as LGBMClassifier.predict_proba
+    def predict_proba(self, X):
+        positive = 1.0 / (1.0 + np.exp(-self.sigmoid * self.predict_raw(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    # Class labels in the same way LGBMClassifier.predict derives them
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+# Compare the array engine against the original model; returns the max probability difference
+def check_parity(model, engine, X, atol=1e-9):
+    expected_proba = model.predict_proba(X)
+    actual_proba = engine.predict_proba(X)
+    max_diff = float(np.max(np.abs(expected_proba - actual_proba))) if len(X) else 0.0
+
+    labels_match = np.array_equal(model.predict(X), engine.predict(X))
+    if max_diff > atol or not labels_match:
+        raise ValueError(f"Tree engine parity failed: max probability diff {max_diff}, "
+                         f"labels match: {labels_match}")
+
+    logger.info(f"Tree engine parity check passed on {len(X)} rows (max diff {max_diff:.3e})")
+    return max_diff
@@ -0,0 +1,184 @@
+# Import standard libraries
+import os  # For file and directory handling
+import sys  # For extracting exception traceback
+import json  # For canonical serialization of trial parameters
+import sqlite3  # For the local trial database
+from datetime import datetime  # For timestamping trials
+
+# Import data libraries
+import numpy as np  # For sampling around promising trials
+from sklearn.model_selection import ParameterSampler  # For random candidates from the search space
+
+# Import custom utilities
+from src.logger import get_logger  # Custom logger utility
+from src.custom_exception import CustomException  # Custom exception handling
+from utils.common_functions import dict_fingerprint  # Stable hashing of the search space
+
+# Initialize the logger for this module
+logger = get_logger(__name__)
+
+
+# Convert numpy scalars in a parameter dict to plain Python values
+def to_builtin_params(params):
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in params.items()}
+
+# Canonical JSON form of a parameter dict, used to recognize already evaluated configurations
+def params_key(params):
+    return json.dumps(to_builtin_params(params), sort_keys=True)
+
+# Stable description of a parameter space, including scipy frozen distributions
+def describe_search_space(params_dist):
+    description = {}
+    for name, values in params_dist.items():
+        if hasattr(values, "dist"):
+            description[name] = [values.dist.name, list(values.args), values.kwds]
+        else:
+            description[name] = list(values)
+    return description
+
+# Fingerprint of a parameter space
+def search_space_fingerprint(params_dist):
+    return dict_fingerprint(describe_search_space(params_dist))
+
+
+# SQLite store of every hyperparameter trial, keyed by dataset and search space fingerprints
+class TrialStore:
+
+    # Open (and create if needed) the trial database
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS trials (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dataset_fp TEXT NOT NULL,
+                    space_fp TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    budget INTEGER,
+                    final INTEGER NOT NULL,
+                    score REAL NOT NULL,
+                    trial_time REAL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_trials_key ON trials (space_fp, dataset_fp)")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    # Store the trials of one search run; `final` marks trials run at the full budget.
+    # Failed fits score NaN (sklearn's error_score), which SQLite would store as NULL; they are skipped.
+    def record(self, dataset_fp, space_fp, trials):
+        try:
+            created_at = datetime.now().isoformat(timespec="seconds")
+            scored = [t for t in trials if t["score"] is not None and np.isfinite(t["score"])]
+            if len(scored) < len(trials):
+                logger.warning(f"Skipping {len(trials) - len(scored)} trials without a finite score")
+            rows = [(dataset_fp, space_fp, params_key(t["params"]), t.get("budget"), int(t["final"]),
+                     float(t["score"]), t.get("trial_time"), created_at) for t in scored]
+            with self._connect() as conn:
+                conn.executemany("""
+                    INSERT INTO trials (dataset_fp, space_fp, params, budget, final, score, trial_time, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+            logger.info(f"Recorded {len(rows)} trials in {self.db_path}")
+        except Exception as e:
+            logger.error(f"Error while recording trials: {e}")
+            raise CustomException("Failed to record trials", sys)
+
+    # All trials for a search space, optionally restricted to one dataset, best first
+    def get_trials(self, space_fp, dataset_fp=None, final_only=False):
+        query = "SELECT dataset_fp, params, budget, final, score, trial_time FROM trials WHERE space_fp = ?"
+        args = [space_fp]
+        if dataset_fp is not None:
+            query += " AND dataset_fp = ?"
+            args.append(dataset_fp)
+        if final_only:
+            query += " AND final = 1"
+        query += " ORDER BY score DESC, id DESC"
+
+        with self._connect() as conn:
+            rows = conn.execute(query, args).fetchall()
+        return [{"dataset_fp": d, "params": json.loads(p), "budget": b, "final": bool(f),
+                 "score": s, "trial_time": t} for d, p, b, f, s, t in rows]
+
+    # Best full-budget trial on this exact dataset, or None
+    def best_trial(self, space_fp, dataset_fp):
+        trials = self.get_trials(space_fp, dataset_fp, final_only=True)
+        return trials[0] if trials else None
+
+
+# Proposes search candidates that skip evaluated configurations and focus on promising regions
+class WarmStartSampler:
+
+    # Initialize with the store, the fingerprints and the warm-start settings from model_params.py
+    def __init__(self, store, dataset_fp, space_fp, params_dist, exploit_fraction=0.5, top_k=5,
+                 perturbation=0.1, random_state=42, exclude_keys=()):
+        self.store = store
+        self.dataset_fp = dataset_fp
+        self.space_fp = space_fp
+        self.params_dist = params_dist
+        self.exploit_fraction = exploit_fraction
+        self.top_k = top_k
+        self.perturbation = perturbation
+        self.random_state = random_state
+        self.exclude_keys = set(exclude_keys)  # e.g. the halving resource, which is not a hyperparameter
+
+    # Strip budget keys so the same configuration at different budgets compares equal
+    def _strip(self, params):
+        return {key: value for key, value in params.items() if key not in self.exclude_keys}
+
+    # Sample a value near `value` within the support of a distribution, or re-pick a category
+    def _perturb(self, name, value, rng):
+        space = self.params_dist[name]
+        if hasattr(space, "dist"):
+            low, high = space.support()
+            high = min(high, np.finfo(float).max)
+            new_value = np.clip(value + rng.normal(0, self.perturbation * (high - low)), low, high)
+            return int(round(new_value)) if space.dist.name == "randint" else float(new_value)
+        # Categorical: mostly keep the promising choice, sometimes explore another
+        return value if rng.random() > self.perturbation * 2 else space[rng.integers(len(space))]
+
+    # Propose up to n new candidates
+    def propose(self, n):
+        # Only trials with a real score guide the search (older stores may hold non-finite ones)
+        history = [t for t in self.store.get_trials(self.space_fp)
+                   if t["score"] is not None and np.isfinite(t["score"])]
+        evaluated = {params_key(self._strip(t["params"])) for t in history if t["dataset_fp"] == self.dataset_fp}
+
+        # Promising regions: best full-budget trials on any dataset version for this space
+        promising = [self._strip(t["params"]) for t in history if t["final"]][:self.top_k]
+
+        # Vary the seed with the history size so reruns don't redraw the same random candidates
+        rng = np.random.default_rng(self.random_state + len(history))
+        n_exploit = int(round(n * self.exploit_fraction)) if promising else 0
+
+        candidates, seen = [], set(evaluated)
+
+        def add(params):
+            key = params_key(params)
+            if key not in seen:
+                seen.add(key)
+                candidates.append(to_builtin_params(params))
+
+        # Exploit: perturb the best known configurations
+        for attempt in range(n_exploit * 10):
+            if len(candidates) >= n_exploit:
+                break
+            base = promising[attempt % len(promising)]
+            add({name: self._perturb(name, value, rng) if name in self.params_dist else value
+                 for name, value in base.items()})
+
+        # Explore: fresh random samples from the full space
+        sampler = ParameterSampler(self.params_dist, n_iter=n * 10,
+                                   random_state=int(rng.integers(2 ** 31 - 1)))
+        for params in sampler:
+            if len(candidates) >= n:
+                break
+            add(params)
+
+        logger.info(f"Warm start: {len(history)} stored trials, {len(evaluated)} already evaluated on this "
+                    f"dataset, proposing {len(candidates)} candidates ({min(n_exploit, len(candidates))} "
+                    f"around the best {len(promising)} trials)")
+        return candidates
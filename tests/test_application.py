@@ -0,0 +1,167 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+import lightgbm as lgb
+
+import application
+from src.model_holder import ModelBundle
+from src.reservation_transformer import ReservationTransformer
+
+
+class FixedHolder:
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+
+    def get(self):
+        return self.bundle
+
+    def peek(self):
+        return self.bundle
+
+
+@pytest.fixture
+def client(monkeypatch):
+    rng = np.random.default_rng(0)
+    n = 200
+    raw = pd.DataFrame({
+        "lead_time": rng.integers(0, 300, n),
+        "arrival_year": rng.choice([2017, 2018], n),
+        "avg_price_per_room": rng.uniform(50, 200, n),
+        "market_segment_type": rng.choice(["Offline", "Online"], n),
+        "booking_status": rng.choice(["Canceled", "Not_Canceled"], n),
+    })
+    transformer = ReservationTransformer(["market_segment_type", "booking_status"],
+                                         ["lead_time", "arrival_year", "avg_price_per_room"], 5)
+    # arrival_year was never one of the fixed form fields
+    features = ["lead_time", "arrival_year", "market_segment_type"]
+    train = transformer.fit_transform(raw, select_features=False)
+    transformer.set_selected_features(features)
+    model = lgb.LGBMClassifier(n_estimators=5, verbose=-1).fit(train[features], train["booking_status"])
+
+    monkeypatch.setattr(application, "model_holder", FixedHolder(ModelBundle(model, transformer, model, "test")))
+    return application.app.test_client()
+
+
+def test_form_asks_for_the_selected_features(client):
+    page = client.get("/").get_data(as_text=True)
+    assert 'name="arrival_year"' in page
+    assert 'name="avg_price_per_room"' not in page
+
+    response = client.post("/", data={"lead_time": "30", "arrival_year": "2018", "market_segment_type": "Online"})
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+
+def test_form_rejects_missing_and_unknown_inputs(client):
+    response = client.post("/", data={"lead_time": "30", "market_segment_type": "Online"})
+    assert response.status_code == 400
+    assert "arrival_year" in response.get_data(as_text=True)
+
+    response = client.post("/", data={"lead_time": "30", "arrival_year": "2018", "market_segment_type": "Cruise"})
+    assert response.status_code == 400
+
+
+def test_batch_rejects_unknown_labels(client):
+    records = [{"lead_time": 30, "arrival_year": 2018, "market_segment_type": "Cruise"}]
+    response = client.post("/predict/batch", json=records)
+    assert response.status_code == 400
+    assert "Cruise" in response.get_json()["error"]
+
+
+def scrape(client, metric):
+    body = client.get("/metrics").get_data(as_text=True)
+    return sorted(line for line in body.splitlines() if line.startswith(f"hotel_serving_{metric}"))
+
+
+def test_metrics_count_each_request_once(client, monkeypatch):
+    monkeypatch.setattr(application, "serving_metrics", application.ServingMetrics())
+    records = [{"lead_time": 30, "arrival_year": 2018, "market_segment_type": "Online"}]
+
+    # Client error
+    assert client.post("/predict/batch", json=[{**records[0], "market_segment_type": "Cruise"}]).status_code == 400
+
+    # Streamed batch: latency is recorded once the body has been sent
+    response = client.post("/predict/batch", json=records * 3)
+    assert response.status_code == 200
+    assert len(response.get_json()) == 3
+    response.close()
+
+    # Unhandled exception
+    bundle = application.model_holder.get()
+    monkeypatch.setattr(bundle, "model", None)
+    response = client.post("/predict/batch", json=records)
+    assert response.status_code == 500
+    response.close()
+
+    requests = scrape(client, "requests_total")
+    assert requests == [
+        'hotel_serving_requests_total{endpoint="/predict/batch",method="POST",status="200"} 1',
+        'hotel_serving_requests_total{endpoint="/predict/batch",method="POST",status="400"} 1',
+        'hotel_serving_requests_total{endpoint="/predict/batch",method="POST",status="500"} 1',
+    ]
+    assert scrape(client, "errors_total") == [
+        'hotel_serving_errors_total{endpoint="/predict/batch",type="AttributeError"} 1',
+        'hotel_serving_errors_total{endpoint="/predict/batch",type="http_400"} 1',
+    ]
+    assert 'hotel_serving_latency_seconds_count{endpoint="/predict/batch",phase="total"} 3' in \
+        scrape(client, "latency_seconds_count")
+
+
+def batch_records(n=7, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "lead_time": rng.integers(0, 300, n),
+        "arrival_year": rng.choice([2017, 2018], n),
+        "market_segment_type": rng.choice(["Offline", "Online"], n),
+    })
+
+
+def expected_scores(records):
+    bundle = application.model_holder.get()
+    features = bundle.transformer.transform(records)
+    proba = bundle.model.predict_proba(features)
+    return bundle.model.classes_[proba.argmax(axis=1)], proba[:, 1]
+
+
+def test_batch_matches_the_model_across_streamed_chunks(client, monkeypatch):
+    # Several chunks, so the streamed JSON pieces must join into one array
+    monkeypatch.setattr(application, "BATCH_RESPONSE_CHUNK_ROWS", 3)
+    records = batch_records()
+    labels, probabilities = expected_scores(records)
+
+    response = client.post("/predict/batch?probabilities=true", json={"records": records.to_dict("records")})
+    assert response.status_code == 200
+    assert response.headers["X-Model-Version"] == "test"
+    results = response.get_json()
+    assert [result["row"] for result in results] == list(range(len(records)))
+    assert [result["prediction"] for result in results] == labels.tolist()
+    np.testing.assert_allclose([result["probability"] for result in results], probabilities)
+
+
+def test_batch_accepts_csv_and_parquet_and_returns_csv(client):
+    records = batch_records()
+    labels, _ = expected_scores(records)
+
+    response = client.post("/predict/batch?format=csv", data=records.to_csv(index=False), content_type="text/csv")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    result = pd.read_csv(io.StringIO(response.get_data(as_text=True)))
+    assert list(result.columns) == ["row", "prediction"]
+    assert result["prediction"].tolist() == labels.tolist()
+
+    upload = io.BytesIO(records.to_parquet(index=False))
+    response = client.post("/predict/batch", data={"file": (upload, "batch.parquet")},
+                           content_type="multipart/form-data")
+    assert response.status_code == 200
+    assert [result["prediction"] for result in response.get_json()] == labels.tolist()
+
+
+def test_batch_rejects_empty_and_incomplete_requests(client):
+    assert client.post("/predict/batch", json=[]).status_code == 400
+    assert client.post("/predict/batch", json={"rows": 1}).status_code == 400
+
+    response = client.post("/predict/batch", json=batch_records().drop(columns="arrival_year").to_dict("records"))
+    assert response.status_code == 400
+    assert "arrival_year" in response.get_json()["error"]
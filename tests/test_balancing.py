@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from src.balancing import ChunkedSMOTE
+from utils.common_functions import ChunkedWriter, load_data
+
+
+def make_data(seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame({"lead_time": rng.integers(0, 300, 100).astype(np.int16),
+                      "price": rng.uniform(50, 200, 100).astype(np.float32)})
+    y = pd.Series([0] * 20 + [1] * 80, name="booking_status")
+    return X, y
+
+
+def test_resample_to_streams_the_same_rows_as_fit_resample(tmp_path):
+    X, y = make_data()
+    smote = ChunkedSMOTE(k_neighbors=3, chunk_size=7, random_state=0)
+
+    X_resampled, y_resampled = smote.fit_resample(X, y)
+    assert y_resampled.value_counts().to_dict() == {0: 80, 1: 80}
+    assert X_resampled["lead_time"].dtype == np.int16
+
+    path = str(tmp_path / "balanced.parquet")
+    with ChunkedWriter(path) as writer:
+        rows = smote.resample_to(X, y, writer)
+
+    written = load_data(path)
+    assert rows == len(written) == 160
+    pd.testing.assert_frame_equal(written, X_resampled.assign(booking_status=y_resampled))
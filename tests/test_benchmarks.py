@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+import subprocess
+
+from benchmarks.run_benchmarks import REPO_ROOT
+
+
+def run_benchmarks(tmp_path, *args):
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    return subprocess.run([sys.executable, "-m", "benchmarks.run_benchmarks", "--rows", "1000",
+                           "--stages", "ingestion", "processing", "--work-dir", str(tmp_path / "work"),
+                           "--output", str(tmp_path / "results.jsonl"), *args],
+                          cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+
+
+def test_runner_records_stages_on_a_tiny_synthetic_dataset(tmp_path):
+    completed = run_benchmarks(tmp_path)
+    assert completed.returncode == 0, completed.stderr[-2000:]
+
+    with open(tmp_path / "results.jsonl") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["stage"] for record in records] == ["generate", "ingestion", "processing"]
+    for record in records:
+        assert record["rows"] == 1000
+        assert record["wall_s"] > 0
+        assert record["commit"]
+    assert all(record["peak_rss_mb"] for record in records[1:])
+    assert os.path.exists(tmp_path / "work" / "rows_1000" / "artifacts" / "processed")
+
+    # A second run compared against the first appends its results and passes within tolerance
+    commit = records[0]["commit"].split("-")[0]
+    completed = run_benchmarks(tmp_path, "--baseline", commit, "--tolerance", "100")
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    assert "ratio" in completed.stdout
+    with open(tmp_path / "results.jsonl") as f:
+        assert len(f.readlines()) == 6
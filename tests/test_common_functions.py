@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+import pandas as pd
+
+from utils.common_functions import ChunkedWriter, load_data
+
+
+SCHEMA = {"engine": "c", "dtypes": {"small": "int8", "wide": "int8", "price": "float32"}}
+
+
+def test_schema_dtypes_are_applied_only_where_values_fit(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"small": [1, 2, 3], "wide": [1, 300, -5], "price": [1.5, 2.5, 3.5]}).to_csv(path, index=False)
+
+    df = load_data(str(path), schema=SCHEMA)
+
+    assert df["small"].dtype == np.int8
+    assert df["price"].dtype == np.float32
+    # 300 does not fit int8; read_csv(dtype=int8) would have wrapped it to 44
+    assert df["wide"].dtype == np.int64
+    assert df["wide"].tolist() == [1, 300, -5]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_chunked_writer_promotes_the_schema_of_later_chunks(tmp_path, fmt):
+    path = str(tmp_path / f"data.{fmt}")
+    chunks = [
+        pd.DataFrame({"count": np.array([1, 2], dtype=np.int8), "note": [None, None]}),
+        # Missing value turns the integer column into floats; the null column gets strings
+        pd.DataFrame({"count": [3.0, np.nan], "note": ["a", "b"]}),
+        pd.DataFrame({"count": np.array([400], dtype=np.int64), "note": ["c"]}),
+    ]
+    with ChunkedWriter(path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+
+    df = load_data(path)
+    assert writer.rows_written == len(df) == 5
+    assert df["count"].tolist()[:3] == [1.0, 2.0, 3.0] and np.isnan(df["count"][3]) and df["count"][4] == 400
+    assert df["note"].isna().tolist() == [True, True, False, False, False]
+    assert df["note"].tolist()[2:] == ["a", "b", "c"]
@@ -0,0 +1,38 @@
+import sys
+
+import pytest
+
+from src.custom_exception import CustomException
+from src.dag_runner import Node, DagRunner
+
+
+def write_file(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def fail_with_custom_exception(path):
+    try:
+        raise ValueError("bad input in stage")
+    except ValueError:
+        raise CustomException("Stage failed on purpose", sys)
+
+
+def test_failing_node_reports_its_error_through_the_process_executor(tmp_path):
+    ok_path = str(tmp_path / "ok.txt")
+    nodes = [
+        Node("fails", fail_with_custom_exception, args=(str(tmp_path / "never.txt"),),
+             outputs=[str(tmp_path / "never.txt")]),
+        Node("sibling", write_file, args=(ok_path, "done"), outputs=[ok_path]),
+    ]
+    runner = DagRunner(nodes, cpu_budget=2, executor="process")
+
+    with pytest.raises(CustomException):
+        runner.run()
+
+    # The real error reaches the parent and an independent sibling still completes
+    failures = [r for r in runner.last_report["nodes"].values() if r["status"] == "failed"]
+    assert len(failures) == 1
+    assert "Stage failed on purpose" in failures[0]["error"]
+    assert "terminated abruptly" not in failures[0]["error"]
+    assert runner.last_report["nodes"]["sibling"]["status"] == "ran"
@@ -0,0 +1,26 @@
+import pytest
+
+from pipeline import stages
+from src.custom_exception import CustomException
+from src.data_ingestion import DataIngestion
+
+
+def missing_object_config(tmp_path):
+    bucket = tmp_path / "bucket"
+    bucket.mkdir()
+    return {"data_ingestion": {"bucket_name": "local", "bucket_file_name": "missing.csv", "train_ratio": 0.8,
+                               "backend": "local", "local_bucket_dir": str(bucket)}}
+
+
+def test_run_only_logs_errors_by_default(tmp_path):
+    DataIngestion(missing_object_config(tmp_path)).run()
+
+
+def test_run_raises_errors_when_asked(tmp_path):
+    with pytest.raises(CustomException):
+        DataIngestion(missing_object_config(tmp_path)).run(raise_errors=True)
+
+
+def test_ingestion_stage_fails_when_the_download_fails(tmp_path):
+    with pytest.raises(CustomException, match="Failed to download"):
+        stages.run_ingestion(missing_object_config(tmp_path))
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from src.dataset_cache import BinnedDatasetCache
+
+
+def make_data(seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    return X, (X["a"] > 0).astype(int)
+
+
+def test_cache_file_depends_on_params_and_features(tmp_path):
+    X, y = make_data()
+    cache = BinnedDatasetCache(str(tmp_path), {"max_bin": 63})
+
+    path = cache.path_for("f" * 64, list(X.columns))
+    assert path != cache.path_for("f" * 64, ["a", "b"])
+    assert path != BinnedDatasetCache(str(tmp_path), {"max_bin": 255}).path_for("f" * 64, list(X.columns))
+
+    dataset = cache.get(X, y, "f" * 64)
+    assert dataset.feature_name == ["a", "b", "c"]
+    assert (tmp_path / path.split("/")[-1]).exists()
+
+    # Same data fingerprint with fewer features must not reuse the three-feature binary
+    subset = cache.get(X[["a", "b"]], y, "f" * 64)
+    assert subset.feature_name == ["a", "b"]
+    assert subset.num_feature() == 2
+
+    # A second get with the same inputs loads the saved binary
+    assert cache.get(X[["a", "b"]], y, "f" * 64).num_data() == 200
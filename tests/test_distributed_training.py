@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+
+from src.distributed_training import DistributedTrainer
+
+
+PARAMS = {"objective": "binary", "verbose": -1, "num_leaves": 15, "seed": 0, "deterministic": True}
+
+
+def make_data(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 5)), columns=[f"f{i}" for i in range(5)])
+    y = ((X["f0"] + 0.5 * X["f1"] - X["f2"] + rng.normal(scale=0.5, size=n)) > 0).astype(int)
+    return X, y
+
+
+def test_two_local_workers_match_single_node_training():
+    X, y = make_data()
+    booster = DistributedTrainer(num_workers=2, num_threads=1, time_out=1).train(
+        PARAMS, X, y, num_boost_round=20, feature_names=list(X.columns))
+    single = lgb.train({**PARAMS, "num_threads": 1}, lgb.Dataset(X, label=y), num_boost_round=20)
+
+    assert booster.current_iteration() == single.current_iteration() == 20
+    distributed_proba, single_proba = booster.predict(X), single.predict(X)
+    # Only the bin boundaries differ between the shards and the full data
+    assert np.mean(np.abs(distributed_proba - single_proba)) < 0.02
+    assert np.mean((distributed_proba > 0.5) == (single_proba > 0.5)) > 0.98
+
+
+def test_worker_failure_is_reported():
+    X, y = make_data(200)
+    try:
+        DistributedTrainer(num_workers=2, num_threads=1, time_out=1).train(
+            {**PARAMS, "objective": "not_an_objective"}, X, y, num_boost_round=5, feature_names=list(X.columns))
+    except Exception as e:
+        assert "Failed to train the model on distributed workers" in str(e)
+    else:
+        raise AssertionError("Training with an invalid objective should fail")
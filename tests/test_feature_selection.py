@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_selection import METHODS, FeatureRanker
+
+
+def make_frame(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 6)), columns=[f"f{i}" for i in range(6)])
+    # f0 and f1 carry the signal, the rest is noise
+    y = pd.Series((2 * X["f0"] + X["f1"] + rng.normal(scale=0.5, size=n) > 0).astype(int))
+    return X, y
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_same_seed_selects_the_same_features(method):
+    X, y = make_frame()
+    config = {"method": method, "sample_rows": 300, "n_estimators": 30, "n_jobs": 2,
+              "cache_ranking": False, "random_state": 7}
+
+    first = FeatureRanker(config).rank(X, y)
+    second = FeatureRanker(config).rank(X, y)
+
+    pd.testing.assert_series_equal(first, second)
+    assert list(first.index[:2]) == list(second.index[:2])
+    assert set(first.index[:2]) == {"f0", "f1"}
+
+
+def test_cached_ranking_selects_the_same_features(tmp_path):
+    X, y = make_frame()
+    config = {"method": "subsampled_forest", "sample_rows": 300, "n_estimators": 30, "random_state": 7}
+    cache_path = str(tmp_path / "feature_ranking.json")
+
+    computed = FeatureRanker(config, cache_path).rank(X, y)
+    cached = FeatureRanker(config, cache_path).rank(X, y)
+    assert list(cached.index) == list(computed.index)
+    np.testing.assert_allclose(cached.to_numpy(), computed.to_numpy())
+
+
+def test_stability_report_compares_with_the_reference_forest():
+    X, y = make_frame()
+    ranker = FeatureRanker({"method": "lightgbm_gain", "n_estimators": 30, "cache_ranking": False,
+                            "random_state": 7})
+    ranking = ranker.rank(X, y)
+
+    report = ranker.stability_report(ranking, X, y, top_k=2)
+    assert report["top_k_overlap"] == 1.0
+    assert -1.0 <= report["spearman"] <= 1.0
+    assert report["spearman"] > 0
+    assert report["reference_seconds"] > 0
+
+    # A ranking with the importances reversed disagrees with the reference
+    reversed_ranking = pd.Series(ranking.to_numpy()[::-1], index=ranking.index).sort_values(ascending=False)
+    reversed_report = ranker.stability_report(reversed_ranking, X, y, top_k=2)
+    assert reversed_report["top_k_overlap"] == 0.0
+    assert reversed_report["spearman"] < 0
@@ -0,0 +1,94 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.instrumentation import (StageMetrics, current_stage, instrument, recorded_stages,
+                                 stage_metrics_for_mlflow, track_stage)
+
+
+class Stage:
+
+    @instrument()
+    def filter_rows(self, df):
+        return df[df["x"] > 0]
+
+    @instrument("split")
+    def split(self, df):
+        return df.iloc[:3], df.iloc[3:]
+
+
+def test_instrument_records_rows_times_and_memory():
+    start = len(recorded_stages())
+    df = pd.DataFrame({"x": np.arange(-5, 5)})
+
+    Stage().filter_rows(df)
+    Stage().split(df)
+
+    records = recorded_stages(start)
+    assert [record.name for record in records] == ["Stage.filter_rows", "split"]
+    assert (records[0].rows_in, records[0].rows_out) == (10, 4)
+    # A tuple result reports the rows of its first item
+    assert (records[1].rows_in, records[1].rows_out) == (10, 3)
+    for record in records:
+        assert record.status == "ok"
+        assert record.wall_s >= 0 and record.cpu_s >= 0
+        assert record.peak_rss_mb > 0
+
+
+def test_failed_stage_is_recorded_with_error_status():
+    start = len(recorded_stages())
+    with pytest.raises(ValueError):
+        with track_stage("failing", rows_in=5):
+            raise ValueError("boom")
+
+    (record,) = recorded_stages(start)
+    assert (record.name, record.status, record.rows_in) == ("failing", "error", 5)
+    assert record.wall_s is not None
+
+
+def test_nested_stages_report_through_current_stage():
+    start = len(recorded_stages())
+    assert current_stage() is None
+    with track_stage("outer") as outer:
+        with track_stage("chunked_read") as inner:
+            assert current_stage() is inner
+            current_stage().rows_out = 42
+        assert current_stage() is outer
+    assert current_stage() is None
+
+    records = recorded_stages(start)
+    assert [record.name for record in records] == ["chunked_read", "outer"]
+    assert records[0].rows_out == 42
+
+
+def test_stage_metrics_line_is_logged(caplog):
+    with caplog.at_level(logging.INFO, logger="src.instrumentation"):
+        with track_stage("logged", rows_in=2) as metrics:
+            metrics.rows_out = 1
+
+    lines = [json.loads(record.getMessage()) for record in caplog.records
+             if record.name == "src.instrumentation"]
+    assert lines[-1]["event"] == "stage_metrics"
+    assert (lines[-1]["stage"], lines[-1]["rows_in"], lines[-1]["rows_out"]) == ("logged", 2, 1)
+
+
+def make_record(name, wall_s, rows_out, peak):
+    record = StageMetrics(name, rows_in=rows_out)
+    record.wall_s, record.cpu_s, record.rows_out = wall_s, wall_s, rows_out
+    record.peak_rss_mb, record.peak_rss_delta_mb = peak, peak / 10
+    return record
+
+
+def test_repeated_stages_are_aggregated_for_mlflow():
+    metrics = stage_metrics_for_mlflow([make_record("load", 1.0, 10, 100.0),
+                                        make_record("load", 2.0, 5, 300.0),
+                                        make_record("train", 4.0, 8, 200.0)])
+    assert metrics["load.wall_s"] == 3.0
+    assert metrics["load.rows_out"] == 15
+    assert metrics["load.peak_rss_mb"] == 300.0
+    assert metrics["load.peak_rss_delta_mb"] == 30.0
+    assert metrics["train.cpu_s"] == 4.0
+    assert all(isinstance(value, (int, float)) for value in metrics.values())
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from src.lgbm_estimators import EarlyStoppingLGBMClassifier
+
+
+def make_data(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+    y = (X["a"] + 0.5 * X["b"] + rng.normal(scale=0.8, size=n) > 0).astype(int)
+    return X, y
+
+
+def test_early_stopping_settings_stay_out_of_booster_params():
+    X, y = make_data()
+    # dart skips early stopping; LightGBM must not see early_stopping_rounds as its own alias
+    model = EarlyStoppingLGBMClassifier(early_stopping_rounds=5, boosting_type="dart",
+                                        n_estimators=10, verbose=-1).fit(X, y)
+    assert "early_stopping_rounds" not in model.booster_.params
+    assert model.booster_.num_trees() == 10
+
+
+def test_fit_full_refits_on_all_rows_with_early_stopped_tree_count():
+    X, y = make_data()
+    model = EarlyStoppingLGBMClassifier(early_stopping_rounds=5, n_estimators=500, learning_rate=0.3,
+                                        random_state=0, verbose=-1)
+    rounds = model.early_stopped_rounds(X, y)
+    assert 0 < rounds < 500
+
+    model.fit_full(X, y)
+    assert model.n_estimators == rounds
+    assert model.booster_.num_trees() == rounds
+    # No validation split was held out, so the fit saw every row
+    assert model.evals_result_ == {}
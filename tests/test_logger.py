@@ -0,0 +1,73 @@
+import os
+import time
+import queue
+import logging
+import multiprocessing
+
+from src.logger import BlockingStopQueueListener, SizeAndTimeRotatingFileHandler, init_worker_logging
+
+
+class SlowHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        time.sleep(0.05)
+        self.messages.append(record.getMessage())
+
+
+def test_listener_stop_waits_for_room_in_a_full_queue():
+    log_queue = queue.Queue(maxsize=2)
+    handler = SlowHandler()
+    listener = BlockingStopQueueListener(log_queue, handler)
+    listener.start()
+    for i in range(2):
+        log_queue.put(logging.makeLogRecord({"msg": f"record {i}"}))
+
+    # The stock listener would raise queue.Full here
+    listener.stop()
+    assert handler.messages == ["record 0", "record 1"]
+
+
+def log_from_worker(log_queue):
+    init_worker_logging(log_queue)
+    root = logging.getLogger()
+    assert not any(isinstance(h, logging.FileHandler) for h in root.handlers)
+    logging.getLogger("src.worker").info("hello from the worker")
+
+
+def test_worker_records_are_forwarded_to_the_parent():
+    context = multiprocessing.get_context("spawn")
+    log_queue = context.Queue()
+    worker = context.Process(target=log_from_worker, args=(log_queue,))
+    worker.start()
+    record = log_queue.get(timeout=30)
+    worker.join(timeout=30)
+
+    assert worker.exitcode == 0
+    assert record.name == "src.worker"
+    assert record.getMessage() == "hello from the worker"
+
+
+def test_time_rollover_is_due_from_the_existing_file_mtime(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("written two hours ago\n")
+    two_hours_ago = time.time() - 7200
+    os.utime(path, (two_hours_ago, two_hours_ago))
+
+    # A restarted process rotates the overdue file on its first record
+    handler = SizeAndTimeRotatingFileHandler(str(path), interval_seconds=3600)
+    handler.emit(logging.makeLogRecord({"msg": "after restart"}))
+    handler.close()
+
+    assert (tmp_path / "app.log.1").read_text() == "written two hours ago\n"
+    assert path.read_text() == "after restart\n"
+    assert handler.rollover_at > time.time() + 3500
+
+
+def test_time_rollover_starts_now_for_a_new_file(tmp_path):
+    handler = SizeAndTimeRotatingFileHandler(str(tmp_path / "app.log"), interval_seconds=3600)
+    assert abs(handler.rollover_at - (time.time() + 3600)) < 5
+    handler.close()
@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.micro_batcher import MicroBatcher
+
+
+def make_rows(n=40):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "lead_time": rng.integers(0, 300, size=n).astype("int16"),
+        "avg_price": rng.normal(100, 20, size=n).astype("float32"),
+        "room_type": pd.Categorical(rng.choice(["a", "b", "c"], size=n)),
+    })
+
+
+def test_coalesced_batch_matches_per_row_predictions():
+    X = make_rows(200)
+    y = ((X["lead_time"] > 150) | (X["room_type"] == "c")).astype(int)
+    model = lgb.LGBMClassifier(n_estimators=20, verbose=-1).fit(X, y)
+
+    rows = [X.iloc[[i]] for i in range(40)]
+    batcher = MicroBatcher(model.predict_proba, max_batch_size=16, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(row) for row in rows]
+        batched = np.vstack([future.result(timeout=5) for future in futures])
+    finally:
+        batcher.stop()
+
+    expected = np.vstack([model.predict_proba(row) for row in rows])
+    np.testing.assert_allclose(batched, expected)
+    # Rows were actually coalesced, with the categorical column intact
+    assert batcher.stats()["batches"] < len(rows)
+
+
+def test_futures_resolve_in_submission_order():
+    seen = []
+
+    def predict(frame):
+        seen.append(len(frame))
+        return frame["lead_time"].to_numpy()
+
+    rows = make_rows(30)
+    batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=20)
+    try:
+        futures = [batcher.submit(rows.iloc[[i]]) for i in range(len(rows))]
+        results = [future.result(timeout=5)[0] for future in futures]
+    finally:
+        batcher.stop()
+
+    assert results == rows["lead_time"].tolist()
+    assert max(seen) <= 8
+
+
+def test_stats_count_requests_batches_and_errors():
+    calls = {"n": 0}
+
+    def predict(frame):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise ValueError("bad batch")
+        return np.zeros(len(frame))
+
+    rows = make_rows(3)
+    batcher = MicroBatcher(predict, max_batch_size=4, max_wait_ms=1)
+    try:
+        assert batcher.predict(rows.iloc[[0]], timeout=5).tolist() == [0.0]
+        with pytest.raises(ValueError, match="bad batch"):
+            batcher.predict(rows.iloc[[1]], timeout=5)
+        batcher.predict(rows.iloc[[2]], timeout=5)
+        stats = batcher.stats()
+    finally:
+        batcher.stop()
+
+    assert stats["requests"] == 3
+    assert stats["batches"] == 3
+    assert stats["errors"] == 1
+    assert stats["batch_size_distribution"] == {1: 3}
+    assert stats["mean_batch_size"] == 1
+    assert stats["added_latency_ms"]["p50"] is not None
+
+
+def test_predict_times_out_while_the_batch_is_still_running():
+    release = threading.Event()
+
+    def slow_predict(frame):
+        release.wait(5)
+        return np.ones(len(frame))
+
+    batcher = MicroBatcher(slow_predict, max_batch_size=1, max_wait_ms=1)
+    try:
+        future = batcher.submit(make_rows(1))
+        with pytest.raises(TimeoutError):
+            future.result(timeout=0.05)
+        release.set()
+        # The request is still answered once the model returns
+        assert future.result(timeout=5).tolist() == [1.0]
+    finally:
+        release.set()
+        batcher.stop()
+
+
+def test_stopped_batcher_predicts_inline():
+    batcher = MicroBatcher(lambda frame: np.full(len(frame), 7.0))
+    batcher.stop()
+    started = time.monotonic()
+    assert batcher.predict(make_rows(1), timeout=1).tolist() == [7.0]
+    assert time.monotonic() - started < 1
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+from mlflow.tracking import MlflowClient
+
+from src.custom_exception import CustomException
+from src.mlflow_logger import MAX_PARAMS_PER_BATCH, MlflowRunLogger
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    client = MlflowClient(tracking_uri=f"file:{tmp_path / 'mlruns'}")
+    client.create_experiment("tests")
+    return client
+
+
+def new_run(client):
+    return client.create_run(client.get_experiment_by_name("tests").experiment_id).info.run_id
+
+
+def run_artifacts(client, run_id, path):
+    return [os.path.basename(info.path) for info in client.list_artifacts(run_id, path)]
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / "train.csv"
+    path.write_text("a,b\n1,2\n")
+    return str(path)
+
+
+def test_buffered_values_are_sent_in_few_batches(client, monkeypatch):
+    calls = []
+    log_batch = client.log_batch
+    monkeypatch.setattr(client, "log_batch", lambda *args, **kwargs: calls.append(kwargs) or log_batch(*args, **kwargs))
+
+    run_id = new_run(client)
+    with MlflowRunLogger(run_id, client=client) as tracker:
+        tracker.log_params({f"p{i}": i for i in range(MAX_PARAMS_PER_BATCH + 20)})
+        tracker.log_metrics({"f1": 0.5})
+        tracker.log_metrics({"f1": 0.75, "accuracy": 0.8})  # Later values replace buffered ones
+        tracker.set_tags({"training_outcome": "trained"})
+        assert calls == []  # Nothing is sent until the logger is closed
+
+    # 120 params need two calls; metrics and tags ride along with the first
+    assert [len(call["params"]) for call in calls] == [MAX_PARAMS_PER_BATCH, 20]
+    data = client.get_run(run_id).data
+    assert len(data.params) == MAX_PARAMS_PER_BATCH + 20
+    assert data.metrics == {"f1": 0.75, "accuracy": 0.8}
+    assert data.tags["training_outcome"] == "trained"
+
+
+@pytest.mark.parametrize("background", [True, False])
+def test_unchanged_dataset_is_referenced_instead_of_uploaded(client, dataset, background):
+    first = new_run(client)
+    with MlflowRunLogger(first, background=background, client=client) as tracker:
+        tracker.log_dataset(dataset, "train")
+    assert run_artifacts(client, first, "datasets") == ["train.csv"]
+    first_tags = client.get_run(first).data.tags
+
+    second = new_run(client)
+    with MlflowRunLogger(second, background=background, client=client) as tracker:
+        tracker.log_dataset(dataset, "train")
+    second_tags = client.get_run(second).data.tags
+
+    assert run_artifacts(client, second, "datasets") == []
+    assert second_tags["dataset_train_sha256"] == first_tags["dataset_train_sha256"]
+    assert second_tags["dataset_train_uri"] == first_tags["dataset_train_uri"]
+
+    # Changed content is uploaded again
+    with open(dataset, "a") as f:
+        f.write("3,4\n")
+    third = new_run(client)
+    with MlflowRunLogger(third, background=background, client=client) as tracker:
+        tracker.log_dataset(dataset, "train")
+    assert run_artifacts(client, third, "datasets") == ["train.csv"]
+
+
+def test_dedupe_can_be_disabled(client, dataset):
+    for _ in range(2):
+        run_id = new_run(client)
+        with MlflowRunLogger(run_id, dedupe_datasets=False, client=client) as tracker:
+            tracker.log_dataset(dataset, "train")
+        assert run_artifacts(client, run_id, "datasets") == ["train.csv"]
+
+
+def test_failed_background_upload_is_raised_on_close(client, tmp_path):
+    run_id = new_run(client)
+    tracker = MlflowRunLogger(run_id, client=client)
+    tracker.log_artifact(str(tmp_path / "missing.pkl"))
+    tracker.log_metrics({"f1": 0.5})
+    with pytest.raises(CustomException, match="1 MLflow logging call"):
+        tracker.close()
+    # The buffered metrics were still sent
+    assert client.get_run(run_id).data.metrics == {"f1": 0.5}
@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import threading
+
+import joblib
+import pytest
+
+from src.custom_exception import CustomException
+from src.model_holder import ModelHolder
+from src.reservation_transformer import ReservationTransformer
+
+
+# Write one model version the way training does: artifacts first, the version file last and atomically
+def publish(paths, version, bump=0):
+    joblib.dump({"version": version}, paths["model"])
+    transformer = ReservationTransformer([], [], 5).set_selected_features([version])
+    transformer.save(paths["preprocessor"])
+
+    tmp_path = paths["version"] + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": version, "model_path": paths["model"]}, f)
+    os.replace(tmp_path, paths["version"])
+    # Distinct mtimes even on filesystems with coarse timestamps
+    mtime_ns = time.time_ns() + bump * 10**9
+    os.utime(paths["version"], ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {"model": str(tmp_path / "model.pkl"), "preprocessor": str(tmp_path / "preprocessor.pkl"),
+            "trees": str(tmp_path / "trees.npz"), "version": str(tmp_path / "model_version.json")}
+
+
+def make_holder(paths, poll_interval=0.02):
+    return ModelHolder(paths["model"], paths["preprocessor"], paths["trees"], paths["version"],
+                       poll_interval=poll_interval)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_replacing_the_version_file_reloads_the_model(paths):
+    publish(paths, "v1")
+    holder = make_holder(paths).start()
+    try:
+        assert wait_for(lambda: holder.is_loaded())
+        old = holder.get()
+        assert old.version == "v1"
+
+        publish(paths, "v2", bump=1)
+        assert wait_for(lambda: holder.get().version == "v2")
+        new = holder.get()
+        assert new.model == {"version": "v2"}
+        assert new.transformer.selected_features == ["v2"]
+        # Requests still holding the old bundle keep a consistent view
+        assert old.model == {"version": "v1"}
+    finally:
+        holder.stop()
+
+
+def test_concurrent_readers_see_complete_bundles(paths):
+    publish(paths, "v0")
+    holder = make_holder(paths)
+    holder.get()
+
+    stop = threading.Event()
+    seen, mismatches = set(), []
+
+    def read():
+        while not stop.is_set():
+            bundle = holder.get()
+            versions = (bundle.version, bundle.model["version"], bundle.transformer.selected_features[0])
+            if len(set(versions)) != 1:
+                mismatches.append(versions)
+            seen.add(bundle.version)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(1, 20):
+            publish(paths, f"v{i}", bump=i)
+            holder.reload()
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert mismatches == []
+    assert len(seen) > 1
+    assert holder.get().version == "v19"
+
+
+def test_corrupt_new_artifact_keeps_the_old_bundle_serving(paths):
+    publish(paths, "v1")
+    holder = make_holder(paths)
+    old = holder.get()
+
+    # A new version whose model file is truncated
+    publish(paths, "v2", bump=1)
+    with open(paths["model"], "wb") as f:
+        f.write(b"not a pickle")
+
+    with pytest.raises(CustomException):
+        holder.reload()
+    assert holder.get() is old
+    assert holder.last_error
+
+    # The watcher keeps serving the old bundle and retries until the artifact is fixed
+    holder.start()
+    try:
+        time.sleep(0.1)
+        assert holder.get() is old
+        publish(paths, "v3", bump=2)
+        assert wait_for(lambda: holder.get().version == "v3")
+        assert holder.last_error is None
+    finally:
+        holder.stop()
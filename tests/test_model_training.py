@@ -0,0 +1,60 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+
+from src.model_training import ModelTraining
+
+
+def test_continued_model_reports_its_total_tree_count(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 3)), columns=["a", "b", "c"])
+    y = (X["a"] + rng.normal(scale=0.5, size=300) > 0).astype(int)
+    previous = lgb.LGBMClassifier(n_estimators=10, verbose=-1).fit(X, y)
+
+    trainer = ModelTraining("train.parquet", "test.parquet", str(tmp_path / "model.pkl"))
+    trainer.incremental_params = {**trainer.incremental_params, "extra_rounds": 5}
+    model = trainer.continue_training(previous, X, y)
+
+    assert model.booster_.current_iteration() == 15
+    assert model.get_params()["n_estimators"] == 15
+    # The previous model is left untouched
+    assert previous.get_params()["n_estimators"] == 10
+
+
+def test_save_model_replaces_the_file_atomically(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(b"previous model")
+    trainer = ModelTraining("train.parquet", "test.parquet", str(path))
+    trainer.save_model({"trees": 3})
+
+    assert joblib.load(path) == {"trees": 3}
+    assert os.listdir(tmp_path) == ["model.pkl"]
+
+
+def test_kept_model_is_recorded_in_the_version_file(tmp_path, monkeypatch):
+    import json
+    import src.model_training as model_training
+
+    version_path = tmp_path / "model_version.json"
+    monkeypatch.setattr(model_training, "MODEL_VERSION_PATH", str(version_path))
+    path = tmp_path / "model.pkl"
+    joblib.dump({"trees": 3}, path)
+    trainer = ModelTraining("train.parquet", "test.parquet", str(path))
+
+    trainer.write_model_version({"f1": 0.8}, outcome="trained")
+    trained = json.loads(version_path.read_text())
+    model_mtime = os.path.getmtime(path)
+
+    trainer.write_model_version({"f1": 0.81}, outcome="kept")
+    kept = json.loads(version_path.read_text())
+
+    assert kept["training_outcome"] == "kept"
+    assert kept["version"] == trained["version"]
+    assert kept["created_at"] == trained["created_at"]
+    assert kept["metrics"] == {"f1": 0.81}
+    # The model file itself is never touched
+    assert os.path.getmtime(path) == model_mtime
+    assert sorted(os.listdir(tmp_path)) == ["model.pkl", "model_version.json"]
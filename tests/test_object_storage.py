@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from src.custom_exception import CustomException
+from src.object_storage import ChunkedDownloader, LocalBucketBackend, file_md5_base64, make_backend
+
+
+CHUNK = 1024
+
+
+# Local bucket that records which byte ranges were read and can fail on one of them
+class RecordingBackend(LocalBucketBackend):
+
+    def __init__(self, root, fail_at=None):
+        super().__init__(root)
+        self.fail_at = fail_at
+        self.reads = []
+
+    def read_range(self, name, start, end, generation=None):
+        if start == self.fail_at:
+            raise IOError("connection dropped")
+        self.reads.append(start)
+        return super().read_range(name, start, end, generation)
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    root = tmp_path / "bucket"
+    root.mkdir()
+    (root / "obj.csv").write_bytes(os.urandom(10 * CHUNK + 100))
+    return root
+
+
+def test_local_backend_stats_and_reads_byte_ranges(bucket):
+    backend = make_backend({"backend": "local", "local_bucket_dir": str(bucket)})
+    data = (bucket / "obj.csv").read_bytes()
+
+    remote = backend.stat("obj.csv")
+    assert remote["size"] == len(data)
+    assert remote["md5_hash"] == file_md5_base64(str(bucket / "obj.csv"))
+    assert backend.read_range("obj.csv", 10, 20) == data[10:20]
+    assert backend.stat("missing.csv") is None
+
+
+def test_interrupted_download_resumes_from_recorded_chunks(bucket, tmp_path):
+    dest, manifest = str(tmp_path / "raw.csv"), str(tmp_path / "raw_manifest.json")
+
+    failing = RecordingBackend(str(bucket), fail_at=5 * CHUNK)
+    with pytest.raises(CustomException):
+        ChunkedDownloader(failing, chunk_size=CHUNK, max_workers=1).download("obj.csv", dest, manifest)
+    assert not os.path.exists(dest)
+    assert os.path.exists(dest + ".part") and os.path.exists(dest + ".part.json")
+
+    resumed = RecordingBackend(str(bucket))
+    assert ChunkedDownloader(resumed, chunk_size=CHUNK, max_workers=1).download("obj.csv", dest, manifest)
+    # Only the chunks that were not recorded as done are fetched again
+    assert 0 not in resumed.reads and 5 * CHUNK in resumed.reads
+    assert open(dest, "rb").read() == (bucket / "obj.csv").read_bytes()
+    assert not os.path.exists(dest + ".part") and not os.path.exists(dest + ".part.json")
+
+
+def test_unchanged_object_is_skipped_and_changed_object_downloaded(bucket, tmp_path):
+    dest, manifest = str(tmp_path / "raw.csv"), str(tmp_path / "raw_manifest.json")
+    backend = RecordingBackend(str(bucket))
+    downloader = ChunkedDownloader(backend, chunk_size=CHUNK)
+
+    assert downloader.download("obj.csv", dest, manifest)
+    backend.reads.clear()
+    assert not downloader.download("obj.csv", dest, manifest)
+    assert backend.reads == []
+
+    (bucket / "obj.csv").write_bytes(b"new contents")
+    assert downloader.download("obj.csv", dest, manifest)
+    assert open(dest, "rb").read() == b"new contents"
+
+
+def test_fixture_bucket_holds_the_configured_object():
+    from utils.common_functions import read_yaml
+    from config.paths_config import CONFIG_PATH
+
+    ingestion = read_yaml(CONFIG_PATH)["data_ingestion"]
+    backend = make_backend({**ingestion, "backend": "local"})
+    assert backend.stat(ingestion["bucket_file_name"]) is not None
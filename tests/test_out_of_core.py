@@ -0,0 +1,78 @@
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.model_training import ModelTraining
+from src.out_of_core import ChunkedFileSequence
+
+
+def make_frame(n=250, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "lead_time": rng.integers(0, 300, n),
+        "avg_price_per_room": rng.uniform(50, 200, n),
+        "no_of_special_requests": rng.integers(0, 4, n),
+    })
+    df["booking_status"] = (df["lead_time"] + rng.normal(0, 60, n) < 150).astype(int)
+    return df
+
+
+def write(df, path):
+    if str(path).endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("name", ["train.csv", "train.parquet"])
+def test_sequence_reads_rows_across_chunks(tmp_path, name):
+    df = make_frame()
+    features = df.drop(columns="booking_status").to_numpy(dtype=np.float64)
+    sequence = ChunkedFileSequence(write(df, tmp_path / name), "booking_status", chunk_size=40)
+
+    assert len(sequence) == 250
+    assert sequence.shape == (250, 3)
+    assert sequence.feature_names == ["lead_time", "avg_price_per_room", "no_of_special_requests"]
+    np.testing.assert_array_equal(sequence.labels, df["booking_status"].to_numpy())
+
+    np.testing.assert_allclose(sequence[5], features[5])
+    # A slice spanning three chunks, then a read backwards that restarts from the top
+    np.testing.assert_allclose(sequence[30:125], features[30:125])
+    np.testing.assert_allclose(sequence[[0, 39, 40, 249]], features[[0, 39, 40, 249]])
+    np.testing.assert_allclose(sequence[249:300], features[249:])
+    with pytest.raises(IndexError):
+        sequence._rows(250, 251)
+
+
+def test_dataset_from_chunks_trains_the_same_model(tmp_path):
+    df = make_frame(600)
+    X, y = df.drop(columns="booking_status"), df["booking_status"]
+    sequence = ChunkedFileSequence(write(df, tmp_path / "train.parquet"), "booking_status", chunk_size=128)
+
+    params = {"objective": "binary", "num_leaves": 8, "verbose": -1, "deterministic": True,
+              "num_threads": 1, "seed": 1}
+    in_memory = lgb.train(params, lgb.Dataset(X.to_numpy(dtype=np.float64), y.to_numpy()), num_boost_round=20)
+    chunked = lgb.train(params, lgb.Dataset(sequence, sequence.labels), num_boost_round=20)
+
+    np.testing.assert_allclose(chunked.predict(X.to_numpy(dtype=np.float64)),
+                               in_memory.predict(X.to_numpy(dtype=np.float64)))
+
+
+def test_chunked_evaluation_matches_in_memory_metrics(tmp_path):
+    train, test = make_frame(400), make_frame(230, seed=1)
+    model = lgb.LGBMClassifier(n_estimators=15, verbose=-1).fit(train.drop(columns="booking_status"),
+                                                               train["booking_status"])
+
+    trainer = ModelTraining("train.parquet", write(test, tmp_path / "test.parquet"), str(tmp_path / "model.pkl"))
+    trainer.out_of_core_params = {**trainer.out_of_core_params, "chunk_size": 50}
+
+    chunked, sample = trainer.evaluate_model_chunked(model)
+    expected = trainer.evaluate_model(model, test.drop(columns="booking_status"), test["booking_status"])
+
+    assert chunked.keys() == expected.keys()
+    for key in expected:
+        assert chunked[key] == pytest.approx(expected[key])
+    # The parity sample is the first chunk only
+    assert len(sample) == 50
@@ -0,0 +1,73 @@
+import joblib
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+from src.reservation_transformer import ReservationTransformer
+
+
+def make_raw(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    lead_time = rng.integers(0, 400, n)
+    price = rng.gamma(2.0, 50.0, n)
+    return pd.DataFrame({
+        "Booking_ID": [f"INN{i:05d}" for i in range(n)],
+        "lead_time": lead_time,
+        "no_of_special_requests": rng.integers(0, 5, n),
+        "avg_price_per_room": price,
+        "market_segment_type": rng.choice(["Aviation", "Offline", "Online"], n),
+        "booking_status": np.where(lead_time + rng.normal(0, 80, n) > 150, "Canceled", "Not_Canceled"),
+    })
+
+
+def make_transformer(downcast):
+    return ReservationTransformer(["market_segment_type", "booking_status"],
+                                  ["lead_time", "no_of_special_requests", "avg_price_per_room"], 1.0,
+                                  downcast=downcast)
+
+
+def test_downcast_dtypes_keep_predictions(tmp_path):
+    raw, serving = make_raw(), make_raw(200, seed=1)
+    compact = make_transformer(downcast=True)
+    full = make_transformer(downcast=False)
+
+    train = compact.fit_transform(raw)
+    full.fit(raw)
+    assert train["lead_time"].dtype == np.int16
+    assert train["no_of_special_requests"].dtype == np.int8
+    assert train["avg_price_per_room"].dtype == np.float32
+    assert full.transform(raw)["avg_price_per_room"].dtype == np.float64
+
+    features = [col for col in train.columns if col != "booking_status"]
+    model = lgb.LGBMClassifier(n_estimators=30, verbose=-1).fit(train[features], train["booking_status"])
+
+    # Serving rows through the compact transformer score like the full-precision ones
+    compact_proba = model.predict_proba(compact.transform(serving)[features])
+    full_proba = model.predict_proba(full.transform(serving)[features])
+    np.testing.assert_allclose(compact_proba, full_proba, atol=1e-4)
+
+
+def test_out_of_range_serving_values_keep_their_dtype():
+    transformer = make_transformer(downcast=True).fit(make_raw())
+    row = make_raw(1).assign(no_of_special_requests=1000)
+    transformed = transformer.transform(row)
+    assert transformed["no_of_special_requests"].iloc[0] == 1000
+    assert transformed["lead_time"].dtype == np.int16
+
+
+def test_pickle_without_column_dtypes_still_loads(tmp_path):
+    transformer = make_transformer(downcast=True).fit(make_raw())
+    expected = transformer.transform(make_raw(50, seed=2))
+
+    # Transformers pickled before column_dtypes existed have no such attribute
+    del transformer.column_dtypes
+    path = str(tmp_path / "old_transformer.pkl")
+    joblib.dump(transformer, path)
+
+    loaded = ReservationTransformer.load(path)
+    assert not hasattr(loaded, "column_dtypes")
+    transformed = loaded.transform(make_raw(50, seed=2))
+    # Same values, in the dtypes the old model was trained on (no downcasting)
+    pd.testing.assert_frame_equal(transformed, expected, check_dtype=False)
+    assert transformed["lead_time"].dtype == np.int64
+    assert transformed["avg_price_per_room"].dtype == np.float64
@@ -0,0 +1,44 @@
+import os
+import time
+
+from src.stage_cache import StageCache
+
+
+def test_hash_memo_drops_missing_and_modified_files(tmp_path):
+    cache = StageCache(str(tmp_path / "cache"))
+    kept, changed, removed = (tmp_path / name for name in ("kept.txt", "changed.txt", "removed.txt"))
+    for path in (kept, changed, removed):
+        path.write_text("v1")
+        cache.hash_file(str(path))
+
+    changed.write_text("version 2")
+    os.utime(changed, ns=(time.time_ns(), time.time_ns() + 10**9))
+    removed.unlink()
+    cache.hash_file(str(changed))
+
+    cache.record("stage", "fp", [str(kept)])
+
+    memo = StageCache(str(tmp_path / "cache"))._hash_memo
+    paths = sorted(os.path.basename(key.rsplit(":", 2)[0]) for key in memo)
+    assert paths == ["changed.txt", "kept.txt"]
+
+
+def test_kept_outputs_only_need_to_exist(tmp_path):
+    cache = StageCache(str(tmp_path / "cache"))
+    model, version = tmp_path / "model.pkl", tmp_path / "model_version.json"
+    model.write_text("previous model")
+    os.utime(model, (time.time() - 60, time.time() - 60))
+    started_at = time.time()
+    version.write_text('{"training_outcome": "kept"}')
+
+    # Every output must be rewritten by default, so the old model file is stale
+    cache.complete("training", "fp", [str(model), str(version)], started_at)
+    assert not cache.is_fresh("training", "fp")
+
+    cache.complete("training", "fp", [str(model), str(version)], started_at, rewritten=[str(version)])
+    assert cache.is_fresh("training", "fp")
+
+    # Outputs that may be kept still have to exist
+    model.unlink()
+    cache.complete("training", "fp", [str(model), str(version)], started_at, rewritten=[str(version)])
+    assert not cache.is_fresh("training", "fp")
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+
+from src.tree_engine import TreeEnsemble
+
+
+def fit_model(zero_as_missing=False, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(500, 4)), columns=["a", "b", "c", "d"])
+    # Missing values and exact zeros in training give splits with NaN and Zero missing types
+    X.loc[rng.random(500) < 0.15, "a"] = np.nan
+    X.loc[rng.random(500) < 0.15, "b"] = 0.0
+    y = ((X["a"].fillna(1.0) + X["b"] - 0.5 * X["c"]) > 0).astype(int)
+    model = lgb.LGBMClassifier(n_estimators=30, num_leaves=15, zero_as_missing=zero_as_missing,
+                               random_state=seed, verbose=-1)
+    return model.fit(X, y), X.columns
+
+
+def check_rows(model, columns, tmp_path):
+    rng = np.random.default_rng(1)
+    rows = pd.DataFrame(rng.normal(size=(300, len(columns))), columns=columns)
+    rows.iloc[:50] = np.nan
+    rows.iloc[50:100] = 0.0
+    rows.iloc[100:150, 0] = np.nan
+    rows.iloc[150:200, 1] = 0.0
+
+    engine = TreeEnsemble.from_lgbm(model)
+    np.testing.assert_allclose(engine.predict_proba(rows), model.predict_proba(rows), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(engine.predict(rows), model.predict(rows))
+
+    # Same results after a save/load round trip
+    path = str(tmp_path / "trees.npz")
+    engine.save(path)
+    np.testing.assert_allclose(TreeEnsemble.load(path).predict_proba(rows), model.predict_proba(rows),
+                               rtol=0, atol=1e-12)
+
+
+def test_predict_proba_matches_lightgbm_on_nan_zero_and_random_rows(tmp_path):
+    model, columns = fit_model()
+    check_rows(model, columns, tmp_path)
+
+
+def test_predict_proba_matches_lightgbm_with_zero_as_missing(tmp_path):
+    model, columns = fit_model(zero_as_missing=True)
+    check_rows(model, columns, tmp_path)
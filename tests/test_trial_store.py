@@ -0,0 +1,26 @@
+import math
+
+from src.trial_store import TrialStore, WarmStartSampler
+from scipy.stats import randint
+
+
+def test_non_finite_scores_are_skipped(tmp_path):
+    store = TrialStore(str(tmp_path / "trials.db"))
+    store.record("data", "space", [
+        {"params": {"num_leaves": 20}, "final": True, "score": float("nan")},
+        {"params": {"num_leaves": 30}, "final": True, "score": 0.8},
+    ])
+
+    trials = store.get_trials("space")
+    assert [t["params"] for t in trials] == [{"num_leaves": 30}]
+    assert store.best_trial("space", "data")["score"] == 0.8
+
+
+def test_sampler_proposes_candidates_around_finite_trials(tmp_path):
+    store = TrialStore(str(tmp_path / "trials.db"))
+    store.record("data", "space", [{"params": {"num_leaves": 30}, "final": True, "score": 0.8}])
+
+    sampler = WarmStartSampler(store, "data", "space", {"num_leaves": randint(20, 100)}, random_state=0)
+    candidates = sampler.propose(4)
+    assert candidates
+    assert all(not math.isnan(c["num_leaves"]) and c != {"num_leaves": 30} for c in candidates)
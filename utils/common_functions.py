@@ -1,9 +1,15 @@
 # Import necessary libraries
 import os  # For interacting with the file system
+import sys  # For extracting exception traceback
+import time  # For timing data loads
+import json  # For canonical serialization of fingerprinted objects
+import hashlib  # For content hashing of files and config sections
+import numpy as np  # For dtype ranges when applying the schema
 import pandas as pd  # For data manipulation (used in load_data function)
 from src.logger import get_logger  # Custom function to get a logger instance
 from src.custom_exception import CustomException  # Custom exception class for better error tracking
 import yaml  # For reading YAML configuration files
+from config.paths_config import ARTIFACT_EXTENSIONS, ARTIFACT_FORMAT  # Supported dataset formats
 
 # Initialize a logger for the current module
 logger = get_logger(__name__)
@@ -30,16 +36,261 @@ def read_yaml(fil_path):
         # Raise a custom exception with context
         raise CustomException("Failed to read YAML file")
 
-# Function to load data from a CSV file
-def load_data(path):
+# Function to compute the SHA-256 of a file's contents, streamed in blocks
+def file_fingerprint(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Function to compute a stable SHA-256 of any JSON-serializable object (e.g. a config section)
+def dict_fingerprint(obj):
+    payload = json.dumps(obj, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Function to infer the artifact format ("csv", "parquet" or "feather") from a file path
+def get_data_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in ARTIFACT_EXTENSIONS.items():
+        if ext == fmt_ext:
+            return fmt
+    # Unknown extensions fall back to the format configured in config.yaml
+    return ARTIFACT_FORMAT
+
+# Function to pick the CSV parser engine from the schema, falling back to the C parser
+def csv_engine(schema):
+    engine = (schema or {}).get("engine", "c")
+    if engine == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            logger.warning("pyarrow is not installed; using the C CSV parser")
+            return "c"
+    return engine
+
+# Function to build read_csv options (usecols and dtypes) from the schema section of config.yaml;
+# columns in keep_columns are read even when the schema skips them. Numeric columns are parsed
+# as 64-bit values of their declared kind: read_csv would silently wrap values that overflow a
+# narrow dtype, so the declared dtypes are applied afterwards by downcast_to_schema.
+def schema_read_options(path, schema, keep_columns=()):
+    header = pd.read_csv(path, nrows=0).columns
+    skip = set(schema.get("skip_columns") or []) - set(keep_columns)
+    usecols = [col for col in header if col not in skip]
+
+    dtype = {}
+    for col, dt in (schema.get("dtypes") or {}).items():
+        if col in usecols:
+            kind = np.dtype(dt).kind
+            dtype[col] = "int64" if kind in "iu" else "float64" if kind == "f" else dt
+    dtype.update({col: "category" for col in schema.get("categoricals") or [] if col in usecols})
+    return {"usecols": usecols, "dtype": dtype}
+
+# Function to cast columns to the dtypes declared in the schema, only where every value fits;
+# a column with out-of-range values (or missing values in an integer column) keeps its dtype
+def downcast_to_schema(df, schema):
+    casts = {}
+    for col, dt in (schema.get("dtypes") or {}).items():
+        if col not in df.columns or df[col].dtype == dt:
+            continue
+        target, values = np.dtype(dt), df[col]
+        if target.kind in "iu":
+            if not pd.api.types.is_integer_dtype(values):
+                continue
+            info = np.iinfo(target)
+        elif target.kind == "f":
+            info = np.finfo(target)
+            values = values[np.isfinite(values)]
+        else:
+            casts[col] = target
+            continue
+
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            logger.warning(f"Column '{col}' has values in [{values.min()}, {values.max()}] outside the "
+                           f"range of its schema dtype {dt}; keeping {df[col].dtype}")
+            continue
+        casts[col] = target
+    return df.astype(casts) if casts else df
+
+# Function to load data from a CSV, Parquet or Feather file; with a schema, skipped columns
+# are never materialized and CSV columns are parsed straight into their declared dtypes
+def load_data(path, memory_map=True, schema=None):
     try:
         # Log that data loading has started
-        logger.info("Loading data")
-        # Read the CSV file into a pandas DataFrame and return it
-        return pd.read_csv(path)
+        logger.info(f"Loading data from {path}")
+        fmt = get_data_format(path)
+        start = time.perf_counter()
+
+        if fmt in ("parquet", "feather"):
+            if fmt == "parquet":
+                import pyarrow.parquet as pq
+                # Memory-map the file so column buffers are read straight from the page cache
+                table = pq.read_table(path, memory_map=memory_map)
+            else:
+                import pyarrow.feather as feather
+                # Uncompressed Feather files are memory-mapped without any decoding step
+                table = feather.read_table(path, memory_map=memory_map)
+
+            if schema:
+                skip = [col for col in schema.get("skip_columns") or [] if col in table.column_names]
+                table = table.drop_columns(skip)
+            df = table.to_pandas(split_blocks=True, self_destruct=True)
+
+            if schema:
+                # Feather chunks are written with plain strings; restore the category types
+                categoricals = [col for col in schema.get("categoricals") or []
+                                if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype)]
+                df = df.astype({col: "category" for col in categoricals})
+
+        elif schema:
+            options = schema_read_options(path, schema)
+            try:
+                df = pd.read_csv(path, engine=csv_engine(schema), **options)
+            except (ValueError, TypeError) as e:
+                # e.g. missing values in a column declared as an integer: keep only the category types
+                logger.warning(f"Schema dtypes could not be applied to {path} ({e}); inferring numeric dtypes")
+                options["dtype"] = {col: dt for col, dt in options["dtype"].items() if dt == "category"}
+                df = pd.read_csv(path, engine=csv_engine(schema), **options)
+            df = downcast_to_schema(df, schema)
+
+        else:
+            # Read the CSV file into a pandas DataFrame
+            df = pd.read_csv(path)
+
+        # Parse and memory metrics, to compare formats and schema settings
+        elapsed = time.perf_counter() - start
+        memory_bytes = df.memory_usage(deep=True).sum()
+        logger.info(f"Loaded {len(df)} rows x {df.shape[1]} columns in {elapsed:.3f}s "
+                    f"({memory_bytes / 1e6:.2f} MB in memory, {memory_bytes / max(len(df), 1):.1f} B/row)")
+        return df
     
     except Exception as e:
         # Log an error message with the exception details
         logger.error(f"Error loading the data: {e}")
         # Raise a custom exception for higher-level error handling
         raise CustomException("Failed to load data", e)
+
+# Function to save a DataFrame in the format implied by the file path
+def save_data(df, path):
+    try:
+        logger.info(f"Saving data to {path}")
+        fmt = get_data_format(path)
+
+        if fmt == "parquet":
+            df.to_parquet(path, index=False)
+        elif fmt == "feather":
+            # Feather needs a default index; keep it uncompressed so it can be memory-mapped
+            df.reset_index(drop=True).to_feather(path, compression="uncompressed")
+        else:
+            df.to_csv(path, index=False)
+
+    except Exception as e:
+        logger.error(f"Error saving the data: {e}")
+        raise CustomException("Failed to save data", e)
+
+# Read a CSV, Parquet or Feather file as DataFrames of at most chunk_size rows, so files larger
+# than memory can be processed one piece at a time
+def iter_chunks(path, chunk_size, columns=None):
+    try:
+        fmt = get_data_format(path)
+        if fmt == "csv":
+            yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+            return
+
+        import pyarrow.dataset as ds
+        # Feather v2 is the Arrow IPC format; record batches are scanned without loading the file
+        dataset = ds.dataset(path, format="parquet" if fmt == "parquet" else "ipc")
+        for batch in dataset.to_batches(columns=columns, batch_size=chunk_size):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    except Exception as e:
+        logger.error(f"Error reading chunks of {path}: {e}")
+        raise CustomException("Failed to read data in chunks", sys)
+
+# Column names of a CSV, Parquet or Feather file, read from its header or schema
+def data_columns(path):
+    fmt = get_data_format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    import pyarrow.dataset as ds
+    return list(ds.dataset(path, format="parquet" if fmt == "parquet" else "ipc").schema.names)
+
+# Incremental writer that appends DataFrame chunks to a CSV, Parquet or Feather file. The Arrow
+# schema comes from the first chunk and is widened when a later chunk does not fit it (e.g. an
+# integer column that gets missing values, or a column that was all-null in the first chunk).
+class ChunkedWriter:
+
+    def __init__(self, path):
+        self.path = path
+        self.format = get_data_format(path)
+        self.schema = None  # Arrow schema of the file, set by the first chunk
+        self.writer = None  # Underlying Parquet/IPC writer
+        self.rows_written = 0
+
+    def write(self, df):
+        if self.format == "csv":
+            # First chunk truncates the file and writes the header, later chunks append
+            first = self.writer is None
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+            self.writer = True
+        else:
+            import pyarrow as pa
+
+            if self.format == "feather":
+                # An IPC file allows one dictionary per column, and per-chunk categories differ
+                categoricals = df.select_dtypes("category").columns
+                df = df.astype({col: df[col].cat.categories.dtype for col in categoricals})
+
+            if self.schema is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self.schema = table.schema
+                self.writer = self._open_writer(pa)
+            else:
+                try:
+                    # Cast later chunks to the file's schema so the file stays consistent
+                    table = pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+                except (pa.ArrowException, OverflowError):
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    self._promote(pa, pa.unify_schemas([self.schema, table.schema], promote_options="permissive"))
+                    table = table.select(self.schema.names).cast(self.schema)
+            self.writer.write_table(table)
+
+        self.rows_written += len(df)
+
+    # Widen the file's schema: the rows written so far are copied, batch by batch, into a new
+    # file with the promoted schema, which later chunks are then appended to
+    def _promote(self, pa, schema):
+        import pyarrow.dataset as ds
+
+        logger.info(f"Promoting the schema of {self.path} after {self.rows_written} rows: "
+                    f"{[f'{f.name}: {f.type}' for f in schema if f.type != self.schema.field(f.name).type]}")
+        self.writer.close()
+        old_path = self.path + ".promote"
+        os.replace(self.path, old_path)
+        try:
+            self.schema = schema
+            self.writer = self._open_writer(pa)
+            written = ds.dataset(old_path, format="parquet" if self.format == "parquet" else "ipc")
+            for batch in written.to_batches():
+                self.writer.write_table(pa.Table.from_batches([batch]).cast(schema))
+        finally:
+            os.remove(old_path)
+
+    def _open_writer(self, pa):
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.path, self.schema)
+        # Feather v2 is the Arrow IPC file format; write it uncompressed for memory mapping
+        return pa.ipc.new_file(self.path, self.schema)
+
+    def close(self):
+        if self.format != "csv" and self.writer is not None:
+            self.writer.close()
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()